@@ -0,0 +1,106 @@
+"""shared revision groups
+
+Revision ID: 5176fb8c6beb
+Revises: e07012b0f441
+Create Date: 2026-10-18 04:23:50.354810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5176fb8c6beb'
+down_revision: Union[str, Sequence[str], None] = 'e07012b0f441'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recipe_revision_ingredient_groups',
+    sa.Column('recipe_revision_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['ingredient_groups.id'], ),
+    sa.ForeignKeyConstraint(['recipe_revision_id'], ['recipe_revisions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recipe_revision_id', 'position')
+    )
+    op.create_index(op.f('ix_recipe_revision_ingredient_groups_group_id'), 'recipe_revision_ingredient_groups', ['group_id'], unique=False)
+    op.create_table('recipe_revision_instruction_groups',
+    sa.Column('recipe_revision_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['instruction_groups.id'], ),
+    sa.ForeignKeyConstraint(['recipe_revision_id'], ['recipe_revisions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recipe_revision_id', 'position')
+    )
+    op.create_index(op.f('ix_recipe_revision_instruction_groups_group_id'), 'recipe_revision_instruction_groups', ['group_id'], unique=False)
+
+    # every existing group is linked from the revision that owned it; they keep
+    # a NULL content_hash and are never shared
+    for table in ('ingredient_groups', 'instruction_groups'):
+        op.execute(
+            f"""
+            INSERT INTO recipe_revision_{table} (recipe_revision_id, position, group_id)
+            SELECT recipe_revision_id,
+                   row_number() OVER (PARTITION BY recipe_revision_id ORDER BY position, id) - 1,
+                   id
+            FROM {table}
+            """
+        )
+
+    op.add_column('ingredient_groups', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_ingredient_groups_content_hash'), 'ingredient_groups', ['content_hash'], unique=False)
+    op.drop_constraint(op.f('ingredient_groups_recipe_revision_id_fkey'), 'ingredient_groups', type_='foreignkey')
+    op.drop_column('ingredient_groups', 'position')
+    op.drop_column('ingredient_groups', 'recipe_revision_id')
+    op.add_column('instruction_groups', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_instruction_groups_content_hash'), 'instruction_groups', ['content_hash'], unique=False)
+    op.drop_constraint(op.f('instruction_groups_recipe_revision_id_fkey'), 'instruction_groups', type_='foreignkey')
+    op.drop_column('instruction_groups', 'position')
+    op.drop_column('instruction_groups', 'recipe_revision_id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # groups have a single owning revision again: shared groups can't be
+    # represented without copying them, so refuse instead of losing revisions
+    conn = op.get_bind()
+    for table in ('ingredient_groups', 'instruction_groups'):
+        shared = conn.execute(
+            sa.text(
+                f"SELECT count(*) FROM (SELECT group_id FROM recipe_revision_{table} "
+                "GROUP BY group_id HAVING count(*) > 1) AS s"
+            )
+        ).scalar()
+        if shared:
+            raise RuntimeError(
+                f"{shared} {table} are shared between revisions, "
+                "downgrading would detach them from all but one revision"
+            )
+
+    for table in ('ingredient_groups', 'instruction_groups'):
+        op.add_column(table, sa.Column('recipe_revision_id', sa.INTEGER(), autoincrement=False, nullable=True))
+        op.add_column(table, sa.Column('position', sa.INTEGER(), autoincrement=False, nullable=True))
+        op.execute(
+            f"""
+            UPDATE {table} SET recipe_revision_id = l.recipe_revision_id, position = l.position
+            FROM recipe_revision_{table} AS l
+            WHERE l.group_id = {table}.id
+            """
+        )
+        # unlinked groups have no revision to belong to
+        op.execute(f"DELETE FROM {table} WHERE recipe_revision_id IS NULL")
+        op.alter_column(table, 'recipe_revision_id', nullable=False)
+        op.alter_column(table, 'position', nullable=False)
+        op.create_foreign_key(op.f(f'{table}_recipe_revision_id_fkey'), table, 'recipe_revisions', ['recipe_revision_id'], ['id'], ondelete='CASCADE')
+        op.drop_index(op.f(f'ix_{table}_content_hash'), table_name=table)
+        op.drop_column(table, 'content_hash')
+
+    op.drop_index(op.f('ix_recipe_revision_instruction_groups_group_id'), table_name='recipe_revision_instruction_groups')
+    op.drop_table('recipe_revision_instruction_groups')
+    op.drop_index(op.f('ix_recipe_revision_ingredient_groups_group_id'), table_name='recipe_revision_ingredient_groups')
+    op.drop_table('recipe_revision_ingredient_groups')
@@ -116,7 +116,10 @@ class User(Base):
         "Recipe",
         secondary=user_favorite_recipes,
         back_populates="favorited_by",
-        lazy="selectin",  # better for async queries
+        # loaded with every authenticated request otherwise, see
+        # routes.get_favorite_recipes for a paginated read
+        lazy="raise",
+        passive_deletes=True,
     )
 
 
@@ -0,0 +1,99 @@
+"""
+Small in-process caches.
+
+These live per worker process, so they must only hold data that is either
+cheap to be stale for a few seconds or keyed in a way that a change in the
+database naturally produces a different key.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache whose entries expire `ttl` seconds after being written.
+
+    Once `maxsize` entries are stored, the least recently used entry is
+    dropped to make room for a new one. Hits, misses and evictions are
+    counted, see `stats`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        key: K,
+        default: V | None = None,
+        valid: Callable[[V], bool] | None = None,
+    ) -> V | None:
+        """
+        Look up `key`. Entries that are expired or rejected by `valid` are
+        dropped and count as a miss.
+        """
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic() or (valid is not None and not valid(value)):
+            del self._data[key]
+            self.misses += 1
+            self.evictions += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        if key in self._data:
+            del self._data[key]
+        elif len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: K) -> V | None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self.evictions += 1
+        return entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __contains__(self, key: K) -> bool:
+        """Whether `key` is stored, without counting it as a lookup."""
+        entry = self._data.get(key, _MISSING)
+        return entry is not _MISSING and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
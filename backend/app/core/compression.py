@@ -0,0 +1,263 @@
+"""
+Negotiated response compression: zstd, br and gzip.
+
+`CompressionMiddleware` compresses JSON and text responses of at least
+`COMPRESSION_MINIMUM_SIZE` bytes with the best encoding the client accepts
+(`Accept-Encoding`, q-values honoured). Streamed responses are compressed
+chunk by chunk, every chunk flushed so clients can parse as it arrives.
+
+Responses that already carry a `Content-Encoding` pass through untouched:
+endpoints serving cached bodies compress them once with `encode_body`, keep
+the result next to the cache entry and send it with `encoded_response`.
+A route opts out with `Depends(no_compression)`.
+
+Compressed responses are a different representation than the identity body,
+so their ETag is weakened, as is the ETag of `304 Not Modified` answers to
+clients accepting compression.
+
+gzip is always available, zstd from the standard library (`compression.zstd`,
+Python 3.14), br if the `brotli` package is installed.
+"""
+
+import gzip
+import re
+import zlib
+from typing import Callable
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.etag import weak_etag
+
+try:
+    from compression import zstd
+except ImportError:  # Python < 3.14
+    zstd = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+# key in `request.state`, see `no_compression`
+_STATE_KEY = "compress"
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstd.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data, zstd.ZstdCompressor.FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstd.ZstdCompressor.FLUSH_FRAME)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+# by preference. Per encoding: (one-shot compress(body, level), stream(level),
+# default level, level for bodies compressed ahead of time, see `encode_body`)
+ENCODINGS: dict[str, tuple[Callable, Callable, int, int]] = {}
+if zstd is not None:
+    ENCODINGS["zstd"] = (
+        lambda body, level: zstd.compress(body, level=level),
+        _ZstdStream,
+        3,
+        19,
+    )
+if brotli is not None:
+    ENCODINGS["br"] = (
+        lambda body, level: brotli.compress(body, quality=level),
+        _BrotliStream,
+        4,
+        11,
+    )
+ENCODINGS["gzip"] = (
+    # mtime=0: the same bytes for the same body
+    lambda body, level: gzip.compress(body, compresslevel=level, mtime=0),
+    _GzipStream,
+    6,
+    9,
+)
+
+_CODING_RE = re.compile(r"^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$")
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """
+    The encoding to use for a request's `Accept-Encoding` header, `None` for
+    identity. Picks the client's highest q-value, our preference on ties.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for coding in accept_encoding.lower().split(","):
+        match = _CODING_RE.match(coding)
+        if match is None:
+            continue
+        try:
+            weights[match[1]] = float(match[2]) if match[2] is not None else 1.0
+        except ValueError:
+            continue
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def encode_body(
+    body: bytes, encoding: str | None, best: bool = False
+) -> tuple[bytes, str | None]:
+    """
+    `body` compressed with `encoding`, at the highest level with `best` (slow,
+    for bodies compressed ahead of time, not on the request path). Returns the
+    bytes and the encoding applied, `None` if `body` is too small to be worth it.
+    """
+    if encoding is None or len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+        return body, None
+    compress, _, level, best_level = ENCODINGS[encoding]
+    return compress(body, best_level if best else level), encoding
+
+
+def encoded_response(
+    body: bytes,
+    encoding: str | None,
+    media_type: str = "application/json",
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Response with a body encoded with `encode_body`"""
+    response = Response(body, media_type=media_type, headers=headers)
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+        _weaken_etag(response.headers)
+    response.headers.add_vary_header("Accept-Encoding")
+    return response
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    if "etag" in headers:
+        headers["ETag"] = weak_etag(headers["etag"])
+
+
+def no_compression(request: Request) -> None:
+    """Route dependency: send the route's responses uncompressed"""
+    setattr(request.state, _STATE_KEY, False)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(scope, send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """`send` wrapper deciding on the first body message whether to compress"""
+
+    def __init__(self, scope: Scope, send: Send, encoding: str, minimum_size: int):
+        self.scope = scope
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.stream = None
+        self.passthrough = False
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        return (
+            "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            and self.scope.get("state", {}).get(_STATE_KEY, True)
+        )
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not self._compressible(headers) or (
+                not more_body and len(body) < self.minimum_size
+            ):
+                if self.start["status"] == 304:
+                    _weaken_etag(headers)
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            compress, stream, level, _ = ENCODINGS[self.encoding]
+            headers["Content-Encoding"] = self.encoding
+            _weaken_etag(headers)
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                body = compress(body, level)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            del headers["Content-Length"]
+            self.stream = stream(level)
+            await self.send(self.start)
+
+        body = self.stream.compress(body)
+        if not more_body:
+            body += self.stream.finish()
+        await self.send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
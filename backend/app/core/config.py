@@ -66,6 +66,26 @@ class Settings(BaseSettings):
 
     PAGINATION_DEFAULT_PAGE_SIZE: int = 100
     PAGINATION_MAX_PAGE_SIZE: int = 5000
+    PAGINATION_COUNT_CACHE_TTL_SECONDS: int = 30
+    PAGINATION_COUNT_CACHE_SIZE: int = 1024
+    # Rows fetched per round trip from server-side cursors of streamed responses
+    STREAMING_CHUNK_SIZE: int = 100
+    # Per-process cache of serialized recipes, see app/recipes/cache.py
+    RECIPE_CACHE_SIZE: int = 2048
+    RECIPE_CACHE_TTL_SECONDS: int = 600
+    # Share unchanged ingredient/instruction groups between revisions instead of
+    # copying them, see app/recipes/storage.py
+    REVISION_SHARE_GROUPS: bool = True
+    # Revisions kept per recipe by scripts/compact_revisions.py: the newest N,
+    # plus one per day / per week going back this far, see app/recipes/retention.py
+    REVISION_RETENTION_KEEP_LAST: int = 20
+    REVISION_RETENTION_DAILY_DAYS: int = 30
+    REVISION_RETENTION_WEEKLY_WEEKS: int = 52
+    # Units and categories are kept in memory per process and reloaded after
+    # this long, see app/recipes/reference.py
+    REFERENCE_DATA_TTL_SECONDS: int = 300
+    # Responses smaller than this are sent uncompressed, see app/core/compression.py
+    COMPRESSION_MINIMUM_SIZE: int = 512
 
     # Security/Auth related settings
     SECRET_KEY_ACCESS_TOKENS: str = "changethis"
@@ -97,6 +117,12 @@ class Settings(BaseSettings):
 
     MEILISEARCH_URL: str | None
     MEILISEARCH_MASTER_KEY: str = "changethis"
+    # Per process, see app/recipes/search.py
+    MEILISEARCH_MAX_CONNECTIONS: int = 20
+    # Per call, retries included
+    MEILISEARCH_TIMEOUT_SECONDS: float = 5.0
+    # Retries of requests failing with a connection error, 429 or 5xx
+    MEILISEARCH_RETRIES: int = 2
 
     GEMINI_API_KEY: str | None = None
 
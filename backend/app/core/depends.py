@@ -47,6 +47,22 @@ def apply_sorting(stmt, model, params: SortParams):
     return stmt.order_by(asc(column) if params.order == "asc" else desc(column))
 
 
+def sort_keyset(model, params: SortParams, tiebreaker: str = "id"):
+    """
+    Keyset columns and direction matching the requested sorting, as used by
+    cursor pagination. The tiebreaker (primary key) is appended so the keyset
+    is unique, e.g. sort_by=updated_at -> (updated_at, id).
+    """
+    unique_column = getattr(model, tiebreaker)
+    if not params or not params.sort_by or params.sort_by == tiebreaker:
+        columns = (unique_column,)
+    else:
+        columns = (getattr(model, params.sort_by), unique_column)
+
+    descending = params is not None and params.order == "desc"
+    return columns, descending
+
+
 class DateFilterParams(BaseModel):
     date_from: datetime | None = Field(
         None, description="Return items newer than this datetime (ISO 8601)"
@@ -0,0 +1,61 @@
+"""
+Entity tags for conditional GET requests.
+
+Endpoints derive a strong ETag from a few cheap columns that change whenever
+the response would change, compare it against `If-None-Match` and answer with
+`304 Not Modified` before building the response body.
+
+Usage:
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int, request: Request, db=Depends(get_db)):
+        item_id, updated_at = (await db.execute(...)).one()
+        etag = make_etag(item_id, updated_at)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        ...
+        response.headers.update(etag_headers(etag))
+
+A strong ETag promises byte-identical bodies, so compressed responses carry
+it weakened (`weak_etag`, see app/core/compression.py); `etag_matches`
+compares weakly and accepts both.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+# responses carry per-user state (e.g. is_favorited): let clients keep them,
+# but revalidate on every use and keep them out of shared caches
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the `repr` of `parts`."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's `If-None-Match` matches `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def etag_headers(etag: str, cache_control: str = CACHE_CONTROL) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str = CACHE_CONTROL) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=etag_headers(etag, cache_control),
+    )
@@ -43,6 +43,20 @@ Usage Pattern 2 (Efficient - two queries with eager loading):
             enrich_query=enrich_query
         )
 
+Usage Pattern 3 (Keyset / cursor - constant cost at any depth):
+    Pass `mode=cursor` (or a `cursor` from a previous response) and tell
+    `paginate` which columns form the keyset. The keyset must be unique,
+    so always end it with the primary key. With a matching index, e.g.
+    `ix_recipes_updated_at_desc` on (updated_at DESC, id DESC), each page is a
+    single index range scan instead of an ever growing OFFSET.
+
+        return await paginate(
+            db, simple_query, pagination, request,
+            enrich_query=enrich_query,
+            keyset=(Recipe.updated_at, Recipe.id),
+            keyset_descending=True,
+        )
+
 Response Format:
     {
         "pagination": {
@@ -51,27 +65,59 @@ Response Format:
             "current_page": 2,
             "page_size": 20,
             "next": "/recipes?page=3&page_size=20",
-            "previous": "/recipes?page=1&page_size=20"
+            "previous": "/recipes?page=1&page_size=20",
+            "next_cursor": null
         },
         "results": [...]
     }
+
+    In cursor mode `current_page` is null, `next` carries the cursor and
+    `next_cursor` holds the opaque cursor for the following page.
+
+Counting:
+    By default the exact total is computed with `count(*) OVER ()` in the page
+    query itself, so a list costs one round trip (ids + total) plus the
+    enrichment query. Clients that don't need it can pass `include_total=false`
+    (total and total_pages are then null), or choose a strategy with `count=`:
+        window     exact, in the page query (default)
+        exact      exact, separate `SELECT count(*)`
+        estimated  Postgres planner estimate (pg_class.reltuples when unfiltered)
+        cached     exact count, reused for a few seconds per filter signature
+    Cursor mode counts separately, as its page query only sees rows past the
+    cursor. `total_estimated` in the response tells whether `total` may be
+    inexact.
 """
 
-from typing import Any, Callable, Dict, Generic, List, TypeVar
+import base64
+import binascii
+import functools
+import json
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Literal, Sequence, TypeVar
 from urllib.parse import urlencode
 
-from fastapi import Query, Request
+from fastapi import HTTPException, Query, Request, status
 from pydantic import BaseModel, Field, field_validator
-from sqlalchemy import func, select
+from sqlalchemy import func, literal, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import Select
 
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 # Type variable for generic pagination results
 T = TypeVar("T")
 
+CountStrategy = Literal["window", "exact", "estimated", "cached"]
+
+# Exact counts keyed by the compiled count query and its parameters
+_count_cache: TTLCache[tuple, int] = TTLCache(
+    maxsize=settings.PAGINATION_COUNT_CACHE_SIZE,
+    ttl=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS,
+)
+
 
 class PaginationParams(BaseModel):
     """Query parameters for pagination."""
@@ -83,6 +129,21 @@ class PaginationParams(BaseModel):
         le=settings.PAGINATION_MAX_PAGE_SIZE,
         description="Number of items per page",
     )
+    mode: Literal["page", "cursor"] = Field(
+        default="page",
+        description="Pagination mode: page numbers (offset) or keyset cursors",
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor from a previous `next_cursor` (implies mode=cursor)",
+    )
+    include_total: bool = Field(
+        default=True, description="Whether to compute the total number of items"
+    )
+    count: CountStrategy = Field(
+        default="window",
+        description="How to compute the total: window, exact, estimated or cached",
+    )
 
     @field_validator("page_size")
     @classmethod
@@ -106,16 +167,34 @@ class PaginationParams(BaseModel):
         """Get limit for database query."""
         return self.page_size
 
+    @property
+    def use_cursor(self) -> bool:
+        """Whether keyset (cursor) pagination was requested."""
+        return self.mode == "cursor" or self.cursor is not None
+
 
 class PaginationMeta(BaseModel):
     """Pagination metadata in response."""
 
-    total: int = Field(description="Total number of items")
-    total_pages: int = Field(description="Total number of pages")
-    current_page: int = Field(description="Current page number")
+    total: int | None = Field(
+        description="Total number of items (null if include_total=false)"
+    )
+    total_pages: int | None = Field(
+        description="Total number of pages (null if include_total=false)"
+    )
+    current_page: int | None = Field(
+        description="Current page number (null in cursor mode)"
+    )
     page_size: int = Field(description="Items per page")
     next: str | None = Field(default=None, description="URL to next page")
     previous: str | None = Field(default=None, description="URL to previous page")
+    next_cursor: str | None = Field(
+        default=None, description="Opaque cursor for the next page (cursor mode)"
+    )
+    total_estimated: bool = Field(
+        default=False,
+        description="Whether total is an estimate rather than an exact count",
+    )
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -149,12 +228,118 @@ def _build_page_url(request: Request, page: int, page_size: int) -> str:
     return f"{request.url.path}?{query_string}"
 
 
+def _build_cursor_url(request: Request, cursor: str, page_size: int) -> str:
+    """
+    Build URL for the next keyset page while preserving other query parameters.
+
+    Args:
+        request: FastAPI request object
+        cursor: Opaque cursor pointing after the last item of the current page
+        page_size: Items per page
+
+    Returns:
+        Relative URL path with query parameters
+    """
+    params = dict(request.query_params)
+    params.pop("page", None)
+    params["mode"] = "cursor"
+    params["cursor"] = cursor
+    params["page_size"] = str(page_size)
+
+    query_string = urlencode(sorted(params.items()))
+
+    return f"{request.url.path}?{query_string}"
+
+
+def _keyset_signature(keyset: Sequence[InstrumentedAttribute], descending: bool):
+    """Identify a keyset ordering, so cursors can't be replayed on another one."""
+    return [str(col) for col in keyset] + ["desc" if descending else "asc"]
+
+
+def _encode_cursor(
+    keyset: Sequence[InstrumentedAttribute], descending: bool, item: Any
+) -> str:
+    """Encode the keyset values of `item` into an opaque, url-safe cursor."""
+    values = []
+    for col in keyset:
+        value = getattr(item, col.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+
+    payload = {"k": _keyset_signature(keyset, descending), "v": values}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode_cursor(
+    cursor: str, keyset: Sequence[InstrumentedAttribute], descending: bool
+) -> list[Any]:
+    """
+    Decode a cursor created by `_encode_cursor` back into typed keyset values.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for a
+            different ordering.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+    )
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise invalid
+
+    if not isinstance(payload, dict):
+        raise invalid
+    if payload.get("k") != _keyset_signature(keyset, descending):
+        raise invalid
+
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != len(keyset):
+        raise invalid
+
+    decoded = []
+    for col, value in zip(keyset, values):
+        python_type = col.type.python_type
+        try:
+            if value is None or isinstance(value, python_type):
+                decoded.append(value)
+            elif python_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            else:
+                decoded.append(python_type(value))
+        except (TypeError, ValueError):
+            raise invalid
+    return decoded
+
+
+def _seek_predicate(
+    keyset: Sequence[InstrumentedAttribute], values: Sequence[Any], descending: bool
+):
+    """
+    Build the keyset seek predicate, e.g. `(updated_at, id) < (:v1, :v2)`.
+
+    Postgres evaluates row-value comparisons as a single range condition, so
+    this maps directly onto a composite index with the same column order.
+    """
+    if len(keyset) == 1:
+        lhs, rhs = keyset[0], literal(values[0], keyset[0].type)
+    else:
+        lhs = tuple_(*keyset)
+        rhs = tuple_(*(literal(v, col.type) for col, v in zip(keyset, values)))
+    return lhs < rhs if descending else lhs > rhs
+
+
 async def paginate(
     db: AsyncSession,
     query: Select,
     params: PaginationParams,
     request: Request,
     enrich_query: Callable[[List[Any]], Select] | None = None,
+    keyset: Sequence[InstrumentedAttribute] | None = None,
+    keyset_descending: bool = False,
+    enrich: Callable[[List[Any]], Awaitable[List[Any]]] | None = None,
+    columns: Sequence[Any] = (),
 ) -> PaginatedResponse[T]:
     """
     Paginate a SQLAlchemy query with optional two-step enrichment.
@@ -165,12 +350,18 @@ async def paginate(
         Execute one query with all joins/options included.
 
     Pattern 2 (Two Query - Recommended for complex eager loading):
-        1. Execute simple query for pagination (fast COUNT, fast fetch)
+        1. Execute simple query for pagination, selecting only the IDs
+           (and, by default, the total via a window function)
         2. Execute complex query with joins on just the paginated IDs
 
+    Both patterns work in page (OFFSET) mode and, if requested via
+    `params.use_cursor`, in keyset mode. Keyset mode replaces the query's
+    ordering with the keyset columns and seeks past the cursor instead of
+    skipping rows, so the cost of a page does not grow with its depth.
+
     The two-query pattern is more efficient for deeply nested models because:
-    - COUNT query remains fast (no joins)
-    - Initial fetch is fast (no joins)
+    - COUNT remains fast (no joins)
+    - Initial fetch is fast (no joins, only the ID column)
     - Complex joins only load data for the current page
 
     Args:
@@ -180,6 +371,15 @@ async def paginate(
         request: FastAPI request object for URL generation
         enrich_query: Optional function that takes a list of IDs and returns
                      a Select statement with eager loading options
+        keyset: Unique column tuple used in cursor mode, ending with the
+                primary key `id` (defaults to the main entity's `id`)
+        keyset_descending: Whether the keyset is walked in descending order
+        enrich: Alternative to `enrich_query`, an async function that takes
+                the list of IDs and returns the items in the same order, for
+                items not loaded by a single statement (e.g. from a cache)
+        columns: Further columns to select along with the IDs for `enrich`,
+                 e.g. what an ETag of the page is made of. `enrich` then
+                 gets the rows instead, with the ID as `row.id`
 
     Returns:
         Dictionary with pagination metadata and results
@@ -208,60 +408,88 @@ async def paginate(
     # Extract the main entity being queried (first FROM clause)
     main_entity = query.column_descriptions[0]["entity"]
 
-    # Execute COUNT query on main entity only (no joins = fast)
-    count_query = select(func.count()).select_from(main_entity)
+    if enrich_query is not None:
+        enrich = functools.partial(_enrich, db, enrich_query=enrich_query)
 
-    # Apply WHERE clauses from original query to count query
-    if query.whereclause is not None:
-        count_query = count_query.where(query.whereclause)
+    # The window count only sees the rows past the cursor in keyset mode
+    window_count = (
+        params.include_total and params.count == "window" and not params.use_cursor
+    )
 
-    count_result = await db.execute(count_query)
-    total = count_result.scalar_one()
+    total = None
+    total_pages = None
+    total_estimated = False
+    if params.include_total and not window_count:
+        total, total_estimated = await _count_total(
+            db, query, main_entity, params.count
+        )
+        total_pages = _total_pages(total, params.page_size)
+
+    if params.use_cursor:
+        return await _paginate_keyset(
+            db,
+            query,
+            params,
+            request,
+            enrich,
+            keyset or (main_entity.id,),
+            keyset_descending,
+            total,
+            total_pages,
+            total_estimated,
+            columns,
+        )
 
-    # Calculate total pages
-    total_pages = (total + params.page_size - 1) // params.page_size if total > 0 else 0
+    # Only an exact total tells us reliably whether a next page exists,
+    # otherwise fetch one extra row to find out
+    exact_total = window_count or (total is not None and not total_estimated)
 
     # Handle edge case: requested page beyond available pages
-    if params.page > total_pages and total_pages > 0:
-        # Return empty results with correct pagination info
-        return PaginatedResponse(
-            pagination=PaginationMeta(
-                total=total,
-                total_pages=total_pages,
-                current_page=params.page,
-                page_size=params.page_size,
-                next=None,
-                previous=_build_page_url(request, total_pages, params.page_size)
-                if total_pages > 0
-                else None,
-            ),
-            results=[],
-        )
+    if total is not None and exact_total and params.page > total_pages > 0:
+        return _beyond_last_page(request, params, total, total_pages)
 
     # Execute main query with pagination (simple, no joins yet)
-    paginated_query = query.offset(params.offset).limit(params.limit)
-    result = await db.execute(paginated_query)
-    items = result.scalars().unique().all()
-
-    # If enrich_query is provided, perform second query with complex joins
-    if enrich_query is not None and items:
-        # Extract IDs from the simple query results
-        # Assume the entity has an 'id' attribute
-        ids = [item.id for item in items]
-
-        # Execute enriched query with all the complex joins
-        enriched_query = enrich_query(ids)
-        enriched_result = await db.execute(enriched_query)
-        items = enriched_result.scalars().unique().all()
-
-        # Maintain original order from pagination query
-        # Create a mapping of id -> item
-        id_to_item = {item.id: item for item in items}
-        items = [id_to_item[id_] for id_ in ids if id_ in id_to_item]
+    paginated_query = query
+    if enrich is not None:
+        # only the IDs are needed to drive the enrichment
+        paginated_query = paginated_query.with_only_columns(
+            *_with_columns((main_entity.id,), columns), maintain_column_froms=True
+        )
+    if window_count:
+        paginated_query = paginated_query.add_columns(func.count().over())
+
+    limit = params.limit if exact_total else params.limit + 1
+    result = await db.execute(paginated_query.offset(params.offset).limit(limit))
+    rows = result.unique().all()
+    items = rows if enrich is not None and columns else [row[0] for row in rows]
+
+    if window_count:
+        if rows:
+            total = rows[0][-1]
+        elif params.offset > 0:
+            # an empty page past the end carries no window count
+            total, _ = await _count_total(db, query, main_entity, "exact")
+        else:
+            total = 0
+        total_pages = _total_pages(total, params.page_size)
+
+        if params.page > total_pages > 0:
+            return _beyond_last_page(request, params, total, total_pages)
+
+    if exact_total:
+        has_next = params.page < total_pages
+    else:
+        has_next = len(items) > params.limit
+        items = items[: params.limit]
+
+    # If enrichment is requested, load the full items for the page,
+    # e.g. with a second query with complex joins (items only hold the IDs)
+    if enrich is not None and items:
+        items = await enrich(items)
 
     # Generate next/previous URLs
     next_url = None
-    if params.page < total_pages:
+    if has_next:
         next_url = _build_page_url(request, params.page + 1, params.page_size)
 
     previous_url = None
@@ -277,6 +505,234 @@ async def paginate(
             page_size=params.page_size,
             next=next_url,
             previous=previous_url,
+            total_estimated=total_estimated,
+        ),
+        results=items,
+    )
+
+
+def _with_columns(leading: Sequence[Any], columns: Sequence[Any]) -> list[Any]:
+    """`leading` followed by those of `columns` not among them already"""
+    return [*leading, *(c for c in columns if not any(c is lead for lead in leading))]
+
+
+def _total_pages(total: int, page_size: int) -> int:
+    """Calculate total pages"""
+    return (total + page_size - 1) // page_size if total > 0 else 0
+
+
+def _beyond_last_page(
+    request: Request, params: PaginationParams, total: int, total_pages: int
+) -> PaginatedResponse[T]:
+    """Empty results with correct pagination info for a page past the end."""
+    return PaginatedResponse(
+        pagination=PaginationMeta(
+            total=total,
+            total_pages=total_pages,
+            current_page=params.page,
+            page_size=params.page_size,
+            next=None,
+            previous=_build_page_url(request, total_pages, params.page_size),
+        ),
+        results=[],
+    )
+
+
+async def _count_total(
+    db: AsyncSession, query: Select, main_entity: Any, strategy: CountStrategy
+) -> tuple[int, bool]:
+    """
+    Count the items matched by `query` using the given strategy.
+
+    Returns:
+        Tuple of (total, whether total is an estimate)
+    """
+    # COUNT query on main entity only (no joins = fast)
+    count_query = select(func.count()).select_from(main_entity)
+
+    # Apply WHERE clauses from original query to count query
+    if query.whereclause is not None:
+        count_query = count_query.where(query.whereclause)
+
+    if strategy == "estimated":
+        estimate = await _estimate_total(db, query, main_entity)
+        if estimate is not None:
+            return estimate, True
+
+    if strategy == "cached":
+        conn = await db.connection()
+        compiled = count_query.compile(dialect=conn.dialect)
+        key = (
+            compiled.string,
+            tuple(sorted((k, repr(v)) for k, v in compiled.params.items())),
+        )
+        total = _count_cache.get(key)
+        if total is not None:
+            return total, True
+
+        total = (await db.execute(count_query)).scalar_one()
+        _count_cache.set(key, total)
+        return total, False
+
+    count_result = await db.execute(count_query)
+    return count_result.scalar_one(), False
+
+
+async def _estimate_total(
+    db: AsyncSession, query: Select, main_entity: Any
+) -> int | None:
+    """
+    Estimate the number of items from Postgres planner statistics.
+
+    Unfiltered queries read `pg_class.reltuples` of the table, filtered ones
+    take the row estimate of the query plan. Returns None if the table has
+    never been analyzed, so the caller can fall back to an exact count.
+    """
+    table = main_entity.__table__
+    if query.whereclause is None:
+        result = await db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)"),
+            {"name": table.fullname},
+        )
+        reltuples = result.scalar_one_or_none()
+        if reltuples is None or reltuples < 0:
+            return None
+        return int(reltuples)
+
+    conn = await db.connection()
+    compiled = (
+        select(main_entity.id)
+        .where(query.whereclause)
+        # expanding IN parameters are only rendered at execution otherwise
+        .compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    )
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _enrich(
+    db: AsyncSession, ids: Sequence[Any], enrich_query: Callable[[List[Any]], Select]
+) -> list[Any]:
+    """Load the items for `ids` through `enrich_query`, keeping the ID order."""
+    # Execute enriched query with all the complex joins
+    enriched_query = enrich_query(list(ids))
+    enriched_result = await db.execute(enriched_query)
+    enriched = enriched_result.scalars().unique().all()
+
+    # Maintain original order from pagination query
+    # Create a mapping of id -> item
+    id_to_item = {item.id: item for item in enriched}
+    return [id_to_item[id_] for id_ in ids if id_ in id_to_item]
+
+
+def _keyset_select(
+    query: Select,
+    keyset: Sequence[InstrumentedAttribute],
+    descending: bool,
+    cursor: str | None,
+) -> Select:
+    """Order `query` by the keyset and seek past `cursor`, if given."""
+    order_by = [col.desc() if descending else col.asc() for col in keyset]
+    keyset_query = query.order_by(None).order_by(*order_by)
+
+    if cursor:
+        values = _decode_cursor(cursor, keyset, descending)
+        keyset_query = keyset_query.where(_seek_predicate(keyset, values, descending))
+    return keyset_query
+
+
+def paginated_select(
+    query: Select,
+    params: PaginationParams,
+    keyset: Sequence[InstrumentedAttribute] | None = None,
+    keyset_descending: bool = False,
+) -> Select:
+    """
+    The page of `query` that `paginate` would return, as a plain statement.
+
+    Meant for callers that stream the rows themselves instead of building a
+    PaginatedResponse, so no count or next links are computed. In cursor mode,
+    `cursor_after` gives the cursor of the following page.
+    """
+    if params.use_cursor:
+        main_entity = query.column_descriptions[0]["entity"]
+        keyset = keyset or (main_entity.id,)
+        return _keyset_select(query, keyset, keyset_descending, params.cursor).limit(
+            params.limit
+        )
+    return query.offset(params.offset).limit(params.limit)
+
+
+def cursor_after(
+    item: Any,
+    query: Select,
+    keyset: Sequence[InstrumentedAttribute] | None = None,
+    keyset_descending: bool = False,
+) -> str:
+    """
+    Cursor of the page following `item`, for callers of `paginated_select` in
+    cursor mode. Takes the same `query` and keyset.
+    """
+    keyset = keyset or (query.column_descriptions[0]["entity"].id,)
+    return _encode_cursor(keyset, keyset_descending, item)
+
+
+async def _paginate_keyset(
+    db: AsyncSession,
+    query: Select,
+    params: PaginationParams,
+    request: Request,
+    enrich: Callable[[List[Any]], Awaitable[List[Any]]] | None,
+    keyset: Sequence[InstrumentedAttribute],
+    descending: bool,
+    total: int | None,
+    total_pages: int | None,
+    total_estimated: bool,
+    columns: Sequence[Any] = (),
+) -> PaginatedResponse[T]:
+    """Keyset (cursor) variant of `paginate`, see there for details."""
+    keyset_query = _keyset_select(query, keyset, descending, params.cursor)
+
+    if enrich is not None:
+        # the keyset columns (ending in the ID) are all we need to go on
+        keyset_query = keyset_query.with_only_columns(
+            *_with_columns(keyset, columns), maintain_column_froms=True
+        )
+
+    # Fetch one extra row to learn whether another page follows
+    result = await db.execute(keyset_query.limit(params.limit + 1))
+    if enrich is not None:
+        items = result.unique().all()
+    else:
+        items = result.scalars().unique().all()
+
+    has_more = len(items) > params.limit
+    items = items[: params.limit]
+
+    next_cursor = None
+    next_url = None
+    if has_more:
+        next_cursor = _encode_cursor(keyset, descending, items[-1])
+        next_url = _build_cursor_url(request, next_cursor, params.page_size)
+
+    if enrich is not None and items:
+        items = await enrich(items if columns else [row.id for row in items])
+
+    return PaginatedResponse(
+        pagination=PaginationMeta(
+            total=total,
+            total_pages=total_pages,
+            current_page=None,
+            page_size=params.page_size,
+            next=next_url,
+            previous=None,
+            next_cursor=next_cursor,
+            total_estimated=total_estimated,
         ),
         results=items,
     )
@@ -291,6 +747,19 @@ def get_pagination_params(
         le=settings.PAGINATION_MAX_PAGE_SIZE,
         description="Number of items per page",
     ),
+    mode: Literal["page", "cursor"] = Query(
+        "page", description="Pagination mode: page numbers or keyset cursors"
+    ),
+    cursor: str | None = Query(
+        None, description="Opaque cursor from a previous `next_cursor`"
+    ),
+    include_total: bool = Query(
+        True, description="Whether to compute the total number of items"
+    ),
+    count: CountStrategy = Query(
+        "window",
+        description="How to compute the total: window, exact, estimated or cached",
+    ),
 ) -> PaginationParams:
     """
     FastAPI dependency for extracting pagination parameters.
@@ -303,4 +772,11 @@ def get_pagination_params(
             ...
     """
 
-    return PaginationParams(page=page, page_size=page_size)
+    return PaginationParams(
+        page=page,
+        page_size=page_size,
+        mode=mode,
+        cursor=cursor,
+        include_total=include_total,
+        count=count,
+    )
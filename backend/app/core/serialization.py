@@ -0,0 +1,41 @@
+"""
+JSON responses written by pydantic-core.
+
+For a returned model FastAPI validates it against `response_model` again,
+dumps it to Python dicts and encodes those with `json.dumps`. Endpoints on
+hot paths return `json_response(content)` instead: the already validated
+models (or lists of them) are written straight to bytes by pydantic-core.
+Keep `response_model` on the route, it still documents the schema.
+
+Usage:
+    @router.get("/items", response_model=list[ItemRead])
+    async def get_items(db: AsyncSession = Depends(get_db)):
+        items = [ItemRead.model_validate(item) for item in await load(db)]
+        return json_response(items)
+"""
+
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+# serializes by the runtime type: a model with its own serializer, lists,
+# dicts, datetimes, ... as FastAPI would
+_ANY = TypeAdapter(Any)
+
+
+def dump_json(content: Any) -> bytes:
+    return _ANY.dump_json(content)
+
+
+def json_response(
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    return Response(
+        dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,94 @@
+"""
+Streamed (NDJSON) responses backed by server-side cursors.
+
+Instead of materialising a whole result set and serialising it as one JSON
+document, rows are fetched from the database in chunks and written out as one
+JSON document per line, so memory stays flat regardless of the result size.
+
+Usage:
+    @app.get("/recipes/export")
+    async def export(db: AsyncSession = Depends(get_db)):
+        stmt = select(Recipe).options(selectinload(Recipe.latest_revision))
+        return NDJSONResponse(
+            stream_ndjson(db, stmt, lambda r: RecipeRead.model_validate(r).model_dump_json())
+        )
+
+Loader options must be compatible with `yield_per`, i.e. `selectinload`
+rather than `joinedload` for collections.
+
+To serialize something other than the selected entities, e.g. the full
+objects for a partition of plain rows, pass `load`. It is awaited once per
+partition.
+
+For a page of a larger result, select one row more than `limit` and pass a
+`trailer`: it gets the last streamed entity and whether more rows followed,
+and can end the stream with a line pointing at the next page.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class NDJSONResponse(StreamingResponse):
+    media_type = NDJSON_MEDIA_TYPE
+
+
+async def stream_ndjson(
+    db: AsyncSession,
+    stmt: Select,
+    serialize: Callable[[Any], str | bytes],
+    chunk_size: int | None = None,
+    limit: int | None = None,
+    trailer: Callable[[Any, bool], str | bytes | None] | None = None,
+    load: Callable[[list[Any]], Awaitable[list[Any]]] | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream the entities selected by `stmt` as newline delimited JSON.
+
+    Args:
+        db: Async database session, must stay open while the response streams
+        stmt: Select statement for a single entity
+        serialize: Turns one entity into a JSON document (without newline)
+        chunk_size: Rows per fetch from the server-side cursor
+        limit: Stream at most this many entities, rows beyond only tell
+            `trailer` that more follow
+        trailer: Called with the last streamed entity (or None) and whether
+            rows were left over, returns a last line or None
+        load: Turns the entities of a partition into the items to serialize
+
+    Yields:
+        One chunk of NDJSON lines per fetched partition
+    """
+    chunk_size = chunk_size or settings.STREAMING_CHUNK_SIZE
+    result = await db.stream_scalars(stmt.execution_options(yield_per=chunk_size))
+
+    streamed, last, has_more = 0, None, False
+    try:
+        async for partition in result.partitions():
+            if limit is not None and streamed + len(partition) > limit:
+                partition, has_more = partition[: limit - streamed], True
+            if partition:
+                streamed, last = streamed + len(partition), partition[-1]
+                items = await load(partition) if load is not None else partition
+                lines = []
+                for item in items:
+                    line = serialize(item)
+                    lines.append(line.encode() if isinstance(line, str) else line)
+                    lines.append(b"\n")
+                yield b"".join(lines)
+            if has_more:
+                break
+    finally:
+        await result.close()
+
+    if trailer is not None:
+        line = trailer(last, has_more)
+        if line is not None:
+            yield (line.encode() if isinstance(line, str) else line) + b"\n"
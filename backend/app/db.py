@@ -1,3 +1,4 @@
+import asyncio
 from typing import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -98,9 +99,24 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize database
     print("Starting up: Initializing database...")
     await init_db()
+    # units, categories and multilingual strings are served from memory, see
+    # app/recipes/reference.py and app/recipes/multilingual.py
+    from app.recipes.multilingual import multilingual_payloads
+    from app.recipes.reference import reference_data
+
+    async with AsyncSessionLocal() as session:
+        await reference_data.load(session)
+    refresh = asyncio.create_task(
+        reference_data.refresh_periodically(AsyncSessionLocal)
+    )
+    multilingual_payloads()
 
     yield
 
-    # Shutdown: Close database connections
+    # Shutdown: Close database and search connections
+    refresh.cancel()
     print("Shutting down: Closing database connections...")
     await close_db()
+    from app.recipes.search import close_meilisearch_service
+
+    await close_meilisearch_service()
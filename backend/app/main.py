@@ -5,9 +5,11 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 # from . import auth
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings, SHOW_DOCS_IN_ENVS
 from app.db import lifespan
 from app.auth.auth import router as auth_router
+from app.recipes.routes import reference_router
 from app.recipes.routes import router as recipe_router
 from app.version import __version__
 
@@ -18,8 +20,10 @@ if settings.ENVIRONMENT not in SHOW_DOCS_IN_ENVS:
 
 
 app = FastAPI(**app_config, lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
 app.include_router(auth_router, prefix=settings.API_V1_STR)
 app.include_router(recipe_router, prefix=settings.API_V1_STR)
+app.include_router(reference_router, prefix=settings.API_V1_STR)
 
 
 if settings.ENVIRONMENT != "production":
@@ -4,8 +4,15 @@ from app.db import Base
 user_favorite_recipes = Table(
     "user_favorite_recipes",
     Base.metadata,
-    Column("user_id", Uuid, ForeignKey("users.id"), primary_key=True),
-    Column("recipe_id", Integer, ForeignKey("recipes.id"), primary_key=True),
+    Column(
+        "user_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    ),
+    Column(
+        "recipe_id",
+        Integer,
+        ForeignKey("recipes.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
 )
 
 
@@ -0,0 +1,313 @@
+"""
+Set-based creation of many recipes at once, backing `POST /recipes/bulk`.
+
+`_create_recipe` builds an ORM tree per recipe and flushes it, about a dozen
+statements each. Here the whole batch is written with a fixed number of
+statements however many recipes it has: the category and unit ids of all
+recipes are checked in memory (see reference.py), and every table gets one
+multi-row `INSERT ... RETURNING`. The inserts render NULLs, as the
+ORM would otherwise split them into one statement per set of non-null columns.
+
+Groups are shared (and the stored ones locked) like in
+`storage.build_revision_groups`, also between the recipes of one batch.
+"""
+
+from datetime import UTC, datetime
+from typing import Callable, Sequence
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import USER_ID_T
+from app.core.config import settings
+from app.recipes.associations import recipe_categories_association
+from app.recipes.models import (
+    Ingredient,
+    IngredientGroup,
+    InstructionGroup,
+    Recipe,
+    RecipeCategories,
+    RecipeChange,
+    RecipeChangeOp,
+    RecipeRevision,
+    RevisionIngredientGroup,
+    RevisionInstructionGroup,
+    Unit,
+)
+from app.recipes.schemas import (
+    RecipeCategoryRead,
+    RecipeCreateUpdate,
+    RecipeRevisionRead,
+    UnitRead,
+)
+from app.recipes.reference import reference_data
+from app.recipes.storage import (
+    _existing_groups,
+    ingredient_group_hash,
+    instruction_group_hash,
+    revision_content_hash,
+)
+
+UNKNOWN_CATEGORIES = "One or more category IDs do not exist"
+UNKNOWN_UNITS = "One or more unit IDs do not exist"
+
+
+def _unit_ids(recipe: RecipeCreateUpdate) -> set[int]:
+    return {
+        ing.unit_id
+        for group in recipe.content.ingredient_groups
+        for ing in group.ingredients
+        if ing.unit_id is not None
+    }
+
+
+def _serialized_revision(
+    recipe: RecipeCreateUpdate,
+    categories: dict[int, RecipeCategories],
+    units: dict[int, Unit],
+    created_at: datetime,
+) -> bytes:
+    """`RecipeRevisionRead` JSON of the revision, built from the request"""
+    content = recipe.content
+    data = content.model_dump(exclude={"categories", "ingredient_groups"})
+    data["categories"] = [
+        RecipeCategoryRead.model_validate(categories[category_id])
+        for category_id in sorted(content.categories)
+    ]
+    data["ingredient_groups"] = [
+        {
+            "name": group.name,
+            "ingredients": [
+                {
+                    **ing.model_dump(exclude={"unit_id"}),
+                    "unit": (
+                        UnitRead.model_validate(units[ing.unit_id])
+                        if ing.unit_id is not None
+                        else None
+                    ),
+                }
+                for ing in group.ingredients
+            ],
+        }
+        for group in content.ingredient_groups
+    ]
+    data["created_at"] = created_at
+    return RecipeRevisionRead.model_validate(data).model_dump_json().encode()
+
+
+async def _insert_groups(
+    db: AsyncSession,
+    model: type[IngredientGroup] | type[InstructionGroup],
+    groups_per_recipe: list[list],
+    group_hash: Callable,
+    values: Callable,
+) -> tuple[list[list[int]], list[tuple[int, object]]]:
+    """
+    Store the groups of all recipes, reusing stored ones with the same content.
+
+    Returns the group ids per recipe, in order, and the (id, group) pairs of
+    the groups that were inserted.
+    """
+    hashes_per_recipe = [[group_hash(g) for g in groups] for groups in groups_per_recipe]
+
+    # group ids by slot, None until inserted. A slot per stored group, and one
+    # per group to insert, which later groups with the same content reuse
+    ids: list[int | None] = []
+    available: dict[str, int] = {}
+    # locked against orphan deletion until the revisions link to them
+    stored = await _existing_groups(
+        db, model, {h for hashes in hashes_per_recipe for h in hashes}
+    )
+    for content_hash, group in stored.items():
+        available[content_hash] = len(ids)
+        ids.append(group.id)
+
+    new: list[tuple[int, object, str]] = []
+    slots_per_recipe = []
+    for groups, hashes in zip(groups_per_recipe, hashes_per_recipe):
+        slots = []
+        for group, content_hash in zip(groups, hashes):
+            slot = available.get(content_hash)
+            # a group appearing twice in one revision is stored twice
+            if slot is None or slot in slots:
+                slot = len(ids)
+                ids.append(None)
+                new.append((slot, group, content_hash))
+                if settings.REVISION_SHARE_GROUPS:
+                    available.setdefault(content_hash, slot)
+            slots.append(slot)
+        slots_per_recipe.append(slots)
+
+    if new:
+        new_ids = await db.scalars(
+            insert(model)
+            .returning(model.id, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True),
+            [values(group, content_hash) for _, group, content_hash in new],
+        )
+        for (slot, _, _), group_id in zip(new, new_ids):
+            ids[slot] = group_id
+
+    return (
+        [[ids[slot] for slot in slots] for slots in slots_per_recipe],
+        [(ids[slot], group) for slot, group, _ in new],
+    )
+
+
+async def create_recipes_bulk(
+    db: AsyncSession, recipes: Sequence[RecipeCreateUpdate], owner_id: USER_ID_T
+) -> list[int | str]:
+    """
+    Create `recipes`, owned by `owner_id`, each with its first revision.
+
+    Returns per recipe its new id, or why it was rejected (unknown category
+    or unit ids). Does not commit and doesn't index the recipes.
+    """
+    category_ids = set().union(*(r.content.categories for r in recipes))
+    unit_ids = set().union(*(_unit_ids(r) for r in recipes))
+    units, categories = await reference_data.resolve(db, unit_ids, category_ids)
+
+    results: list[int | str | None] = []
+    valid: list[tuple[int, RecipeCreateUpdate]] = []
+    for i, recipe in enumerate(recipes):
+        if not recipe.content.categories <= categories.keys():
+            results.append(UNKNOWN_CATEGORIES)
+        elif not _unit_ids(recipe) <= units.keys():
+            results.append(UNKNOWN_UNITS)
+        else:
+            results.append(None)
+            valid.append((i, recipe))
+    if not valid:
+        return results
+
+    now = datetime.now(UTC)
+    contents = [recipe.content for _, recipe in valid]
+
+    ingredient_group_ids, new_ingredient_groups = await _insert_groups(
+        db,
+        IngredientGroup,
+        [content.ingredient_groups for content in contents],
+        ingredient_group_hash,
+        lambda group, content_hash: {"name": group.name, "content_hash": content_hash},
+    )
+    instruction_group_ids, _ = await _insert_groups(
+        db,
+        InstructionGroup,
+        [content.instruction_groups for content in contents],
+        instruction_group_hash,
+        lambda group, content_hash: {
+            "name": group.name,
+            "instructions": group.instructions,
+            "content_hash": content_hash,
+        },
+    )
+    if new_ingredient_groups:
+        await db.execute(
+            insert(Ingredient).execution_options(render_nulls=True),
+            [
+                {
+                    "ingredient_group_id": group_id,
+                    "position": j,
+                    "food": ing.food,
+                    "amount_min": ing.amount_min,
+                    "amount_max": ing.amount_max,
+                    "unit_id": ing.unit_id,
+                    "comment": ing.comment,
+                }
+                for group_id, group in new_ingredient_groups
+                for j, ing in enumerate(group.ingredients)
+            ],
+        )
+
+    recipe_ids = list(
+        await db.scalars(
+            insert(Recipe)
+            .returning(Recipe.id, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True),
+            [
+                {
+                    "owner_id": owner_id,
+                    "is_draft": recipe.is_draft,
+                    "is_private": recipe.is_private,
+                    "language": recipe.language,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for _, recipe in valid
+            ],
+        )
+    )
+    revision_ids = list(
+        await db.scalars(
+            insert(RecipeRevision)
+            .returning(RecipeRevision.id, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True),
+            [
+                {
+                    "recipe_id": recipe_id,
+                    **recipe.content.model_dump(
+                        exclude={"categories", "ingredient_groups", "instruction_groups"}
+                    ),
+                    "change_summary": recipe.change_summary,
+                    "content_hash": revision_content_hash(recipe.content),
+                    "serialized": _serialized_revision(recipe, categories, units, now),
+                    "created_at": now,
+                }
+                for recipe_id, (_, recipe) in zip(recipe_ids, valid)
+            ],
+        )
+    )
+
+    await db.execute(
+        insert(RevisionIngredientGroup),
+        [
+            {"recipe_revision_id": revision_id, "position": i, "group_id": group_id}
+            for revision_id, group_ids in zip(revision_ids, ingredient_group_ids)
+            for i, group_id in enumerate(group_ids)
+        ],
+    )
+    await db.execute(
+        insert(RevisionInstructionGroup),
+        [
+            {"recipe_revision_id": revision_id, "position": i, "group_id": group_id}
+            for revision_id, group_ids in zip(revision_ids, instruction_group_ids)
+            for i, group_id in enumerate(group_ids)
+        ],
+    )
+    category_rows = [
+        {"recipe_id": revision_id, "category_id": category_id}
+        for revision_id, content in zip(revision_ids, contents)
+        for category_id in content.categories
+    ]
+    if category_rows:
+        await db.execute(insert(recipe_categories_association), category_rows)
+
+    # each of the new recipes has exactly one revision
+    await db.execute(
+        update(Recipe)
+        .where(Recipe.id.in_(recipe_ids))
+        .values(
+            latest_revision_id=select(RecipeRevision.id)
+            .where(RecipeRevision.recipe_id == Recipe.id)
+            .scalar_subquery(),
+            updated_at=Recipe.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        insert(RecipeChange).execution_options(render_nulls=True),
+        [
+            {
+                "recipe_id": recipe_id,
+                "owner_id": owner_id,
+                "op": RecipeChangeOp.UPSERT,
+                "is_private": recipe.is_private,
+                "was_private": True,
+            }
+            for recipe_id, (_, recipe) in zip(recipe_ids, valid)
+        ],
+    )
+
+    for recipe_id, (i, _) in zip(recipe_ids, valid):
+        results[i] = recipe_id
+    return results
@@ -0,0 +1,102 @@
+"""
+Per-process cache of `RecipeRead` payloads.
+
+Entries are stored per recipe together with the version they were built
+from: `(latest_revision_id, updated_at, favorite_count, related_count,
+related_updated_at)`,
+i.e. the state columns of `routes._recipe_state_columns` minus the per-user
+favorite flag. Readers look up with the version they just read from the
+database, so a new revision (or any other change of the payload) simply
+misses, also in other worker processes.
+
+Entries hold no per-user data (`is_favorited` is always False), so users
+reading the same public recipe share one entry and overlay their own flag.
+The `favorite_count` of translation headers isn't part of the version and
+may lag behind by up to the cache TTL.
+
+Entries also keep the response bodies of `GET /recipes/{id}` built from them,
+one per favorite flag and content encoding, so a hit is neither serialized
+nor compressed again. Revisions are immutable, so their compressed snapshots
+(`GET /recipes/{id}/versions/{revision_id}`) are simply kept by id.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.cache import TTLCache
+from app.core.compression import encode_body
+from app.core.config import settings
+from app.recipes.schemas import RecipeRead
+
+RecipeVersion = tuple[Any, ...]
+EncodedBody = tuple[bytes, str | None]
+
+
+@dataclass
+class CachedRecipe:
+    version: RecipeVersion
+    recipe: RecipeRead
+    # (is_favorited, content encoding) -> `encode_body` of the JSON
+    bodies: dict[tuple[bool, str | None], EncodedBody] = field(default_factory=dict)
+
+    def body(self, is_favorited: bool, encoding: str | None) -> EncodedBody:
+        """The recipe's JSON with the user's favorite flag, encoded once"""
+        key = (is_favorited, encoding)
+        body = self.bodies.get(key)
+        if body is None:
+            recipe = self.recipe.model_copy(update={"is_favorited": is_favorited})
+            body = encode_body(recipe.model_dump_json().encode(), encoding)
+            self.bodies[key] = body
+        return body
+
+
+recipe_cache: TTLCache[int, CachedRecipe] = TTLCache(
+    maxsize=settings.RECIPE_CACHE_SIZE, ttl=settings.RECIPE_CACHE_TTL_SECONDS
+)
+# revision id -> content encoding -> `encode_body` of the snapshot
+snapshot_cache: TTLCache[int, dict[str, EncodedBody]] = TTLCache(
+    maxsize=settings.RECIPE_CACHE_SIZE, ttl=settings.RECIPE_CACHE_TTL_SECONDS
+)
+
+
+def recipe_version(row: Any) -> RecipeVersion:
+    """Version of a recipe from a row holding its state columns"""
+    return (
+        row.latest_revision_id,
+        row.updated_at,
+        row.favorite_count,
+        row.related_count,
+        row.related_updated_at,
+    )
+
+
+def get_cached_entry(recipe_id: int, version: RecipeVersion) -> CachedRecipe | None:
+    return recipe_cache.get(recipe_id, valid=lambda entry: entry.version == version)
+
+
+def get_cached_recipe(recipe_id: int, version: RecipeVersion) -> RecipeRead | None:
+    entry = get_cached_entry(recipe_id, version)
+    return entry.recipe if entry is not None else None
+
+
+def cache_recipe(
+    recipe_id: int, version: RecipeVersion, recipe: RecipeRead
+) -> CachedRecipe:
+    entry = CachedRecipe(version, recipe.model_copy(update={"is_favorited": False}))
+    recipe_cache.set(recipe_id, entry)
+    return entry
+
+
+def get_cached_snapshot(revision_id: int, encoding: str) -> EncodedBody | None:
+    bodies = snapshot_cache.get(revision_id)
+    return bodies.get(encoding) if bodies is not None else None
+
+
+def cache_snapshot(revision_id: int, encoding: str, body: EncodedBody) -> None:
+    bodies = snapshot_cache.get(revision_id) or {}
+    bodies[encoding] = body
+    snapshot_cache.set(revision_id, bodies)
+
+
+def evict_recipe(recipe_id: int) -> None:
+    recipe_cache.pop(recipe_id)
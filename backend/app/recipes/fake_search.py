@@ -0,0 +1,179 @@
+"""
+In-memory stand-in for the Meilisearch HTTP API, for tests and benchmarks.
+
+Implements the endpoints `MeilisearchService` calls, with simplified search
+(every query word must occur in a searchable attribute) and filters (`=`
+conditions combined with `AND` / `OR`, as `search_recipes` builds them).
+Plug it in through the service's transport, no server needed:
+
+    fake = FakeMeilisearch()
+    service = MeilisearchService(url="http://meilisearch", transport=fake.transport())
+
+`requests` records every call, `fail_next` injects errors and `latency`
+delays every response. `max_in_flight` is the most requests handled at the
+same time, e.g. to check how many searches a worker keeps in flight.
+"""
+
+import asyncio
+import json
+import re
+from itertools import count
+from typing import Any
+
+import httpx
+
+_INDEX_PATH = re.compile(r"^/indexes/(?P<uid>[^/]+)(?P<rest>/.*)?$")
+
+
+class FakeMeilisearch:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        # index uid -> {"primaryKey": ..., "settings": {...}, "documents": {id: doc}}
+        self.indexes: dict[str, dict[str, Any]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._task_uids = count()
+        self._failures: list[int | type[httpx.TransportError]] = []
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def fail_next(
+        self, times: int = 1, error: int | type[httpx.TransportError] = 503
+    ) -> None:
+        """Fail the next `times` requests with a status code or by raising `error`"""
+        self._failures.extend([error] * times)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self._failures:
+                error = self._failures.pop(0)
+                if isinstance(error, int):
+                    return _error(error, "injected failure", "internal")
+                raise error("injected failure", request=request)
+            return self._respond(request)
+        finally:
+            self.in_flight -= 1
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else None
+        path = request.url.path
+        if path == "/indexes" and request.method == "POST":
+            self._index(body["uid"], body.get("primaryKey"))
+            return self._task(body["uid"], "indexCreation")
+        if path.startswith("/tasks/") and request.method == "GET":
+            return httpx.Response(
+                200, json={"uid": int(path.rsplit("/", 1)[1]), "status": "succeeded"}
+            )
+
+        match = _INDEX_PATH.match(path)
+        if match is None:
+            return _error(404, f"{path} not found", "not_found")
+        uid, rest = match["uid"], match["rest"] or ""
+
+        if rest == "/settings" and request.method == "PATCH":
+            self._index(uid)["settings"].update(body)
+            return self._task(uid, "settingsUpdate")
+        if rest == "/documents" and request.method == "POST":
+            index = self._index(uid, request.url.params.get("primaryKey"))
+            for document in body:
+                # Meilisearch fails the task for documents without one
+                if document.get(index["primaryKey"]) is not None:
+                    index["documents"][str(document[index["primaryKey"]])] = document
+            return self._task(uid, "documentAdditionOrUpdate")
+
+        index = self.indexes.get(uid)
+        if index is None:
+            return _error(404, f"Index `{uid}` not found.", "index_not_found")
+        if rest == "" and request.method == "GET":
+            return httpx.Response(
+                200, json={"uid": uid, "primaryKey": index["primaryKey"]}
+            )
+        if rest.startswith("/documents/") and request.method == "DELETE":
+            index["documents"].pop(rest.removeprefix("/documents/"), None)
+            return self._task(uid, "documentDeletion")
+        if rest == "/search" and request.method == "POST":
+            return httpx.Response(200, json=_search(index, body))
+        return _error(404, f"{path} not found", "not_found")
+
+    def _index(self, uid: str, primary_key: str | None = None) -> dict[str, Any]:
+        index = self.indexes.setdefault(
+            uid, {"primaryKey": primary_key, "settings": {}, "documents": {}}
+        )
+        index["primaryKey"] = index["primaryKey"] or primary_key or "id"
+        return index
+
+    def _task(self, uid: str, task_type: str) -> httpx.Response:
+        return httpx.Response(
+            202,
+            json={
+                "taskUid": next(self._task_uids),
+                "indexUid": uid,
+                "status": "enqueued",
+                "type": task_type,
+            },
+        )
+
+
+def _error(status_code: int, message: str, code: str) -> httpx.Response:
+    return httpx.Response(status_code, json={"message": message, "code": code})
+
+
+def _search(index: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
+    words = (params.get("q") or "").lower().split()
+    searchable = index["settings"].get("searchableAttributes")
+    hits = [
+        document
+        for document in index["documents"].values()
+        if _matches_filter(document, params.get("filter"))
+        and all(word in _text(document, searchable) for word in words)
+    ]
+    offset, limit = params.get("offset", 0), params.get("limit", 20)
+    return {
+        "hits": hits[offset : offset + limit],
+        "query": params.get("q") or "",
+        "offset": offset,
+        "limit": limit,
+        "estimatedTotalHits": len(hits),
+        "processingTimeMs": 0,
+    }
+
+
+def _text(document: dict[str, Any], attributes: list[str] | None) -> str:
+    values = [document.get(a) for a in attributes] if attributes else document.values()
+    flat = []
+    for value in values:
+        flat.extend(value if isinstance(value, list) else [value])
+    return " ".join(str(value) for value in flat if value is not None).lower()
+
+
+def _matches_filter(document: dict[str, Any], filter_string: str | None) -> bool:
+    if not filter_string:
+        return True
+    return all(
+        any(
+            _matches_condition(document, condition)
+            for condition in clause.strip().strip("()").split(" OR ")
+        )
+        for clause in filter_string.split(" AND ")
+    )
+
+
+def _matches_condition(document: dict[str, Any], condition: str) -> bool:
+    field, _, expected = condition.partition("=")
+    expected = expected.strip().strip('"')
+    value = document.get(field.strip())
+    values = value if isinstance(value, list) else [value]
+    return any(_format(v) == expected for v in values)
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
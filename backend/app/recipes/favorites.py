@@ -0,0 +1,37 @@
+"""
+Repair of the denormalized `Recipe.favorite_count`.
+
+The favorites endpoints adjust the counter together with the row in
+`user_favorite_recipes`. Rows removed by the database alone don't: deleting
+a user drops their favorites through ON DELETE CASCADE and leaves the
+counters of those recipes too high. `recount_favorites` sets the counters of
+a batch of recipes back to the number of rows, `scripts/recount_favorites.py`
+walks all recipes with it, e.g. after deleting users.
+"""
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.recipes.associations import user_favorite_recipes
+from app.recipes.models import Recipe
+
+
+async def recount_favorites(db: AsyncSession, recipe_ids) -> list[int]:
+    """
+    Recount `favorite_count` of `recipe_ids`, without touching `updated_at`.
+
+    Returns the ids of the recipes whose counter was off.
+    """
+    actual = (
+        select(func.count())
+        .where(user_favorite_recipes.c.recipe_id == Recipe.id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Recipe)
+        .where(Recipe.id.in_(recipe_ids), Recipe.favorite_count != actual)
+        .values(favorite_count=actual, updated_at=Recipe.updated_at)
+        .returning(Recipe.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
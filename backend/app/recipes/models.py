@@ -5,6 +5,7 @@ from uuid import UUID, uuid7
 
 from pydantic_core.core_schema import nullable_schema
 from sqlalchemy import (
+    BigInteger,
     Float,
     ForeignKey,
     Index,
@@ -17,9 +18,18 @@ from sqlalchemy import (
     Enum as SQLEnum,
     Table,
     Column,
+    false,
     null,
+    text,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    query_expression,
+    relationship,
+)
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.orderinglist import ordering_list
 
 from pydantic import BaseModel, EmailStr, Field, validator, field_validator
@@ -99,11 +109,21 @@ class Ingredient(Base):
 
 
 class IngredientGroup(Base):
+    """
+    A named list of ingredients. Groups are immutable once written and can be
+    shared by several revisions (see `RevisionIngredientGroup`), found by the
+    hash of their contents.
+    """
+
     __tablename__ = "ingredient_groups"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, nullable=True)
-    position: Mapped[int] = mapped_column(Integer)
+    # sha256 of the contents, see `storage.ingredient_group_hash`. NULL for
+    # groups written before sharing existed, which are never shared.
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
 
     # Ingredients in this group
     ingredients: Mapped[list["Ingredient"]] = relationship(
@@ -114,29 +134,50 @@ class IngredientGroup(Base):
         cascade="all, delete-orphan",
     )
 
-    recipe_revision_id: Mapped[int] = mapped_column(
-        ForeignKey("recipe_revisions.id", ondelete="CASCADE"), nullable=False
-    )  # Back-reference to RecipeRevision
-    recipe_revision: Mapped["RecipeRevision"] = relationship(
-        "RecipeRevision", back_populates="ingredient_groups"
-    )
-
 
 class InstructionGroup(Base):
+    """Like `IngredientGroup`: immutable and shared between revisions"""
+
     __tablename__ = "instruction_groups"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, nullable=True)
     instructions: Mapped[str] = mapped_column(String, nullable=True)
-    position: Mapped[int] = mapped_column(Integer)
+    # see `IngredientGroup.content_hash`
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
+
+
+class RevisionIngredientGroup(Base):
+    """Position of an ingredient group in a revision"""
+
+    __tablename__ = "recipe_revision_ingredient_groups"
+
+    recipe_revision_id: Mapped[int] = mapped_column(
+        ForeignKey("recipe_revisions.id", ondelete="CASCADE"), primary_key=True
+    )
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # indexed to find groups no revision links to anymore
+    group_id: Mapped[int] = mapped_column(
+        ForeignKey("ingredient_groups.id"), nullable=False, index=True
+    )
+    group: Mapped["IngredientGroup"] = relationship("IngredientGroup")
+
+
+class RevisionInstructionGroup(Base):
+    """Position of an instruction group in a revision"""
+
+    __tablename__ = "recipe_revision_instruction_groups"
 
     recipe_revision_id: Mapped[int] = mapped_column(
-        ForeignKey("recipe_revisions.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("recipe_revisions.id", ondelete="CASCADE"), primary_key=True
     )
-    # Back-reference to RecipeRevision
-    recipe_revision: Mapped["RecipeRevision"] = relationship(
-        "RecipeRevision", back_populates="instruction_groups"
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    group_id: Mapped[int] = mapped_column(
+        ForeignKey("instruction_groups.id"), nullable=False, index=True
     )
+    group: Mapped["InstructionGroup"] = relationship("InstructionGroup")
 
 
 class Recipe(Base):
@@ -199,18 +240,32 @@ class Recipe(Base):
     )
     
     # Extra meta
+    # number of rows in user_favorite_recipes, kept in sync by the favorites endpoints
+    # (not by ON DELETE CASCADE of deleted users, see app/recipes/favorites.py)
+    favorite_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # can be large for popular recipes: only load explicitly, e.g. selectinload()
     favorited_by = relationship(
         "User",
         secondary=user_favorite_recipes,
         back_populates="favorite_recipes",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
+    # per user, loaded with `with_expression(Recipe.is_favorited, ...)`
+    is_favorited: Mapped[bool] = query_expression(default_expr=false())
     __table_args__ = (
         Index(
             "ix_recipes_updated_at_desc",
             updated_at.desc(),
             id.desc(),
         ),
+        Index(
+            "ix_recipes_favorite_count_desc",
+            favorite_count.desc(),
+            id.desc(),
+        ),
     )
 
     @property
@@ -240,6 +295,14 @@ class RecipeRevision(Base):
     source_url: Mapped[str | None] = mapped_column(String, nullable=True)
 
     owner_comment: Mapped[str | None] = mapped_column(String, nullable=True)
+    # sha256 of the RecipeRevisionCreateUpdate it was written from, see
+    # `storage.revision_content_hash`, to skip saves that change nothing.
+    # NULL for revisions written before it existed.
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # optional note of the editor on what changed, shown in the history
+    change_summary: Mapped[str | None] = mapped_column(
+        String(constants.MAX_RECIPE_NAME_LENGTH), nullable=True
+    )
     categories: Mapped[list["RecipeCategories"]] = relationship(
         "RecipeCategories",
         secondary=recipe_categories_association,
@@ -254,25 +317,107 @@ class RecipeRevision(Base):
     )
     # is_current: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
+    # RecipeRevisionRead as JSON, written together with the (immutable) revision
+    # so detail reads can serve it without loading and validating the tree.
+    # NULL for revisions written before it existed, filled in on first read.
+    serialized: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
+
     # Relationships back to Recipe
     recipe: Mapped["Recipe"] = relationship(
         "Recipe", foreign_keys=[recipe_id], back_populates="revisions"
     )
 
-    # Ingredient and instruction groups
-    ingredient_groups: Mapped[list["IngredientGroup"]] = relationship(
-        "IngredientGroup",
-        order_by="IngredientGroup.position",
-        collection_class=ordering_list("position"),
-        # backref="recipe_revision",
-        back_populates="recipe_revision",
+    # Ingredient and instruction groups, in order. Written through the links
+    # (see `set_groups`), the group lists are for reading.
+    ingredient_group_links: Mapped[list["RevisionIngredientGroup"]] = relationship(
+        "RevisionIngredientGroup",
+        order_by="RevisionIngredientGroup.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    instruction_group_links: Mapped[list["RevisionInstructionGroup"]] = relationship(
+        "RevisionInstructionGroup",
+        order_by="RevisionInstructionGroup.position",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
+    ingredient_groups: Mapped[list["IngredientGroup"]] = relationship(
+        "IngredientGroup",
+        secondary="recipe_revision_ingredient_groups",
+        order_by="RevisionIngredientGroup.position",
+        viewonly=True,
+    )
     instruction_groups: Mapped[list["InstructionGroup"]] = relationship(
         "InstructionGroup",
-        order_by="InstructionGroup.position",
-        collection_class=ordering_list("position"),
-        back_populates="recipe_revision",
-        cascade="all, delete-orphan",
+        secondary="recipe_revision_instruction_groups",
+        order_by="RevisionInstructionGroup.position",
+        viewonly=True,
+    )
+
+    def set_groups(
+        self,
+        ingredient_groups: list["IngredientGroup"],
+        instruction_groups: list["InstructionGroup"],
+    ) -> None:
+        """Link the groups in this order. They may be linked to other revisions too."""
+        self.ingredient_group_links = [
+            RevisionIngredientGroup(position=i, group=group)
+            for i, group in enumerate(ingredient_groups)
+        ]
+        self.instruction_group_links = [
+            RevisionInstructionGroup(position=i, group=group)
+            for i, group in enumerate(instruction_groups)
+        ]
+        # the read side only follows the links once loaded from the database
+        set_committed_value(self, "ingredient_groups", list(ingredient_groups))
+        set_committed_value(self, "instruction_groups", list(instruction_groups))
+
+    __table_args__ = (
+        # history pages: seek within one recipe, newest first
+        Index(
+            "ix_recipe_revisions_recipe_id_created_at_desc",
+            recipe_id,
+            created_at.desc(),
+            id.desc(),
+        ),
+    )
+
+
+class RecipeChangeOp(str, Enum):
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class RecipeChange(Base):
+    """
+    Append-only log of recipe writes, backing the delta-sync change feed.
+
+    Rows outlive the recipe they describe (no FK), so deletions can be
+    delivered as tombstones. Visibility is stored before and after the change,
+    so a recipe turning private shows up as a tombstone for everyone but its
+    owner.
+    """
+
+    __tablename__ = "recipe_changes"
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # id of the writing transaction (xid8), used to hold back rows of transactions
+    # that may still be in flight, see `routes.get_recipe_changes`
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("(pg_current_xact_id()::text)::bigint"),
+        nullable=False,
     )
+    recipe_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    owner_id: Mapped[USER_ID_T] = mapped_column(nullable=False)
+    op: Mapped[RecipeChangeOp] = mapped_column(SQLEnum(RecipeChangeOp), nullable=False)
+    is_private: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    was_private: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
+    )
+
+    __table_args__ = (Index("ix_recipe_changes_txid_seq", txid, seq),)
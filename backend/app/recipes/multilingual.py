@@ -0,0 +1,64 @@
+"""
+The multilingual strings (unit names, ...) served by `/recipes/multilingual`.
+
+`app/data/multilingual.json` only changes with a deploy, so it is parsed once
+per process, on first use, and kept as ready-to-send bodies: the whole
+document and one slice per language, each serialized, compressed with every
+encoding we support and tagged with an ETag over its content.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from app.core.compression import ENCODINGS, encode_body
+from app.core.config import APP_DIR
+
+MULTILINGUAL_PATH = APP_DIR.parent / "data" / "multilingual.json"
+
+# identical for every user and only changes with a deploy
+CACHE_CONTROL = "public, max-age=86400"
+
+
+@dataclass(frozen=True)
+class Payload:
+    body: bytes
+    etag: str
+    # `encode_body` of `body` per content encoding
+    encoded: dict[str, tuple[bytes, str | None]]
+
+    def encode(self, encoding: str | None) -> tuple[bytes, str | None]:
+        return self.encoded.get(encoding, (self.body, None))
+
+
+def content_version(data) -> str:
+    """Hash over the JSON of `data`, the same in every process"""
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+
+
+def build_payload(data, version: str | None = None) -> Payload:
+    """`Payload` of `data`, tagged with `version` (default: over its content)"""
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    return Payload(
+        body=body,
+        etag=f'"{version or content_version(data)}"',
+        encoded={
+            encoding: encode_body(body, encoding, best=True)
+            for encoding in ENCODINGS
+        },
+    )
+
+
+@cache
+def multilingual_payloads(path: Path = MULTILINGUAL_PATH) -> dict[str | None, Payload]:
+    """Payloads by language, `None` for the whole document"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    payloads: dict[str | None, Payload] = {None: build_payload(data)}
+    payloads.update(
+        (language, build_payload(strings)) for language, strings in data.items()
+    )
+    return payloads
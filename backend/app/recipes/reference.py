@@ -0,0 +1,205 @@
+"""
+Per-process registry of the reference data: units and recipe categories.
+
+Both are a small, near-static fixture set (`fixtures/units.json`,
+`fixtures/recipe_categories.json`), so instead of querying them on every
+write, and loading `Unit` rows for every ingredient read, they are loaded once
+and kept in memory:
+
+- writes validate unit and category ids with set lookups (`resolve`),
+- `add_to_session` puts the units and categories into a session's identity
+  map without any SQL (`Session.merge(load=False)`, the pattern for cached
+  objects). `Ingredient.unit` is loaded with `immediateload`, i.e. the lazy
+  loader run while loading, which looks at the identity map first, so units
+  are served from memory and only units the registry doesn't know are queried.
+
+The app loads the registry at startup and reloads it every
+`REFERENCE_DATA_TTL_SECONDS` in the background (`refresh_periodically`), so
+fixtures installed from another process show up eventually, and right away
+when a write refers to an id it doesn't know. Such ids are looked up by
+primary key first and only reload the registry if they exist, and concurrent
+writes wait for the same reload, so requests with made-up ids can't keep
+reloading it. Code holding a session reloads a stale registry itself, e.g.
+in scripts. `version` changes whenever the contents do.
+
+`bundle` is everything a client needs to bootstrap (`GET /reference-data`):
+units, categories, the multilingual strings and the allowed languages, built
+once per `version` and kept ready to send, without touching the database.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Callable
+
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.recipes.constants import LANGUAGE_CODE
+from app.recipes.models import RecipeCategories, Unit
+from app.recipes.multilingual import (
+    Payload,
+    build_payload,
+    content_version,
+    multilingual_payloads,
+)
+from app.recipes.schemas import RecipeCategoryRead, UnitRead
+
+logger = logging.getLogger(__name__)
+
+# key in `Session.info`: (version, units, categories) merged into that session
+_SESSION_KEY = "reference_data"
+
+
+class ReferenceData:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # detached instances, never attached to a session themselves
+        self.units: dict[int, Unit] = {}
+        self.categories: dict[int, RecipeCategories] = {}
+        self.version: str | None = None
+        self._loaded_at: float | None = None
+        self._bundle: tuple[str | None, Payload] | None = None
+        self._reload_lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def load(self, db: AsyncSession) -> bool:
+        """(Re)load from the database. Returns whether anything changed."""
+        units = list(await db.scalars(select(Unit).order_by(Unit.id)))
+        categories = list(
+            await db.scalars(select(RecipeCategories).order_by(RecipeCategories.id))
+        )
+        # new instances, the loaded ones stay with `db`
+        self.units = {unit.id: _copy(unit) for unit in units}
+        self.categories = {category.id: _copy(category) for category in categories}
+        self._loaded_at = time.monotonic()
+
+        version = _version(self.units.values(), self.categories.values())
+        changed = version != self.version
+        self.version = version
+        return changed
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.is_stale:
+            await self.load(db)
+
+    async def refresh_periodically(self, session_factory: Callable) -> None:
+        """Reload every `ttl` seconds, forever. Run as a background task."""
+        while True:
+            await asyncio.sleep(self.ttl)
+            try:
+                async with session_factory() as db:
+                    await self.load(db)
+            except Exception:
+                # keep serving what we have, try again next time
+                logger.exception("Reloading the reference data failed")
+
+    def invalidate(self) -> None:
+        """Reload on next use"""
+        self._loaded_at = None
+
+    def _missing(self, unit_ids: set[int], category_ids: set[int]):
+        return unit_ids - self.units.keys(), category_ids - self.categories.keys()
+
+    async def _reload_for(
+        self, db: AsyncSession, unit_ids: set[int], category_ids: set[int]
+    ) -> None:
+        """Reload if any of the unknown ids exist, once for concurrent callers"""
+        missing_units, missing_categories = self._missing(unit_ids, category_ids)
+        installed = await db.scalar(
+            select(
+                or_(
+                    exists().where(Unit.id.in_(missing_units)),
+                    exists().where(RecipeCategories.id.in_(missing_categories)),
+                )
+            )
+        )
+        if not installed:
+            return
+        async with self._reload_lock:
+            # unless another caller reloaded while this one waited
+            if any(self._missing(unit_ids, category_ids)):
+                await self.load(db)
+
+    async def add_to_session(
+        self, db: AsyncSession
+    ) -> tuple[dict[int, Unit], dict[int, RecipeCategories]]:
+        """
+        Make the units and categories known to `db` without querying them, see
+        the module docstring. Returns `db`'s instances of them by id. Cheap to
+        call repeatedly.
+        """
+        await self.ensure_loaded(db)
+        version, units, categories = db.info.get(_SESSION_KEY, (None, None, None))
+        if version != self.version:
+            # also keeps them referenced, the identity map only holds weak refs
+            units = {i: await db.merge(u, load=False) for i, u in self.units.items()}
+            categories = {
+                i: await db.merge(c, load=False) for i, c in self.categories.items()
+            }
+            db.info[_SESSION_KEY] = (self.version, units, categories)
+        return units, categories
+
+    def bundle(self) -> Payload:
+        """The bootstrap bundle of the loaded data, see the module docstring"""
+        if self._bundle is None or self._bundle[0] != self.version:
+            content = {
+                "units": [
+                    UnitRead.model_validate(unit).model_dump(mode="json")
+                    for unit in self.units.values()
+                ],
+                "categories": [
+                    RecipeCategoryRead.model_validate(category).model_dump(mode="json")
+                    for category in self.categories.values()
+                ],
+                "languages": LANGUAGE_CODE,
+                "multilingual": json.loads(multilingual_payloads()[None].body),
+            }
+            version = content_version(content)
+            self._bundle = (
+                self.version,
+                build_payload({"version": version, **content}, version),
+            )
+        return self._bundle[1]
+
+    async def resolve(
+        self, db: AsyncSession, unit_ids: set[int], category_ids: set[int]
+    ) -> tuple[dict[int, Unit], dict[int, RecipeCategories]]:
+        """
+        Units and categories of the given ids, as instances of `db`. Unknown ids
+        are left out, after reloading if they were just installed.
+        """
+        units, categories = await self.add_to_session(db)
+        if not (unit_ids <= units.keys() and category_ids <= categories.keys()):
+            await self._reload_for(db, unit_ids, category_ids)
+            units, categories = await self.add_to_session(db)
+        return (
+            {i: units[i] for i in unit_ids & units.keys()},
+            {i: categories[i] for i in category_ids & categories.keys()},
+        )
+
+
+def _copy(obj):
+    """Detached copy of a loaded `Unit` / `RecipeCategories`, as if loaded"""
+    copy = type(obj)(**{c.key: getattr(obj, c.key) for c in obj.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
+
+def _version(units, categories) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for obj in (*units, *categories):
+        digest.update(
+            repr([getattr(obj, c.key) for c in obj.__table__.columns]).encode()
+        )
+    return digest.hexdigest()
+
+
+reference_data = ReferenceData(ttl=settings.REFERENCE_DATA_TTL_SECONDS)
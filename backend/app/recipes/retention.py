@@ -0,0 +1,177 @@
+"""
+Retention policy for recipe revisions.
+
+Every save writes a revision and nothing ever removed them. Per recipe we keep
+
+- the `keep_last` newest revisions,
+- beyond that, the newest revision of each day for the last `keep_daily_days`
+  days and of each week for the last `keep_weekly_weeks` weeks,
+- and always the recipe's `latest_revision_id`,
+
+everything else is deleted. Revisions are deleted with a single set-based
+statement, their group links and categories go with them (ON DELETE CASCADE),
+groups no other revision links to are deleted afterwards (see `storage.py`).
+
+`compact_revisions` handles one batch of recipes inside the caller's
+transaction, `scripts/compact_revisions.py` walks all recipes with it.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, delete, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.recipes.associations import recipe_categories_association
+from app.recipes.models import (
+    Ingredient,
+    Recipe,
+    RecipeRevision,
+    RevisionIngredientGroup,
+    RevisionInstructionGroup,
+)
+from app.recipes.storage import delete_orphan_groups, linked_group_ids
+
+RECLAIMED_KEYS = (
+    "recipe_revisions",
+    "recipe_revision_ingredient_groups",
+    "recipe_revision_instruction_groups",
+    "recipe_categories_association",
+    "ingredient_groups",
+    "ingredients",
+    "instruction_groups",
+)
+
+
+def prunable_revisions(
+    recipe_ids,
+    keep_last: int,
+    keep_daily_days: int,
+    keep_weekly_weeks: int,
+    now: datetime,
+):
+    """Select the ids of the revisions of `recipe_ids` the policy drops"""
+    newest_first = (RecipeRevision.created_at.desc(), RecipeRevision.id.desc())
+
+    def rank(*partition_by):
+        return func.row_number().over(
+            partition_by=(RecipeRevision.recipe_id, *partition_by),
+            order_by=newest_first,
+        )
+
+    ranked = (
+        select(
+            RecipeRevision.id,
+            RecipeRevision.created_at,
+            rank().label("rank"),
+            rank(func.date_trunc("day", RecipeRevision.created_at)).label("day_rank"),
+            rank(func.date_trunc("week", RecipeRevision.created_at)).label(
+                "week_rank"
+            ),
+        )
+        .where(RecipeRevision.recipe_id.in_(recipe_ids))
+        .subquery()
+    )
+    return select(ranked.c.id).where(
+        ranked.c.rank > keep_last,
+        ~and_(
+            ranked.c.day_rank == 1,
+            ranked.c.created_at >= now - timedelta(days=keep_daily_days),
+        ),
+        ~and_(
+            ranked.c.week_rank == 1,
+            ranked.c.created_at >= now - timedelta(weeks=keep_weekly_weeks),
+        ),
+        ~exists().where(Recipe.latest_revision_id == ranked.c.id),
+    )
+
+
+async def compact_revisions(
+    db: AsyncSession,
+    recipe_ids: list[int],
+    keep_last: int | None = None,
+    keep_daily_days: int | None = None,
+    keep_weekly_weeks: int | None = None,
+    now: datetime | None = None,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """
+    Apply the retention policy to the revisions of `recipe_ids`. Unset
+    arguments default to the `REVISION_RETENTION_*` settings.
+
+    Returns the number of rows deleted per table (or that would be, for
+    `dry_run`, except for groups, which depend on the deletes before).
+    Does not commit.
+    """
+    revision_ids = list(
+        await db.scalars(
+            prunable_revisions(
+                recipe_ids,
+                keep_last=(
+                    settings.REVISION_RETENTION_KEEP_LAST
+                    if keep_last is None
+                    else keep_last
+                ),
+                keep_daily_days=(
+                    settings.REVISION_RETENTION_DAILY_DAYS
+                    if keep_daily_days is None
+                    else keep_daily_days
+                ),
+                keep_weekly_weeks=(
+                    settings.REVISION_RETENTION_WEEKLY_WEEKS
+                    if keep_weekly_weeks is None
+                    else keep_weekly_weeks
+                ),
+                now=now or datetime.now(UTC),
+            )
+        )
+    )
+    reclaimed = dict.fromkeys(RECLAIMED_KEYS, 0)
+    if not revision_ids:
+        return reclaimed
+
+    # rows the cascade takes along, counted up front since rowcount won't
+    def linked(column):
+        return (
+            select(func.count()).where(column.in_(revision_ids)).scalar_subquery()
+        )
+
+    (
+        reclaimed["recipe_revision_ingredient_groups"],
+        reclaimed["recipe_revision_instruction_groups"],
+        reclaimed["recipe_categories_association"],
+    ) = (
+        await db.execute(
+            select(
+                linked(RevisionIngredientGroup.recipe_revision_id),
+                linked(RevisionInstructionGroup.recipe_revision_id),
+                linked(recipe_categories_association.c.recipe_id),
+            )
+        )
+    ).one()
+    reclaimed["recipe_revisions"] = len(revision_ids)
+    if dry_run:
+        return reclaimed
+
+    ingredient_group_ids, instruction_group_ids = await linked_group_ids(
+        db, revision_ids
+    )
+    await db.execute(
+        delete(RecipeRevision)
+        .where(RecipeRevision.id.in_(revision_ids))
+        .execution_options(synchronize_session=False)
+    )
+    if ingredient_group_ids:
+        reclaimed["ingredients"] = await db.scalar(
+            select(func.count()).where(
+                Ingredient.ingredient_group_id.in_(ingredient_group_ids),
+                ~exists().where(
+                    RevisionIngredientGroup.group_id == Ingredient.ingredient_group_id
+                ),
+            )
+        )
+    (
+        reclaimed["ingredient_groups"],
+        reclaimed["instruction_groups"],
+    ) = await delete_orphan_groups(db, ingredient_group_ids, instruction_group_ids)
+    return reclaimed
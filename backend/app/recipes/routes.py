@@ -1,6 +1,5 @@
-from typing import List
+from typing import List, Literal
 from datetime import datetime, UTC
-import json
 from pathlib import Path
 
 from fastapi import (
@@ -8,19 +7,42 @@ from fastapi import (
     Depends,
     HTTPException,
     Query,
+    Response,
     UploadFile,
     status,
     Request,
 )
 from pydantic import HttpUrl, ValidationError
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import (
+    aliased,
+    joinedload,
+    lazyload,
+    load_only,
+    selectinload,
+    undefer,
+    with_expression,
+)
 from sqlalchemy.orm import Session
-from sqlalchemy import Select, exc, insert, or_, select
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    delete,
+    exc,
+    func,
+    insert,
+    literal_column,
+    null,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_superuser, get_current_user
 from app.auth.models import USER_ID_T, User
-from app.core.config import APP_DIR
 from app.core.depends import (
     DateFilterParams,
     SortParams,
@@ -28,16 +50,26 @@ from app.core.depends import (
     apply_sorting,
     date_filter_dependency,
     sort_dependency,
+    sort_keyset,
 )
 from app.core.pagination import (
     PaginatedResponse,
     PaginationMeta,
     PaginationParams,
+    cursor_after,
     get_pagination_params,
     paginate,
+    paginated_select,
 )
+from app.core.compression import encode_body, encoded_response, negotiate
+from app.core.serialization import dump_json, json_response
+from app.core.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.core.streaming import NDJSONResponse, stream_ndjson
 from app.db import get_db
-from app.recipes.associations import user_favorite_recipes
+from app.recipes.associations import (
+    recipe_categories_association,
+    user_favorite_recipes,
+)
 from app.recipes.gemini import (
     create_recipe_from_file,
     create_recipe_from_url,
@@ -48,29 +80,64 @@ from .models import (
     Recipe,
     RecipeRevision,
     Unit,
-    InstructionGroup,
     IngredientGroup,
     Ingredient,
     RecipeCategories,
+    RecipeChange,
+    RecipeChangeOp,
 )  # SQLAlchemy models
 from .schemas import (
     ALLOWED_LANGUAGES,
+    RECIPE_INCLUDES,
     FoodCandidateRead,
     RecipeListView,
     RecipeRead,
     RecipeReadHeader,
     RecipeCreateUpdate,
-    RecipeReadHistory,
+    RecipeRevisionHeader,
     RecipeRevisionCreateUpdate,
     RecipeRevisionRead,
+    RecipeBatchRequest,
+    RecipeBulkError,
+    RecipeBulkItemResult,
+    RecipeBulkRequest,
+    RecipeBulkResponse,
     RecipeCategoryRead,
+    RecipeChangeFeed,
+    RecipeChangeRead,
     UnitRead,
     InstructionGroupIO,
     IngredientGroupRead,
+    sparse_recipe_read,
 )
+from .bulk import create_recipes_bulk
+from .storage import (
+    build_revision_groups,
+    delete_orphan_groups,
+    linked_group_ids,
+    revision_content_hash,
+)
+from .cache import (
+    cache_recipe,
+    cache_snapshot,
+    evict_recipe,
+    get_cached_entry,
+    get_cached_recipe,
+    get_cached_snapshot,
+    recipe_cache,
+    recipe_version,
+)
+from .multilingual import CACHE_CONTROL as MULTILINGUAL_CACHE_CONTROL
+from .multilingual import Payload, multilingual_payloads
+from .reference import reference_data
 from .search import get_meilisearch_service
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
+reference_router = APIRouter(prefix="/reference-data", tags=["reference-data"])
+
+# clients keep the bundle and revalidate it (cheaply, see `get_reference_data`)
+# on every start
+REFERENCE_DATA_CACHE_CONTROL = "public, no-cache"
 
 
 async def _create_recipe_revision(
@@ -78,29 +145,22 @@ async def _create_recipe_revision(
 ) -> RecipeRevision:
     content = recipe_data.content
 
-    # Validate that all category IDs exist
-    result = await db.execute(
-        select(RecipeCategories).where(RecipeCategories.id.in_(content.categories))
-    )
-    categories = result.scalars().all()
-    if len(categories) != len(content.categories):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="One or more category IDs do not exist",
-        )
-
-    # Validate that all unit IDs exist
-    unit_ids = [
+    # Validate that all category and unit IDs exist, from memory
+    unit_ids = {
         ing.unit_id
         for group in content.ingredient_groups
         for ing in group.ingredients
         if ing.unit_id is not None
-    ]
-    result = await db.execute(select(Unit).where(Unit.id.in_(unit_ids)))
-    units = result.scalars().all()
-    if len(units) != len(set(unit_ids)):
+    }
+    units, categories = await reference_data.resolve(db, unit_ids, content.categories)
+    if len(categories) != len(content.categories):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="One or more category IDs do not exist",
+        )
+    if len(units) != len(unit_ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="One or more unit IDs do not exist",
         )
 
@@ -118,43 +178,45 @@ async def _create_recipe_revision(
         source_page=content.source_page,
         source_url=content.source_url,
         owner_comment=content.owner_comment,
-        categories=categories,
+        change_summary=recipe_data.change_summary,
+        content_hash=revision_content_hash(content),
+        categories=[categories[i] for i in sorted(categories)],
         created_at=datetime.now(UTC),
     )
 
-    # --- Ingredient groups and ingredients ---
-    revision.ingredient_groups = [
-        IngredientGroup(
-            name=group.name,
-            position=i,
-            ingredients=[
-                Ingredient(
-                    comment=ing.comment,
-                    food=ing.food,
-                    amount_min=ing.amount_min,
-                    amount_max=ing.amount_max,
-                    unit_id=ing.unit_id,
-                    position=j,
-                )
-                for j, ing in enumerate(group.ingredients)
-            ],
-        )
-        for i, group in enumerate(content.ingredient_groups)
-    ]
+    # --- Ingredient and instruction groups, unchanged ones are shared ---
+    ingredient_groups, instruction_groups = await build_revision_groups(
+        db, content.ingredient_groups, content.instruction_groups, units
+    )
+    revision.set_groups(ingredient_groups, instruction_groups)
 
-    # --- Instruction groups ---
-    revision.instruction_groups = [
-        InstructionGroup(
-            name=group.name,
-            instructions=group.instructions,
-            position=i,
-        )
-        for i, group in enumerate(content.instruction_groups)
-    ]
+    # everything RecipeRevisionRead needs is in memory, so the snapshot is
+    # inserted along with the revision
+    revision.serialized = _serialize_revision(revision)
 
     return revision
 
 
+def _serialize_revision(revision: RecipeRevision) -> bytes:
+    return RecipeRevisionRead.model_validate(revision).model_dump_json().encode()
+
+
+async def _record_change(
+    db: AsyncSession, recipe: Recipe, op: RecipeChangeOp, was_private: bool
+):
+    """Append a row to the change feed for a write to `recipe`"""
+    await db.execute(
+        insert(RecipeChange).values(
+            recipe_id=recipe.id,
+            owner_id=recipe.owner_id,
+            op=op,
+            # deleted recipes are invisible to everyone, like private ones
+            is_private=True if op == RecipeChangeOp.DELETE else recipe.is_private,
+            was_private=was_private,
+        )
+    )
+
+
 async def _create_recipe(
     recipe_data: RecipeCreateUpdate,
     db: AsyncSession,
@@ -176,52 +238,45 @@ async def _create_recipe(
 
     # --- Add to session and flush for IDs ---
     db.add(recipe)
-    # IDs for recipe, revision, ingredient groups, ingredients are generated
+    # IDs for recipe, revision, ingredient groups, ingredients are generated,
+    # defaults (timestamps, favorite_count) are set on the objects
     await db.flush()
-    await db.refresh(revision)
-    # # Eagerly load all relationships for Pydantic conversion
-    # result = await db.execute(
-    #     select(RecipeRevision)
-    #     .where(RecipeRevision.id == revision.id)
-    #     .options(
-    #         selectinload(RecipeRevision.categories),
-    #         selectinload(RecipeRevision.ingredient_groups)
-    #         .selectinload(IngredientGroup.ingredients)
-    #         .selectinload(Ingredient.unit),
-    #         selectinload(RecipeRevision.instruction_groups),
-    #         selectinload(RecipeRevision.recipe),
-    #     )
-    # )
-    # revision = result.scalar_one()
-
-    # Reload the recipe with everything needed for serialization
-    result = await db.execute(
-        select(Recipe)
-        .where(Recipe.id == recipe.id)
-        .options(
-            selectinload(Recipe.latest_revision).options(
-                selectinload(RecipeRevision.categories),
-                selectinload(RecipeRevision.ingredient_groups)
-                .selectinload(IngredientGroup.ingredients)
-                .selectinload(Ingredient.unit),
-                selectinload(RecipeRevision.instruction_groups),
-            ),
-            selectinload(Recipe.revisions),
-            selectinload(Recipe.original_recipe),
-            selectinload(Recipe.translations),
-        )
-    )
-    recipe = result.scalar_one()
+    # everything RecipeRead needs is in memory already, a new recipe has no
+    # translations and isn't anyone's favorite yet
+    set_committed_value(recipe, "translations", [])
+    set_committed_value(recipe, "is_favorited", False)
+    await _record_change(db, recipe, RecipeChangeOp.UPSERT, was_private=True)
 
     return recipe
 
 
 async def _update_recipe(
     recipe: Recipe, recipe_data: RecipeCreateUpdate, db: AsyncSession
-):
-    revision = await _create_recipe_revision(recipe_data, recipe, db)
+) -> bool:
+    """
+    Apply an update to `recipe` (with its latest revision loaded). A new
+    revision is only written if the content differs from the latest one.
 
-    recipe.latest_revision = revision
+    Returns False if nothing changed, in which case nothing was written.
+    Like `_create_recipe`, leaves `recipe` ready to be serialized as
+    `RecipeRead` without going back to the database.
+    """
+    content_changed = (
+        recipe.latest_revision.content_hash
+        != revision_content_hash(recipe_data.content)
+    )
+    if not content_changed and (
+        recipe.is_draft == recipe_data.is_draft
+        and recipe.is_private == recipe_data.is_private
+        and recipe.language == recipe_data.language
+    ):
+        return False
+
+    was_private = recipe.is_private
+    # expired by flushing the recipe, but no update changes it
+    is_favorited = recipe.is_favorited
+    if content_changed:
+        recipe.latest_revision = await _create_recipe_revision(recipe_data, recipe, db)
     recipe.is_draft = recipe_data.is_draft
     recipe.is_private = recipe_data.is_private
     recipe.language = recipe_data.language
@@ -230,32 +285,415 @@ async def _update_recipe(
     db.add(recipe)
     # IDs for recipe, revision, ingredient groups, ingredients are generated
     await db.flush()
-    await db.refresh(revision)
-    # Eagerly load all relationships for Pydantic conversion
+    set_committed_value(recipe, "is_favorited", is_favorited)
+    await _record_change(db, recipe, RecipeChangeOp.UPSERT, was_private)
+    if recipe.is_private != was_private:
+        evict_recipe(recipe.id)
+    return True
+
+
+def _recipe_read_options(include: frozenset[str] = RECIPE_INCLUDES):
+    """Loader options for serializing recipes as `RecipeRead`, or as its
+    sparse slice with only the relationships in `include`.
+
+    Only `selectinload`, so they can also be used with `yield_per` streaming.
+    """
+    options = [
+        selectinload(Recipe.latest_revision).selectinload(RecipeRevision.categories)
+        if "categories" in include
+        # joined by default
+        else selectinload(Recipe.latest_revision).lazyload(RecipeRevision.categories)
+    ]
+    if "ingredients" in include:
+        options.append(
+            selectinload(Recipe.latest_revision)
+            .selectinload(RecipeRevision.ingredient_groups)
+            .selectinload(IngredientGroup.ingredients)
+            .immediateload(Ingredient.unit)
+        )
+    if "instructions" in include:
+        options.append(
+            selectinload(Recipe.latest_revision).selectinload(
+                RecipeRevision.instruction_groups
+            )
+        )
+    if "translations" in include:
+        options.append(selectinload(Recipe.translations))
+        options.append(selectinload(Recipe.original_recipe))
+    return tuple(options)
+
+
+def _parse_include(
+    include: str | None = Query(
+        None,
+        description=(
+            "Comma separated relationships to include, of "
+            f"{', '.join(sorted(RECIPE_INCLUDES))}; all when omitted"
+        ),
+    ),
+) -> frozenset[str] | None:
+    """Dependency for sparse recipe reads, None meaning the full `RecipeRead`"""
+    if include is None:
+        return None
+    parts = frozenset(part.strip() for part in include.split(",") if part.strip())
+    unknown = parts - RECIPE_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}",
+        )
+    return None if parts == RECIPE_INCLUDES else parts
+
+
+def _is_favorited(user: User):
+    """EXISTS expression: whether `user` favorited the recipe of the row"""
+    return (
+        select(user_favorite_recipes.c.recipe_id)
+        .where(
+            user_favorite_recipes.c.user_id == user.id,
+            user_favorite_recipes.c.recipe_id == Recipe.id,
+        )
+        .exists()
+    )
+
+
+def _with_favorited(stmt: Select, user: User) -> Select:
+    """
+    Fill `Recipe.is_favorited` for `user` in the same query. Recipes already in
+    the session are refreshed, they may carry another user's flag.
+    """
+    return stmt.options(
+        with_expression(Recipe.is_favorited, _is_favorited(user))
+    ).execution_options(populate_existing=True)
+
+
+async def _stream_recipes(
+    db: AsyncSession, stmt: Select, user: User, limit: int | None = None, trailer=None
+):
+    """
+    Stream the recipes selected by `stmt` as NDJSON `RecipeRead` lines, see
+    `stream_ndjson` for `limit` and `trailer`.
+
+    Only the recipe rows are streamed, each partition is then read through
+    `_load_recipe_reads` like a page of the JSON list. Loading relationships in
+    the streamed query itself would clash with `_with_favorited` once a recipe
+    and its translation are in the same partition.
+    """
+
+    async def _load(partition: list[Recipe]) -> list[RecipeReadHeader]:
+        return await _load_recipe_reads(db, [r.id for r in partition], user)
+
+    return NDJSONResponse(
+        stream_ndjson(
+            db,
+            stmt,
+            lambda recipe: recipe.model_dump_json(),
+            limit=limit,
+            trailer=trailer,
+            load=_load,
+        )
+    )
+
+
+# columns of RecipeReadHeader, for reads that skip the ORM entity
+_HEADER_COLUMNS = (
+    Recipe.id,
+    Recipe.owner_id,
+    Recipe.is_private,
+    Recipe.is_draft,
+    Recipe.language,
+    Recipe.created_at,
+    Recipe.updated_at,
+    Recipe.favorite_count,
+)
+
+
+def _recipe_state_columns(user: User) -> tuple:
+    """
+    Columns that change whenever the `RecipeRead` of a recipe, as seen by
+    `user`, changes. Cheap to select and the basis of recipe ETags.
+    """
+    related = aliased(Recipe)
+    is_related = or_(
+        related.original_recipe_id == Recipe.id, related.id == Recipe.original_recipe_id
+    )
+    return (
+        Recipe.id,
+        Recipe.latest_revision_id,
+        Recipe.updated_at,
+        Recipe.favorite_count,
+        _is_favorited(user).label("is_favorited"),
+        select(func.count()).where(is_related).scalar_subquery().label("related_count"),
+        select(func.max(related.updated_at))
+        .where(is_related)
+        .scalar_subquery()
+        .label("related_updated_at"),
+    )
+
+
+def _page_etag(
+    request: Request,
+    params: PaginationParams,
+    states: list[tuple],
+    has_next: bool,
+    total: int | None,
+) -> str | None:
+    """
+    ETag of a `get_recipes` page, from the state columns of its rows (in
+    `_recipe_state_columns` order), whether a next page follows and the total.
+
+    None if it can't be decided from the page alone (empty pages, totals in
+    cursor mode). Estimated and cached totals may differ from request to
+    request without anything having changed, so they are left out.
+    """
+    if not states or (params.use_cursor and params.include_total):
+        return None
+    if params.count not in ("window", "exact"):
+        total = None
+    # the pagination links depend on the URL as well
+    return make_etag(str(request.url), *states, has_next, total)
+
+
+def _state_values(row, state_columns: tuple) -> tuple:
+    return tuple(row._mapping[column] for column in state_columns)
+
+
+async def _current_page_etag(
+    db: AsyncSession,
+    request: Request,
+    query: Select,
+    params: PaginationParams,
+    keyset,
+    keyset_descending: bool,
+    state_columns: tuple,
+) -> str | None:
+    """
+    `_page_etag` of a `get_recipes` page before loading it, to answer
+    conditional requests: one query for the state columns of the page rows,
+    one extra row and the window total.
+    """
+    if params.use_cursor and params.include_total:
+        return None
+
+    columns = list(state_columns)
+    if params.include_total:
+        columns.append(func.count().over())
+    # one extra row, as it decides whether there is a next page
+    stmt = paginated_select(query, params, keyset, keyset_descending).limit(
+        params.limit + 1
+    )
+    result = await db.execute(
+        stmt.with_only_columns(*columns, maintain_column_froms=True)
+    )
+    rows = result.all()
+    return _page_etag(
+        request,
+        params,
+        [_state_values(row, state_columns) for row in rows[: params.limit]],
+        len(rows) > params.limit,
+        rows[0][-1] if rows and params.include_total else None,
+    )
+
+
+async def _load_revision_snapshot(db: AsyncSession, revision_id: int) -> bytes:
+    """
+    Stored `RecipeRevisionRead` JSON of a revision. Revisions written before
+    snapshots existed are serialized now and keep it from then on.
+    """
+    result = await db.execute(
+        select(RecipeRevision.serialized).where(RecipeRevision.id == revision_id)
+    )
+    serialized = result.scalar_one()
+    if serialized is not None:
+        return serialized
+
+    await reference_data.add_to_session(db)
     result = await db.execute(
         select(RecipeRevision)
-        .where(RecipeRevision.id == revision.id)
+        .where(RecipeRevision.id == revision_id)
         .options(
+            undefer(RecipeRevision.serialized),
             selectinload(RecipeRevision.categories),
             selectinload(RecipeRevision.ingredient_groups)
             .selectinload(IngredientGroup.ingredients)
-            .selectinload(Ingredient.unit),
+            .immediateload(Ingredient.unit),
             selectinload(RecipeRevision.instruction_groups),
-            selectinload(RecipeRevision.recipe),
         )
     )
     revision = result.scalar_one()
+    revision.serialized = _serialize_revision(revision)
+    return revision.serialized
 
-    return recipe
+
+async def _build_recipe_read(
+    db: AsyncSession, row, with_related: bool = True
+) -> RecipeRead:
+    """
+    `RecipeRead` (without favorite flag) from a `get_recipe` header row,
+    using the stored revision snapshot. Without `with_related`, the original
+    recipe and translations are left empty.
+    """
+    revision_json = row.serialized
+    if revision_json is None:
+        revision_json = await _load_revision_snapshot(db, row.latest_revision_id)
+
+    original, translations = None, []
+    if with_related and row.related_count:
+        related = await db.execute(
+            select(*_HEADER_COLUMNS)
+            .where(
+                or_(
+                    Recipe.id == row.original_recipe_id,
+                    Recipe.original_recipe_id == row.id,
+                )
+            )
+            .order_by(Recipe.created_at.desc())
+        )
+        for r in related.all():
+            header = RecipeReadHeader.model_validate(r._asdict())
+            if r.id == row.original_recipe_id:
+                original = header
+            else:
+                translations.append(header)
+
+    return RecipeRead.model_validate(
+        {
+            **row._asdict(),
+            "is_favorited": False,
+            "latest_revision": RecipeRevisionRead.model_validate_json(revision_json),
+            "original_recipe": original,
+            "translations": translations,
+        }
+    )
+
+
+async def _load_recipe_reads(
+    db: AsyncSession,
+    ids: list[int],
+    user: User,
+    include: frozenset[str] | None = None,
+    states: list | None = None,
+) -> list[RecipeReadHeader]:
+    """
+    `RecipeRead`s of `ids` for `user`, in that order, skipping recipes the
+    user can't see.
+
+    One query for the current state of the recipes, unless the caller
+    selected the `_recipe_state_columns` rows already (`states`, of recipes
+    the user can see); only those missing from (or outdated in) the recipe
+    cache are loaded and serialized. With `include`, the items are the
+    sparse slice of `RecipeRead` and misses only load those relationships
+    (and aren't cached).
+    """
+    model = RecipeRead if include is None else sparse_recipe_read(include)
+    if states is None:
+        result = await db.execute(
+            select(*_recipe_state_columns(user)).where(
+                Recipe.id.in_(ids),
+                or_(Recipe.owner_id == user.id, Recipe.is_private.is_(False)),
+            )
+        )
+        states = result.all()
+    states = {row.id: row for row in states}
+
+    recipes: dict[int, RecipeReadHeader] = {}
+    for recipe_id, state in states.items():
+        cached = get_cached_recipe(recipe_id, recipe_version(state))
+        if cached is not None:
+            recipes[recipe_id] = cached if include is None else model.model_validate(cached)
+
+    missing = [recipe_id for recipe_id in states if recipe_id not in recipes]
+    if missing:
+        await reference_data.add_to_session(db)
+        result = await db.execute(
+            select(Recipe)
+            .where(Recipe.id.in_(missing))
+            .options(*_recipe_read_options(include or RECIPE_INCLUDES))
+        )
+        for recipe in result.scalars().all():
+            recipes[recipe.id] = model.model_validate(recipe)
+            if include is None:
+                cache_recipe(
+                    recipe.id, recipe_version(states[recipe.id]), recipes[recipe.id]
+                )
+
+    return [
+        recipes[recipe_id].model_copy(
+            update={"is_favorited": states[recipe_id].is_favorited}
+        )
+        for recipe_id in ids
+        if recipe_id in recipes
+    ]
 
 
-def _get_recipe(for_write: bool = False, history: bool = False):
+def _list_view_select(user: User) -> Select:
+    """
+    Columns of `RecipeListView`: recipe and revision headers plus category
+    names and translation languages, without touching ingredient or
+    instruction tables.
+    """
+    translation = aliased(Recipe)
+    categories = (
+        select(
+            func.array_agg(
+                aggregate_order_by(RecipeCategories.name, RecipeCategories.id)
+            )
+        )
+        .join(
+            recipe_categories_association,
+            recipe_categories_association.c.category_id == RecipeCategories.id,
+        )
+        .where(recipe_categories_association.c.recipe_id == RecipeRevision.id)
+        .scalar_subquery()
+    )
+    translations = (
+        select(
+            func.array_agg(
+                aggregate_order_by(translation.language, translation.created_at.desc())
+            )
+        )
+        .where(translation.original_recipe_id == Recipe.id)
+        .scalar_subquery()
+    )
+    return select(
+        *_HEADER_COLUMNS,
+        RecipeRevision.title,
+        RecipeRevision.subtitle,
+        RecipeRevision.owner_comment,
+        RecipeRevision.prep_time,
+        RecipeRevision.cook_time,
+        RecipeRevision.servings,
+        RecipeRevision.difficulty,
+        categories.label("categories"),
+        translations.label("translations"),
+        _is_favorited(user).label("is_favorited"),
+    ).join(RecipeRevision, RecipeRevision.id == Recipe.latest_revision_id)
+
+
+async def _load_list_views(
+    db: AsyncSession, ids: list[int], user: User
+) -> list[RecipeListView]:
+    """`RecipeListView`s of `ids` for `user` in one query, in that order"""
+    result = await db.execute(_list_view_select(user).where(Recipe.id.in_(ids)))
+    views = {}
+    for row in result.all():
+        data = row._asdict()
+        # array_agg over no rows is NULL
+        data["categories"] = data["categories"] or []
+        data["translations"] = data["translations"] or []
+        views[row.id] = RecipeListView.model_validate(data)
+    return [views[recipe_id] for recipe_id in ids if recipe_id in views]
+
+
+def _get_recipe(for_write: bool = False):
     async def _get_recipe(
         recipe_id: int,
         db: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_user),
     ) -> Recipe:
-        query = select(Recipe).filter(Recipe.id == recipe_id)
+        query = _with_favorited(
+            select(Recipe).filter(Recipe.id == recipe_id), current_user
+        )
 
         if for_write:
             query = query.where(Recipe.owner_id == current_user.id)
@@ -264,28 +702,18 @@ def _get_recipe(for_write: bool = False, history: bool = False):
                 or_(Recipe.owner_id == current_user.id, Recipe.is_private.is_(False))
             )
 
-        if history:
-            query = query.options(
-                joinedload(Recipe.revisions).options(
-                    selectinload(RecipeRevision.ingredient_groups)
-                    .selectinload(IngredientGroup.ingredients)
-                    .joinedload(Ingredient.unit),
-                    selectinload(RecipeRevision.instruction_groups),
-                ),
-                selectinload(Recipe.translations),
-                joinedload(Recipe.original_recipe),
-            )
-        else:
-            query = query.options(
-                joinedload(Recipe.latest_revision).options(
-                    selectinload(RecipeRevision.ingredient_groups)
-                    .selectinload(IngredientGroup.ingredients)
-                    .joinedload(Ingredient.unit),
-                    selectinload(RecipeRevision.instruction_groups),
-                ),
-                selectinload(Recipe.translations),
-                joinedload(Recipe.original_recipe),
-            )
+        # units come from the identity map, see reference.py
+        await reference_data.add_to_session(db)
+        query = query.options(
+            joinedload(Recipe.latest_revision).options(
+                selectinload(RecipeRevision.ingredient_groups)
+                .selectinload(IngredientGroup.ingredients)
+                .immediateload(Ingredient.unit),
+                selectinload(RecipeRevision.instruction_groups),
+            ),
+            selectinload(Recipe.translations),
+            joinedload(Recipe.original_recipe),
+        )
 
         result = await db.execute(query)
         recipe: Recipe | None = result.unique().scalar_one_or_none()
@@ -306,7 +734,9 @@ async def get_units(
     _: User = Depends(get_current_user),
 ):
     query = select(Unit)
-    results = await paginate(db, query, pagination_params, request)
+    results = await paginate(
+        db, query, pagination_params, request, keyset=(Unit.id,)
+    )
     return results
 
 
@@ -327,6 +757,7 @@ async def get_foods(
         initial_query,
         pagination_params,
         request,
+        keyset=(FoodCandidate.id,),
     )
     return results
 
@@ -348,7 +779,7 @@ async def get_foods_search(
 
     # TODO: add highlights if desired
     attributes_to_highlight = None
-    results = search_service.search_foods(
+    results = await search_service.search_foods(
         query=q,
         languages=languages,
         limit=pagination_params.page_size,
@@ -373,6 +804,7 @@ async def get_foods_search(
         total_pages=results["estimatedTotalHits"] // pagination_params.page_size,
         next=None,
         previous=None,
+        total_estimated=True,
     )
     return PaginatedResponse(pagination=pagination_meta, results=ret)
 
@@ -394,6 +826,7 @@ async def get_categories(
         initial_query,
         pagination_params,
         request,
+        keyset=(RecipeCategories.id,),
     )
     return results
 
@@ -403,17 +836,58 @@ async def get_categories(
     status_code=status.HTTP_200_OK,
 )
 async def get_multilingual(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    lang: str | None = Query(
+        None, description="Only the strings of this language, e.g. `de`"
+    ),
 ):
-    with open(APP_DIR.parent.joinpath("data", "multilingual.json")) as f:
-        data = json.load(f)
-        return data
+    """
+    Multilingual strings, of all languages or of `lang`. Served from memory,
+    see multilingual.py, compressed in advance.
+    """
+    payload = multilingual_payloads().get(lang)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No strings for language {lang}",
+        )
+    if etag_matches(request, payload.etag):
+        return not_modified(payload.etag, MULTILINGUAL_CACHE_CONTROL)
+    return _payload_response(request, payload, MULTILINGUAL_CACHE_CONTROL)
+
+
+def _payload_response(request: Request, payload: Payload, cache_control: str):
+    """`payload`, in the encoding the client prefers, compressed in advance"""
+    body, encoding = payload.encode(negotiate(request.headers.get("accept-encoding")))
+    return encoded_response(
+        body, encoding, headers=etag_headers(payload.etag, cache_control)
+    )
+
+
+@reference_router.get("", status_code=status.HTTP_200_OK)
+async def get_reference_data(
+    request: Request,
+    version: str | None = Query(
+        None, description="`version` of the bundle the client has cached"
+    ),
+):
+    """
+    Everything a client needs to bootstrap: units, categories, multilingual
+    strings and the allowed languages, with a content `version`. Answers
+    `304 Not Modified` if `version` (or `If-None-Match`) is the current one.
+
+    Served from memory without a database session, the registry is loaded
+    and refreshed in the background, see reference.py.
+    """
+    payload = reference_data.bundle()
+    if f'"{version}"' == payload.etag or etag_matches(request, payload.etag):
+        return not_modified(payload.etag, REFERENCE_DATA_CACHE_CONTROL)
+    return _payload_response(request, payload, REFERENCE_DATA_CACHE_CONTROL)
 
 
 @router.get(
     "",
-    response_model=PaginatedResponse[RecipeRead],
+    response_model=PaginatedResponse[RecipeRead] | PaginatedResponse[RecipeListView],
     status_code=status.HTTP_200_OK,
 )
 async def get_recipes(
@@ -421,8 +895,24 @@ async def get_recipes(
     pagination_params: PaginationParams = Depends(),
     date_filter_params: DateFilterParams = Depends(date_filter_dependency(Recipe)),
     sorting_filter_params: SortParams = Depends(
-        sort_dependency(Recipe, allowed_columns=["id", "updated_at", "created_at"])
+        sort_dependency(
+            Recipe,
+            allowed_columns=["id", "updated_at", "created_at", "favorite_count"],
+        )
+    ),
+    format: Literal["json", "ndjson"] = Query(
+        "json",
+        description=(
+            "ndjson streams the page as one RecipeRead per line, without pagination "
+            'metadata. In cursor mode a last line {"next_cursor": ...} follows, null '
+            "on the last page"
+        ),
+    ),
+    view: Literal["full", "list"] = Query(
+        "full",
+        description="list returns RecipeListView items (headers only) instead of RecipeRead",
     ),
+    include: frozenset[str] | None = Depends(_parse_include),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -431,51 +921,81 @@ async def get_recipes(
     )
     initial_query = apply_date_filter(initial_query, Recipe, date_filter_params)
     initial_query = apply_sorting(initial_query, Recipe, sorting_filter_params)
+    # in cursor mode, sort_by=updated_at&order=desc walks ix_recipes_updated_at_desc
+    # (and sort_by=favorite_count&order=desc ix_recipes_favorite_count_desc)
+    keyset, keyset_descending = sort_keyset(Recipe, sorting_filter_params)
 
-    # fav_subquery = (
-    #     select(user_favorite_recipes.c.recipe_id)
-    #     .where(user_favorite_recipes.c.user_id == current_user.id)
-    #     .subquery()
-    # )
+    if format == "ndjson":
+        page_query = paginated_select(
+            initial_query, pagination_params, keyset, keyset_descending
+        )
+        if not pagination_params.use_cursor:
+            return await _stream_recipes(db, page_query, current_user)
+
+        def _next_cursor(last: Recipe | None, has_more: bool) -> bytes:
+            cursor = None
+            if has_more:
+                cursor = cursor_after(last, initial_query, keyset, keyset_descending)
+            return dump_json({"next_cursor": cursor})
+
+        # one extra row tells whether another page follows
+        return await _stream_recipes(
+            db,
+            page_query.limit(pagination_params.limit + 1),
+            current_user,
+            limit=pagination_params.limit,
+            trailer=_next_cursor,
+        )
 
-    def _enrich(ids: list[int]) -> Select:
-        stmt = select(Recipe).where(Recipe.id.in_(ids))
-        stmt = stmt.options(
-            selectinload(Recipe.latest_revision).selectinload(
-                RecipeRevision.categories
-            ),
-            selectinload(Recipe.latest_revision)
-            .selectinload(RecipeRevision.ingredient_groups)
-            .selectinload(IngredientGroup.ingredients)
-            .selectinload(Ingredient.unit),
-            selectinload(Recipe.latest_revision).selectinload(
-                RecipeRevision.instruction_groups
-            ),
-            selectinload(Recipe.translations),
-            selectinload(Recipe.original_recipe),
+    state_columns = _recipe_state_columns(current_user)
+    if request.headers.get("if-none-match"):
+        # decide conditional requests before anything is loaded
+        etag = await _current_page_etag(
+            db,
+            request,
+            initial_query,
+            pagination_params,
+            keyset,
+            keyset_descending,
+            state_columns,
         )
+        if etag is not None and etag_matches(request, etag):
+            return not_modified(etag)
 
-        return stmt
+    # the page query selects the state of its recipes, for the ETag and
+    # the recipe cache
+    states: list[tuple] = []
 
-    results = await paginate(db, initial_query, pagination_params, request, _enrich)
+    async def _enrich(rows: list) -> list[RecipeReadHeader]:
+        states.extend(_state_values(row, state_columns) for row in rows)
+        ids = [row.id for row in rows]
+        if view == "list":
+            return await _load_list_views(db, ids, current_user)
+        return await _load_recipe_reads(db, ids, current_user, include, rows)
 
-    # add favorited property in post to the found recipes
-    # here we could do it via the database, but its difficult
-    recipe_ids = [r.id for r in results.results]
-    fav_rows = await db.execute(
-        select(user_favorite_recipes.c.recipe_id).where(
-            (user_favorite_recipes.c.user_id == current_user.id)
-            & (user_favorite_recipes.c.recipe_id.in_(recipe_ids))
-        )
+    results = await paginate(
+        db,
+        initial_query,
+        pagination_params,
+        request,
+        keyset=keyset,
+        keyset_descending=keyset_descending,
+        enrich=_enrich,
+        columns=state_columns,
+    )
+    etag = _page_etag(
+        request,
+        pagination_params,
+        states,
+        results.pagination.next is not None,
+        results.pagination.total,
     )
-    fav_ids = {r[0] for r in fav_rows.all()}
-    items = [
-        RecipeRead.model_validate(r).model_copy(update={"is_favorite": r.id in fav_ids})
-        for r in results.results
-    ]
-    results.results = items
 
-    return results
+    # items are validated already (and sparse ones built per request), so
+    # skip response_model validation, see app/core/serialization.py
+    return json_response(
+        results, headers=etag_headers(etag) if etag is not None else None
+    )
 
 
 @router.get(
@@ -508,7 +1028,7 @@ async def search_recipes(
         ["title", "subtitle", "ingredients"] if highlight else None
     )
 
-    results = search_service.search_recipes(
+    results = await search_service.search_recipes(
         query=q,
         languages=languages,
         categories=categories,
@@ -519,15 +1039,20 @@ async def search_recipes(
         attributes_to_highlight=attributes_to_highlight,
     )
 
-    # use the recipe_ids to lookup which ones are favorited
+    # favorites change too often to keep them in the index: look up which
+    # ones are favorited, and how often, by recipe_id
     recipe_ids = [r["id"] for r in results["hits"]]
     fav_rows = await db.execute(
-        select(user_favorite_recipes.c.recipe_id).where(
-            (user_favorite_recipes.c.user_id == current_user.id)
-            & (user_favorite_recipes.c.recipe_id.in_(recipe_ids))
+        select(Recipe.id, Recipe.favorite_count, _is_favorited(current_user)).where(
+            Recipe.id.in_(recipe_ids)
         )
     )
-    fav_ids = {r[0] for r in fav_rows.all()}
+    favorite_counts = {}
+    fav_ids = set()
+    for recipe_id, favorite_count, is_favorited in fav_rows.all():
+        favorite_counts[recipe_id] = favorite_count
+        if is_favorited:
+            fav_ids.add(recipe_id)
 
     # generate the final output
     recipes = []
@@ -553,6 +1078,7 @@ async def search_recipes(
                 difficulty=r["difficulty"],
                 categories=r["categories"],
                 is_favorited=r["id"] in fav_ids,
+                favorite_count=favorite_counts.get(r["id"], 0),
             )
         )
     # TODO: Bit too hacked, wrap it correctly
@@ -563,8 +1089,276 @@ async def search_recipes(
         total_pages=results["estimatedTotalHits"] // page_size,
         next=None,
         previous=None,
+        total_estimated=True,
+    )
+    return json_response(PaginatedResponse(pagination=pagination_meta, results=recipes))
+
+
+@router.get(
+    "/export",
+    response_class=NDJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_recipes(
+    date_filter_params: DateFilterParams = Depends(date_filter_dependency(Recipe)),
+    user_only: bool = Query(False, description="Export only recipes of current user"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export all visible recipes as NDJSON, one `RecipeRead` per line.
+
+    Rows are read through a server-side cursor and serialized one at a time,
+    so the size of the library doesn't matter for memory.
+    """
+    if user_only:
+        query = select(Recipe).where(Recipe.owner_id == current_user.id)
+    else:
+        query = select(Recipe).where(
+            or_(Recipe.owner_id == current_user.id, Recipe.is_private.is_(False))
+        )
+    query = apply_date_filter(query, Recipe, date_filter_params)
+    query = query.order_by(Recipe.id)
+
+    return await _stream_recipes(db, query, current_user)
+
+
+def _encode_watermark(change: RecipeChange) -> str:
+    return f"{change.txid}.{change.seq}"
+
+
+def _decode_watermark(since: str) -> tuple[int, int]:
+    try:
+        txid, seq = since.split(".")
+        return int(txid), int(seq)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid change feed watermark",
+        )
+
+
+def _change_horizon():
+    """Transactions below this id are finished, rows of newer ones may still appear"""
+    return literal_column(
+        "(pg_snapshot_xmin(pg_current_snapshot())::text)::bigint", BigInteger
     )
-    return PaginatedResponse(pagination=pagination_meta, results=recipes)
+
+
+@router.get(
+    "/changes",
+    response_model=RecipeChangeFeed,
+    status_code=status.HTTP_200_OK,
+)
+async def get_recipe_changes(
+    since: str | None = Query(
+        None,
+        description="Watermark (next_since) of the previous call, omit to start from the beginning",
+    ),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of change rows"),
+    include_recipes: bool = Query(True, description="Include the recipe of upserts"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delta-sync feed of recipes changed after the `since` watermark.
+
+    Returns upserts for recipes the user can see and tombstones (op "delete")
+    for recipes that were deleted or are no longer visible to the user. Within
+    one response only the latest change per recipe is reported.
+
+    Changes are ordered by (transaction id, sequence) and only rows of
+    transactions older than the oldest still running one are handed out, so a
+    slow transaction committing late can never be skipped by a watermark.
+    """
+    query = select(RecipeChange).where(
+        RecipeChange.txid < _change_horizon(),
+        or_(
+            RecipeChange.owner_id == current_user.id,
+            RecipeChange.is_private.is_(False),
+            RecipeChange.was_private.is_(False),
+        ),
+    )
+    if since:
+        query = query.where(
+            tuple_(RecipeChange.txid, RecipeChange.seq) > tuple_(*_decode_watermark(since))
+        )
+    query = query.order_by(RecipeChange.txid, RecipeChange.seq).limit(limit + 1)
+
+    rows = (await db.execute(query)).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # the last change per recipe wins, keep them in feed order
+    latest: dict[int, RecipeChange] = {}
+    for row in rows:
+        latest.pop(row.recipe_id, None)
+        latest[row.recipe_id] = row
+
+    def _is_upsert(change: RecipeChange) -> bool:
+        return change.op == RecipeChangeOp.UPSERT and (
+            change.owner_id == current_user.id or not change.is_private
+        )
+
+    recipes: dict[int, RecipeRead] = {}
+    upsert_ids = [c.recipe_id for c in latest.values() if _is_upsert(c)]
+    if include_recipes and upsert_ids:
+        # through the recipe cache, like the list endpoints
+        for recipe in await _load_recipe_reads(db, upsert_ids, current_user):
+            recipes[recipe.id] = recipe
+
+    changes = []
+    for change in latest.values():
+        upsert = _is_upsert(change)
+        if upsert and include_recipes and change.recipe_id not in recipes:
+            # deleted or hidden by a later change beyond this batch
+            upsert = False
+        changes.append(
+            RecipeChangeRead(
+                recipe_id=change.recipe_id,
+                op="upsert" if upsert else "delete",
+                changed_at=change.changed_at,
+                recipe=recipes.get(change.recipe_id) if upsert else None,
+            )
+        )
+
+    return json_response(
+        RecipeChangeFeed(
+            changes=changes,
+            next_since=_encode_watermark(rows[-1]) if rows else since,
+            has_more=has_more,
+        )
+    )
+
+
+@router.get(
+    "/favorites",
+    response_model=PaginatedResponse[RecipeRead],
+    status_code=status.HTTP_200_OK,
+)
+async def get_favorite_recipes(
+    request: Request,
+    pagination_params: PaginationParams = Depends(),
+    include: frozenset[str] | None = Depends(_parse_include),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    The user's favorite recipes, most recently updated first.
+
+    Always cursor paginated: pages seek on (updated_at, id) and join the
+    favorites table on its primary key, so the cost of a page doesn't grow
+    with the number of favorites. Favorites that have since become private
+    to someone else are left out.
+    """
+    query = (
+        select(Recipe)
+        .join(
+            user_favorite_recipes,
+            (user_favorite_recipes.c.recipe_id == Recipe.id)
+            & (user_favorite_recipes.c.user_id == current_user.id),
+        )
+        .where(or_(Recipe.owner_id == current_user.id, Recipe.is_private.is_(False)))
+    )
+
+    async def _enrich(ids: list[int]) -> list[RecipeReadHeader]:
+        return await _load_recipe_reads(db, ids, current_user, include)
+
+    results = await paginate(
+        db,
+        query,
+        pagination_params.model_copy(update={"mode": "cursor"}),
+        request,
+        keyset=(Recipe.updated_at, Recipe.id),
+        keyset_descending=True,
+        enrich=_enrich,
+    )
+    return json_response(results)
+
+
+@router.post(
+    "/batch",
+    response_model=list[RecipeRead],
+    status_code=status.HTTP_200_OK,
+)
+async def get_recipes_batch(
+    batch: RecipeBatchRequest,
+    include: frozenset[str] | None = Depends(_parse_include),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get several recipes at once, in the requested order.
+
+    Recipes that don't exist or aren't visible to the user are left out.
+    Cost is one state query plus one set of eager loads for the recipes not
+    in the recipe cache, however many ids are requested.
+    """
+    ids = list(dict.fromkeys(batch.ids))
+    return json_response(await _load_recipe_reads(db, ids, current_user, include))
+
+
+@router.post(
+    "/bulk",
+    response_model=RecipeBulkResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_create_recipes(
+    bulk: RecipeBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create many recipes at once, e.g. for imports.
+
+    Every recipe is validated on its own: invalid ones are reported with their
+    errors in `results`, the others are created. The batch is written with a
+    fixed number of statements and indexed with a single search call, see
+    app/recipes/bulk.py.
+    """
+    results = [RecipeBulkItemResult(index=i) for i in range(len(bulk.recipes))]
+    valid: list[tuple[int, RecipeCreateUpdate]] = []
+    for i, item in enumerate(bulk.recipes):
+        try:
+            valid.append((i, RecipeCreateUpdate.model_validate(item)))
+        except ValidationError as e:
+            results[i].errors = [
+                RecipeBulkError(loc=list(error["loc"]), msg=error["msg"])
+                for error in e.errors()
+            ]
+
+    if valid:
+        created = await create_recipes_bulk(
+            db, [recipe for _, recipe in valid], owner_id=current_user.id
+        )
+        for (i, _), outcome in zip(valid, created):
+            if isinstance(outcome, int):
+                results[i].id = outcome
+            else:
+                results[i].errors = [RecipeBulkError(loc=["content"], msg=outcome)]
+
+    ids = [result.id for result in results if result.id is not None]
+    if ids:
+        await reference_data.add_to_session(db)
+        recipes = await db.scalars(
+            select(Recipe).where(Recipe.id.in_(ids)).options(*_recipe_read_options())
+        )
+        search_service = get_meilisearch_service()
+        await search_service.index_recipes_bulk(list(recipes))
+
+    return json_response(
+        RecipeBulkResponse(
+            created=len(ids), failed=len(results) - len(ids), results=results
+        )
+    )
+
+
+@router.get("/cache/stats", status_code=status.HTTP_200_OK)
+async def get_recipe_cache_stats(
+    current_user: User = Depends(get_current_superuser),
+) -> dict:
+    """Counters of this worker's recipe cache, to size RECIPE_CACHE_SIZE"""
+    return recipe_cache.stats()
 
 
 @router.post("", response_model=RecipeRead, status_code=status.HTTP_201_CREATED)
@@ -580,7 +1374,9 @@ async def create_recipe(
     search_service = get_meilisearch_service()
     await search_service.index_recipe(recipe, db)
 
-    return recipe
+    return json_response(
+        RecipeRead.model_validate(recipe), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.put(
@@ -592,50 +1388,95 @@ async def update_recipe(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    update = await _update_recipe(recipe, recipe_data, db)
-    search_service = get_meilisearch_service()
-    await search_service.index_recipe(recipe, db)
+    # saving unchanged content (e.g. autosave) writes and reindexes nothing
+    if await _update_recipe(recipe, recipe_data, db):
+        search_service = get_meilisearch_service()
+        await search_service.index_recipe(recipe, db)
 
-    recipe_id = update.id
-    fav_rows = await db.execute(
-        select(user_favorite_recipes.c.recipe_id).where(
-            (user_favorite_recipes.c.user_id == current_user.id)
-            & (user_favorite_recipes.c.recipe_id == recipe_id)
-        )
+    return json_response(
+        RecipeRead.model_validate(recipe), status_code=status.HTTP_201_CREATED
     )
-    found = fav_rows.scalar_one_or_none() is not None
-
-    ret = RecipeRead.model_validate(recipe)
-    ret.is_favorited = found
-    return ret
 
 
 @router.get("/{recipe_id}", response_model=RecipeRead, status_code=status.HTTP_200_OK)
 async def get_recipe(
-    recipe: Recipe = Depends(_get_recipe(for_write=False)),
+    recipe_id: int,
+    request: Request,
+    include: frozenset[str] | None = Depends(_parse_include),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    recipe_id = recipe.id
-    fav_rows = await db.execute(
-        select(user_favorite_recipes.c.recipe_id).where(
-            (user_favorite_recipes.c.user_id == current_user.id)
-            & (user_favorite_recipes.c.recipe_id == recipe_id)
+    """
+    Get a recipe with its latest revision.
+
+    The revision is served from its stored JSON snapshot, so this is a single
+    lookup unless the recipe has translations (one more query for those).
+    Supports conditional requests via ETag / If-None-Match, and sparse
+    reads via `include`.
+    """
+    state_columns = _recipe_state_columns(current_user)
+    # on conditional requests and for cached recipes the snapshot is likely
+    # not needed, so don't ship it
+    skip_snapshot = "if-none-match" in request.headers or recipe_id in recipe_cache
+    result = await db.execute(
+        select(
+            *state_columns,
+            Recipe.owner_id,
+            Recipe.is_private,
+            Recipe.is_draft,
+            Recipe.language,
+            Recipe.created_at,
+            Recipe.original_recipe_id,
+            null().label("serialized") if skip_snapshot else RecipeRevision.serialized,
+        )
+        .join(RecipeRevision, RecipeRevision.id == Recipe.latest_revision_id)
+        .where(
+            Recipe.id == recipe_id,
+            or_(Recipe.owner_id == current_user.id, Recipe.is_private.is_(False)),
         )
     )
-    found = fav_rows.scalar_one_or_none() is not None
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    etag = make_etag(*row[: len(state_columns)], include and sorted(include))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    version = recipe_version(row)
+    entry = get_cached_entry(recipe_id, version)
+    if entry is None:
+        with_related = include is None or "translations" in include
+        recipe = await _build_recipe_read(db, row, with_related)
+        if with_related:
+            entry = cache_recipe(recipe_id, version, recipe)
+    else:
+        recipe = entry.recipe
+    if include is None:
+        # serialized and compressed once per cache entry
+        body, encoding = entry.body(
+            row.is_favorited, negotiate(request.headers.get("accept-encoding"))
+        )
+        return encoded_response(body, encoding, headers=etag_headers(etag))
+    recipe = sparse_recipe_read(include).model_validate(recipe)
 
-    # result = await db.execute(
-    #     select(Recipe)
-    #     .where(Recipe.id == recipe_id)
-    # )
-    # translations = result.scalar_one()
+    ret = recipe.model_copy(update={"is_favorited": row.is_favorited})
+    return json_response(ret, headers=etag_headers(etag))
 
-    ret = RecipeRead.model_validate(recipe)
-    ret.is_favorited = found
 
-    print(ret)
-    return ret
+async def _add_favorite_count(db: AsyncSession, recipe: Recipe, delta: int):
+    """Adjust `Recipe.favorite_count` in place, without touching `updated_at`"""
+    result = await db.execute(
+        update(Recipe)
+        .where(Recipe.id == recipe.id)
+        .values(
+            favorite_count=Recipe.favorite_count + delta,
+            updated_at=Recipe.updated_at,
+        )
+        .returning(Recipe.favorite_count)
+        .execution_options(synchronize_session=False)
+    )
+    set_committed_value(recipe, "favorite_count", result.scalar_one())
 
 
 @router.delete(
@@ -646,11 +1487,19 @@ async def remove_recipe_favorite(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    if recipe in current_user.favorite_recipes:
-        current_user.favorite_recipes.remove(recipe)
+    result = await db.execute(
+        delete(user_favorite_recipes)
+        .where(
+            user_favorite_recipes.c.user_id == current_user.id,
+            user_favorite_recipes.c.recipe_id == recipe.id,
+        )
+        .returning(user_favorite_recipes.c.recipe_id)
+    )
+    if result.first() is not None:
+        await _add_favorite_count(db, recipe, -1)
     ret = RecipeRead.model_validate(recipe)
-    ret.is_favorited = False  # we just assume it was done correctly...
-    return ret
+    ret.is_favorited = False
+    return json_response(ret)
 
 
 @router.post(
@@ -663,10 +1512,17 @@ async def add_recipe_favorite(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    current_user.favorite_recipes.append(recipe)
+    result = await db.execute(
+        pg_insert(user_favorite_recipes)
+        .values(user_id=current_user.id, recipe_id=recipe.id)
+        .on_conflict_do_nothing()
+        .returning(user_favorite_recipes.c.recipe_id)
+    )
+    if result.first() is not None:
+        await _add_favorite_count(db, recipe, 1)
     ret = RecipeRead.model_validate(recipe)
-    ret.is_favorited = True  # we just assume it was done correctly...
-    return ret
+    ret.is_favorited = True
+    return json_response(ret)
 
 
 @router.delete(
@@ -679,20 +1535,114 @@ async def delete_recipe(
 ):
     search_service = get_meilisearch_service()
     await search_service.delete_recipe(recipe_id=recipe.id)
+    await _record_change(db, recipe, RecipeChangeOp.DELETE, recipe.is_private)
+    group_ids = await linked_group_ids(
+        db, select(RecipeRevision.id).where(RecipeRevision.recipe_id == recipe.id)
+    )
     await db.delete(recipe)
+    await db.flush()
+    await delete_orphan_groups(db, *group_ids)
+    evict_recipe(recipe.id)
+
+
+async def _check_recipe_visible(db: AsyncSession, recipe_id: int, user: User) -> None:
+    """404 unless the recipe exists and `user` may read it"""
+    result = await db.execute(
+        select(Recipe.id).where(
+            Recipe.id == recipe_id,
+            or_(Recipe.owner_id == user.id, Recipe.is_private.is_(False)),
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
 
 
 @router.get(
     "/{recipe_id}/versions",
-    response_model=RecipeReadHistory,
+    response_model=PaginatedResponse[RecipeRevisionHeader],
     status_code=status.HTTP_200_OK,
 )
 async def get_recipe_versions(
-    recipe: Recipe = Depends(_get_recipe(for_write=False, history=True)),
+    recipe_id: int,
+    request: Request,
+    pagination_params: PaginationParams = Depends(),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return recipe
+    """
+    Revision history of a recipe, newest first.
+
+    Only the header of each revision is listed, fetch a body with
+    `GET /recipes/{recipe_id}/versions/{revision_id}`. Always cursor
+    paginated, each page is one range scan of
+    ix_recipe_revisions_recipe_id_created_at_desc.
+    """
+    await _check_recipe_visible(db, recipe_id, current_user)
+    query = (
+        select(RecipeRevision)
+        .where(RecipeRevision.recipe_id == recipe_id)
+        .options(
+            load_only(
+                RecipeRevision.id,
+                RecipeRevision.created_at,
+                RecipeRevision.title,
+                RecipeRevision.change_summary,
+            ),
+            lazyload(RecipeRevision.categories),
+        )
+    )
+    return await paginate(
+        db,
+        query,
+        pagination_params.model_copy(update={"mode": "cursor"}),
+        request,
+        keyset=(RecipeRevision.created_at, RecipeRevision.id),
+        keyset_descending=True,
+    )
+
+
+@router.get(
+    "/{recipe_id}/versions/{revision_id}",
+    response_model=RecipeRevisionRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_recipe_version(
+    recipe_id: int,
+    revision_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    A single revision of a recipe, served from its stored snapshot. Compressed
+    snapshots are cached, revisions are immutable.
+    """
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    cached = get_cached_snapshot(revision_id, encoding) if encoding else None
+    result = await db.execute(
+        select(null() if cached is not None else RecipeRevision.serialized)
+        .select_from(RecipeRevision)
+        .join(Recipe, Recipe.id == RecipeRevision.recipe_id)
+        .where(
+            RecipeRevision.id == revision_id,
+            RecipeRevision.recipe_id == recipe_id,
+            or_(Recipe.owner_id == current_user.id, Recipe.is_private.is_(False)),
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    if cached is not None:
+        return encoded_response(*cached)
+    serialized = row[0]
+    if serialized is None:
+        serialized = await _load_revision_snapshot(db, revision_id)
+    if encoding is None:
+        # revisions are immutable, so the snapshot is the response
+        return Response(content=serialized, media_type="application/json")
+    body = encode_body(serialized, encoding)
+    cache_snapshot(revision_id, encoding, body)
+    return encoded_response(*body)
 
 
 @router.post(
@@ -728,7 +1678,9 @@ async def get_recipe_from_pdf(
     search_service = get_meilisearch_service()
     await search_service.index_recipe(recipe, db)
 
-    return recipe
+    return json_response(
+        RecipeRead.model_validate(recipe), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.post(
@@ -750,7 +1702,9 @@ async def get_recipe_from_url(
     search_service = get_meilisearch_service()
     await search_service.index_recipe(recipe, db)
 
-    return recipe
+    return json_response(
+        RecipeRead.model_validate(recipe), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.post(
@@ -812,13 +1766,18 @@ async def get_recipe_translation(
     # this will lead to some weird behaviour, such as getting
     # translations which are out of sync but thats inevitable
     # TODO: force an overwrite behavior
-    recipe_data = await translate_recipe(recipe, target_language, db)
+    recipe_data = await translate_recipe(recipe, target_language)
+    # expired by flushing the parent, which gains a translation
+    is_favorited = parent.is_favorited
     recipe_translated = await _create_recipe(
         db=db,
         recipe_data=recipe_data,
         owner_id=current_user.id,
         original_recipe=parent,
     )
+    set_committed_value(parent, "is_favorited", is_favorited)
+    # the parent's payload lists its translations, so it changed as well
+    await _record_change(db, parent, RecipeChangeOp.UPSERT, parent.is_private)
     db.refresh(parent)
 
     search_service = get_meilisearch_service()
@@ -1,12 +1,25 @@
 from __future__ import annotations
-from typing import Annotated, List
+import functools
+from typing import Annotated, Any, List, Literal
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    create_model,
+    field_validator,
+    model_validator,
+)
 from pydantic_core.core_schema import ValidationInfo
 
 from app.auth.models import USER_ID_T
-from app.recipes.constants import LANGUAGE_CODE, BaseUnit, UnitSystem
+from app.recipes.constants import (
+    LANGUAGE_CODE,
+    MAX_RECIPE_NAME_LENGTH,
+    BaseUnit,
+    UnitSystem,
+)
 
 
 
@@ -236,7 +249,9 @@ class RecipeCategoryRead(BaseModel):
     name: str
 
 
-class RecipeRevisionBase(BaseModel):
+class RecipeRevisionFields(BaseModel):
+    """Scalar fields of a revision"""
+
     model_config = ConfigDict(from_attributes=True)
 
     title: str | None
@@ -252,8 +267,6 @@ class RecipeRevisionBase(BaseModel):
     source_page: str | None
     source_url: str | None
 
-    instruction_groups: List[InstructionGroupIO]
-
     @field_validator("title")
     @classmethod
     def validate_title(cls, v: str | None) -> str | None:
@@ -348,6 +361,10 @@ class RecipeRevisionBase(BaseModel):
                 raise ValueError("source_url must start with http:// or https://")
         return v
 
+
+class RecipeRevisionBase(RecipeRevisionFields):
+    instruction_groups: List[InstructionGroupIO]
+
     @field_validator("instruction_groups")
     @classmethod
     def validate_instruction_groups_not_empty(cls, v: list) -> list:
@@ -394,6 +411,8 @@ class RecipeBase(BaseModel):
 
 class RecipeCreateUpdate(RecipeBase):
     content: RecipeRevisionCreateUpdate
+    # what changed, stored with the new revision
+    change_summary: str | None = Field(default=None, max_length=MAX_RECIPE_NAME_LENGTH)
 
 
 # class RecipeReadHeader(RecipeBase):
@@ -420,7 +439,7 @@ class RecipeReadHeader(RecipeBase):
 
     # meta data
     is_favorited: bool = False
-
+    favorite_count: int = 0
 
 
 class RecipeReadHeaderWithTranslations(RecipeReadHeader):
@@ -438,9 +457,56 @@ class RecipeRead(RecipeReadHeader):
     translations: list[RecipeReadHeader] = Field(default_factory=list)
 
 
-class RecipeReadHistory(RecipeReadHeader):
+# relationships of `RecipeRead` that can be requested individually
+RECIPE_INCLUDES = frozenset({"categories", "ingredients", "instructions", "translations"})
+
+
+@functools.cache
+def sparse_recipe_read(include: frozenset[str]) -> type[RecipeReadHeader]:
+    """
+    Slice of `RecipeRead` that only has the relationships in `include`.
+
+    Validating an ORM object (or a full `RecipeRead`) with it never touches
+    the other relationships.
+    """
+    revision_fields = {}
+    if "categories" in include:
+        revision_fields["categories"] = (list[RecipeCategoryRead], ...)
+    if "ingredients" in include:
+        revision_fields["ingredient_groups"] = (List[IngredientGroupRead], ...)
+    if "instructions" in include:
+        revision_fields["instruction_groups"] = (List[InstructionGroupIO], ...)
+    revision_model = create_model(
+        "RecipeRevisionSparseRead",
+        __base__=RecipeRevisionFields,
+        created_at=(datetime, ...),
+        **revision_fields,
+    )
+
+    recipe_fields = {}
+    if "translations" in include:
+        recipe_fields["original_recipe"] = (RecipeReadHeader | None, ...)
+        recipe_fields["translations"] = (
+            list[RecipeReadHeader],
+            Field(default_factory=list),
+        )
+    return create_model(
+        "RecipeReadSparse",
+        __base__=RecipeReadHeader,
+        latest_revision=(revision_model, ...),
+        **recipe_fields,
+    )
+
+
+class RecipeRevisionHeader(BaseModel):
+    """Entry of the revision history, the body is read one revision at a time"""
+
     model_config = ConfigDict(from_attributes=True)
-    revisions: list[RecipeRevisionRead]
+
+    id: int
+    created_at: datetime
+    title: str | None
+    change_summary: str | None
 
 
 class RecipeListView(RecipeReadHeader):
@@ -454,3 +520,54 @@ class RecipeListView(RecipeReadHeader):
     categories: list[str]
     # list of other languages, e.g., [de, en, ...]
     translations: list[str]
+
+
+MAX_BATCH_SIZE = 100
+
+
+class RecipeBatchRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+MAX_BULK_SIZE = 500
+
+
+class RecipeBulkRequest(BaseModel):
+    # validated one by one as `RecipeCreateUpdate`, so invalid recipes are
+    # reported per item instead of failing the whole request
+    recipes: list[dict[str, Any]] = Field(min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class RecipeBulkError(BaseModel):
+    loc: list[str | int]
+    msg: str
+
+
+class RecipeBulkItemResult(BaseModel):
+    # position in the request
+    index: int
+    # None if the recipe was rejected, see errors
+    id: int | None = None
+    errors: list[RecipeBulkError] = Field(default_factory=list)
+
+
+class RecipeBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[RecipeBulkItemResult]
+
+
+class RecipeChangeRead(BaseModel):
+    recipe_id: int
+    # "delete" is a tombstone: the recipe was deleted or is no longer visible
+    op: Literal["upsert", "delete"]
+    changed_at: datetime
+    # current state for upserts, None for tombstones
+    recipe: RecipeRead | None = None
+
+
+class RecipeChangeFeed(BaseModel):
+    changes: list[RecipeChangeRead]
+    # opaque watermark, pass as `since` to continue from here
+    next_since: str | None
+    has_more: bool
@@ -1,7 +1,9 @@
 # app/search/service.py
-from typing import List, Optional
-import meilisearch
-from meilisearch.errors import MeilisearchError
+import asyncio
+import time
+from typing import Any, List, Optional
+
+import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
@@ -15,126 +17,194 @@ from app.recipes.models import (
     Ingredient,
 )
 from app.core.config import settings
+from app.recipes.reference import reference_data
+
+
+# attempts wait RETRY_BACKOFF_SECONDS, then twice as long, ...
+RETRY_BACKOFF_SECONDS = 0.1
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# errors before Meilisearch got to work on the request. Timeouts other than
+# connecting are not retried: a slow search would only be slow again
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+RECIPE_INDEX_SETTINGS = {
+    "searchableAttributes": [
+        "title",  # Highest priority
+        "subtitle",
+        "ingredients",  # Medium priority
+        "instructions",  # Lower priority
+        "categories",
+        "owner_comment",
+    ],
+    # for faceted search
+    "filterableAttributes": [
+        "language",
+        "is_private",
+        "is_draft",
+        "owner_id",
+        "difficulty",
+        "categories",
+        "prep_time",
+        "cook_time",
+        "servings",
+    ],
+    "sortableAttributes": [
+        "created_at",
+        "updated_at",
+        "difficulty",
+        "prep_time",
+        "cook_time",
+    ],
+    # title prioritization
+    "rankingRules": [
+        "words",
+        "typo",
+        "proximity",
+        "attribute",  # This uses searchableAttributes order
+        "sort",
+        "exactness",
+    ],
+}
+
+FOOD_INDEX_SETTINGS = {
+    "searchableAttributes": [
+        "name",  # Highest priority
+        "description",
+    ],
+    "filterableAttributes": ["language"],
+    "rankingRules": RECIPE_INDEX_SETTINGS["rankingRules"],
+}
+
+
+class MeilisearchError(Exception):
+    def __init__(self, status_code: int, message: str, code: str | None = None):
+        super().__init__(f"Meilisearch {status_code} {code or ''}: {message}")
+        self.status_code = status_code
+        self.code = code
 
 
 class MeilisearchService:
-    def __init__(self):
-        self.client = meilisearch.Client(
-            settings.MEILISEARCH_URL, settings.MEILISEARCH_MASTER_KEY
+    """
+    Async client for the part of the Meilisearch API we use.
+
+    One pooled `httpx.AsyncClient` per process keeps connections alive, so
+    searches and index updates don't block the event loop nor open a
+    connection each. Calls are retried with backoff on connection errors,
+    429 and 5xx (all our calls are idempotent, documents are upserted by id)
+    and give up after `MEILISEARCH_TIMEOUT_SECONDS` in total, retries
+    included. Indexes are addressed by name, never fetched first.
+
+    The indexes are created and configured on first use, without waiting for
+    those tasks: Meilisearch processes the tasks of an index in order.
+    `transport` is for tests, e.g. `FakeMeilisearch().transport()`.
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        retries: int | None = None,
+        timeout: float | None = None,
+    ):
+        self.client = httpx.AsyncClient(
+            base_url=url or settings.MEILISEARCH_URL,
+            headers={
+                "Authorization": f"Bearer {api_key or settings.MEILISEARCH_MASTER_KEY}"
+            },
+            limits=httpx.Limits(
+                max_connections=settings.MEILISEARCH_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MEILISEARCH_MAX_CONNECTIONS,
+            ),
+            transport=transport,
+        )
+        self.retries = settings.MEILISEARCH_RETRIES if retries is None else retries
+        self.timeout = (
+            settings.MEILISEARCH_TIMEOUT_SECONDS if timeout is None else timeout
         )
         self.recipe_index_name = "recipes"
         self.food_index_name = "foods"
-        self._setup_recipe_index()
-        self._setup_food_index()
-
-    def _setup_food_index(self):
-        try:
-            index = self.client.get_index(self.food_index_name)
-        except MeilisearchError:
-            # Create index if it doesn't exist
-            task = self.client.create_index(self.food_index_name, {"primaryKey": "id"})
-            self.client.wait_for_task(task.task_uid)
-            index = self.client.get_index(self.food_index_name)
-
-        tasks = []
-        # Configure searchable attributes with priority
-        tasks.append(index.update_searchable_attributes(
-            [
-                "name",  # Highest priority
-                "description",
-            ]
-        ))
-
-        # Configure filterable attributes for faceted search
-        tasks.append(index.update_filterable_attributes(
-            [
-                "language",
-            ]
-        ))
-        #
-        # # Configure sortable attributes
-        # tasks.append(index.update_sortable_attributes(
-        #     ["created_at", "updated_at", "difficulty", "prep_time", "cook_time"]
-        # )
-
-        # Configure ranking rules (title prioritization)
-        tasks.append(index.update_ranking_rules(
-            [
-                "words",
-                "typo",
-                "proximity",
-                "attribute",  # This uses searchable_attributes order
-                "sort",
-                "exactness",
-            ]
-        ))
-        
-        for task in tasks:
-            self.client.wait_for_task(task.task_uid)
-
-    def _setup_recipe_index(self):
-        """Initialize Meilisearch index with proper configuration"""
-        try:
-            index = self.client.get_index(self.recipe_index_name)
-        except MeilisearchError:
-            # Create index if it doesn't exist
-            task = self.client.create_index(self.recipe_index_name, {"primaryKey": "id"})
-            self.client.wait_for_task(task.task_uid)
-            index = self.client.get_index(self.recipe_index_name)
-
-        tasks = []
-
-        # Configure searchable attributes with priority
-        tasks.append(index.update_searchable_attributes(
-            [
-                "title",  # Highest priority
-                "subtitle",
-                "ingredients",  # Medium priority
-                "instructions",  # Lower priority
-                "categories",
-                "owner_comment",
-            ]
-        ))
-
-        # Configure filterable attributes for faceted search
-        tasks.append(index.update_filterable_attributes(
-            [
-                "language",
-                "is_private",
-                "is_draft",
-                "owner_id",
-                "difficulty",
-                "categories",
-                "prep_time",
-                "cook_time",
-                "servings",
-            ]
-        ))
-
-        # Configure sortable attributes
-        tasks.append(index.update_sortable_attributes(
-            ["created_at", "updated_at", "difficulty", "prep_time", "cook_time"]
-        ))
-
-        # Configure ranking rules (title prioritization)
-        tasks.append(index.update_ranking_rules(
-            [
-                "words",
-                "typo",
-                "proximity",
-                "attribute",  # This uses searchable_attributes order
-                "sort",
-                "exactness",
-            ]
-        ))
-        
-        for task in tasks:
-            self.client.wait_for_task(task.task_uid)
-            
+        self._is_set_up = False
+        self._setup_lock = asyncio.Lock()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        deadline = time.monotonic() + self.timeout
+
+        def may_retry(attempt: int) -> bool:
+            backoff = RETRY_BACKOFF_SECONDS * 2**attempt
+            return attempt < self.retries and time.monotonic() + backoff < deadline
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.client.request(
+                    method, path, timeout=deadline - time.monotonic(), **kwargs
+                )
+            except RETRY_ERRORS:
+                if not may_retry(attempt):
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or not may_retry(
+                    attempt
+                ):
+                    break
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+
+        if response.is_error:
+            try:
+                error = response.json()
+            except ValueError:
+                error = {}
+            raise MeilisearchError(
+                response.status_code,
+                error.get("message", response.text),
+                error.get("code"),
+            )
+        return response.json() if response.content else None
+
+    async def _call(self, method: str, path: str, **kwargs) -> Any:
+        if not self._is_set_up:
+            await self._setup_indexes()
+        return await self._request(method, path, **kwargs)
+
+    async def _setup_indexes(self):
+        """Create and configure the indexes, once per process"""
+        async with self._setup_lock:
+            if self._is_set_up:
+                return
+            for name, index_settings in (
+                (self.recipe_index_name, RECIPE_INDEX_SETTINGS),
+                (self.food_index_name, FOOD_INDEX_SETTINGS),
+            ):
+                # the task fails if the index exists already, which is fine
+                await self._request(
+                    "POST", "/indexes", json={"uid": name, "primaryKey": "id"}
+                )
+                await self._request(
+                    "PATCH", f"/indexes/{name}/settings", json=index_settings
+                )
+            self._is_set_up = True
+
+    async def _add_documents(self, index_name: str, documents: list[dict]) -> dict:
+        return await self._call(
+            "POST",
+            f"/indexes/{index_name}/documents",
+            params={"primaryKey": "id"},
+            json=documents,
+        )
+
+    async def _search(self, index_name: str, query: str, params: dict) -> dict:
+        return await self._call(
+            "POST", f"/indexes/{index_name}/search", json={"q": query, **params}
+        )
+
     async def index_recipe(self, recipe: Recipe, db: AsyncSession):
         """Index a single recipe"""
         # Load all relationships if not already loaded
         if not recipe.latest_revision:
+            await reference_data.add_to_session(db)
             result = await db.execute(
                 select(Recipe)
                 .where(Recipe.id == recipe.id)
@@ -145,7 +215,7 @@ class MeilisearchService:
                     selectinload(Recipe.latest_revision)
                     .selectinload(RecipeRevision.ingredient_groups)
                     .selectinload(IngredientGroup.ingredients)
-                    .selectinload(Ingredient.unit),
+                    .immediateload(Ingredient.unit),
                     selectinload(Recipe.latest_revision).selectinload(
                         RecipeRevision.instruction_groups
                     ),
@@ -154,15 +224,13 @@ class MeilisearchService:
             recipe = result.scalar_one()
 
         doc = self._recipe_to_document(recipe)
-        index = self.client.get_index(self.recipe_index_name)
-        index.add_documents([doc])
+        await self._add_documents(self.recipe_index_name, [doc])
 
     async def index_recipes_bulk(self, recipes: List[Recipe]):
         """Bulk index multiple recipes"""
         documents = [self._recipe_to_document(recipe) for recipe in recipes]
         if documents:
-            index = self.client.get_index(self.recipe_index_name)
-            index.add_documents(documents)
+            await self._add_documents(self.recipe_index_name, documents)
 
     def _recipe_to_document(self, recipe: Recipe) -> dict:
         """Convert Recipe model to Meilisearch document"""
@@ -211,25 +279,21 @@ class MeilisearchService:
 
     async def delete_recipe(self, recipe_id: int):
         """Remove recipe from index"""
-        index = self.client.get_index(self.recipe_index_name)
-        task = index.delete_document(recipe_id)
-        # await self.client.wait_for_task(task.task_uid)
+        await self._call(
+            "DELETE", f"/indexes/{self.recipe_index_name}/documents/{recipe_id}"
+        )
 
     async def index_food(self, food: FoodCandidate | str, db: AsyncSession):
         """Index a single food"""
         doc = self._food_to_document(food)
-        index = self.client.get_index(self.food_index_name)
-        task = index.add_documents([doc])
-        # await self.client.wait_for_task(task.task_uid)
+        await self._add_documents(self.food_index_name, [doc])
 
 
     async def index_food_bulk(self, foods: list[FoodCandidate] | list[str]):
         """Bulk index multiple recipes"""
         documents = [self._food_to_document(food) for food in foods]
         if documents:
-            index = self.client.get_index(self.food_index_name)
-            task = index.add_documents(documents)
-            # self.client.wait_for_task(task.task_uid)
+            await self._add_documents(self.food_index_name, documents)
 
     def _food_to_document(self, food: FoodCandidate | str) -> dict:
         """Convert Food model to Meilisearch document"""
@@ -243,7 +307,7 @@ class MeilisearchService:
                 "language": food.language,
             }
 
-    def search_recipes(
+    async def search_recipes(
         self,
         query: str,
         languages: Optional[List[str]] = None,
@@ -259,8 +323,6 @@ class MeilisearchService:
 
         Returns Meilisearch response with hits, facets, etc.
         """
-        index = self.client.get_index(self.recipe_index_name)
-
         # Build filter string
         filters = []
 
@@ -295,9 +357,9 @@ class MeilisearchService:
             search_params["highlightPreTag"] = "<mark>"
             search_params["highlightPostTag"] = "</mark>"
 
-        return index.search(query, search_params)
+        return await self._search(self.recipe_index_name, query, search_params)
 
-    def search_foods(
+    async def search_foods(
         self,
         query: str,
         languages: Optional[List[str]] = None,
@@ -310,7 +372,6 @@ class MeilisearchService:
 
         Returns Meilisearch response with hits, facets, etc.
         """
-        index = self.client.get_index(self.food_index_name)
         filters = []
 
         if languages:
@@ -332,7 +393,7 @@ class MeilisearchService:
             search_params["highlightPreTag"] = "<mark>"
             search_params["highlightPostTag"] = "</mark>"
 
-        return index.search(query, search_params)
+        return await self._search(self.food_index_name, query, search_params)
 
 
 # Singleton instance
@@ -344,3 +405,10 @@ def get_meilisearch_service() -> MeilisearchService:
     if _meilisearch_service is None:
         _meilisearch_service = MeilisearchService()
     return _meilisearch_service
+
+
+async def close_meilisearch_service():
+    global _meilisearch_service
+    if _meilisearch_service is not None:
+        await _meilisearch_service.aclose()
+        _meilisearch_service = None
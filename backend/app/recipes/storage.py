@@ -0,0 +1,208 @@
+"""
+Content-addressed storage of ingredient and instruction groups.
+
+Revisions are immutable and most edits only touch a few fields, so instead of
+copying every group into each new revision, a group is stored once per
+distinct content and linked from all revisions that contain it (see
+`RevisionIngredientGroup`). Groups are found by a sha256 over their contents.
+
+The hash index is not unique: two writers storing the same new group at the
+same time simply end up with two copies, which is harmless.
+
+`revision_content_hash` does the same for a whole revision, so saves that
+change nothing can be skipped.
+
+With `settings.REVISION_SHARE_GROUPS` off, every revision gets fresh groups
+(the old behaviour), which keeps the two modes comparable, see
+`scripts/measure_revision_storage.py`.
+"""
+
+import hashlib
+import json
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.config import settings
+from app.recipes.models import (
+    Ingredient,
+    IngredientGroup,
+    InstructionGroup,
+    RevisionIngredientGroup,
+    RevisionInstructionGroup,
+    Unit,
+)
+from app.recipes.schemas import (
+    IngredientGroupWrite,
+    InstructionGroupIO,
+    RecipeRevisionCreateUpdate,
+)
+
+
+def _digest(data) -> str:
+    raw = json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+def ingredient_group_hash(group: IngredientGroupWrite) -> str:
+    return _digest(
+        [
+            group.name,
+            [
+                [ing.food, ing.amount_min, ing.amount_max, ing.comment, ing.unit_id]
+                for ing in group.ingredients
+            ],
+        ]
+    )
+
+
+def instruction_group_hash(group: InstructionGroupIO) -> str:
+    return _digest([group.name, group.instructions])
+
+
+def revision_content_hash(content: RecipeRevisionCreateUpdate) -> str:
+    """Canonical hash of everything a revision is written from"""
+    data = content.model_dump(mode="json")
+    data["categories"] = sorted(content.categories)
+    return _digest(data)
+
+
+async def _existing_groups(db: AsyncSession, model, hashes: set[str], *options):
+    """
+    Stored groups by content hash, the oldest one if there are several.
+
+    The groups are locked (FOR KEY SHARE, in id order like
+    `delete_orphan_groups`) until the transaction ends, so they can't be
+    deleted as orphans before the new revision links to them.
+    """
+    if not settings.REVISION_SHARE_GROUPS or not hashes:
+        return {}
+    result = await db.execute(
+        select(model)
+        .where(model.content_hash.in_(hashes))
+        .order_by(model.id)
+        .options(*options)
+        .with_for_update(key_share=True, of=model)
+    )
+    groups = {}
+    for group in result.unique().scalars().all():
+        groups.setdefault(group.content_hash, group)
+    return groups
+
+
+async def build_revision_groups(
+    db: AsyncSession,
+    ingredient_groups: list[IngredientGroupWrite],
+    instruction_groups: list[InstructionGroupIO],
+    units: dict[int, Unit],
+) -> tuple[list[IngredientGroup], list[InstructionGroup]]:
+    """
+    Groups for a new revision: stored ones where the content already exists
+    (loaded with everything `RecipeRevisionRead` needs), new ones otherwise.
+    Pass them to `RecipeRevision.set_groups`.
+    """
+    ingredient_hashes = [ingredient_group_hash(g) for g in ingredient_groups]
+    instruction_hashes = [instruction_group_hash(g) for g in instruction_groups]
+
+    stored_ingredient_groups = await _existing_groups(
+        db,
+        IngredientGroup,
+        set(ingredient_hashes),
+        # joined, the lookup is on the path of every write. Units come from
+        # the identity map, see reference.py
+        joinedload(IngredientGroup.ingredients).immediateload(Ingredient.unit),
+    )
+    stored_instruction_groups = await _existing_groups(
+        db, InstructionGroup, set(instruction_hashes)
+    )
+
+    # a group appearing twice in one revision is stored twice, so the
+    # positions of a revision always map to distinct groups
+    new_ingredient_groups = []
+    for group, content_hash in zip(ingredient_groups, ingredient_hashes):
+        stored = stored_ingredient_groups.pop(content_hash, None)
+        new_ingredient_groups.append(
+            stored
+            or IngredientGroup(
+                name=group.name,
+                content_hash=content_hash,
+                ingredients=[
+                    Ingredient(
+                        comment=ing.comment,
+                        food=ing.food,
+                        amount_min=ing.amount_min,
+                        amount_max=ing.amount_max,
+                        unit_id=ing.unit_id,
+                        unit=units.get(ing.unit_id),
+                        position=j,
+                    )
+                    for j, ing in enumerate(group.ingredients)
+                ],
+            )
+        )
+
+    new_instruction_groups = []
+    for group, content_hash in zip(instruction_groups, instruction_hashes):
+        stored = stored_instruction_groups.pop(content_hash, None)
+        new_instruction_groups.append(
+            stored
+            or InstructionGroup(
+                name=group.name,
+                instructions=group.instructions,
+                content_hash=content_hash,
+            )
+        )
+
+    return new_ingredient_groups, new_instruction_groups
+
+
+async def linked_group_ids(db: AsyncSession, revision_ids) -> tuple[set[int], set[int]]:
+    """Ids of the ingredient and instruction groups linked from `revision_ids`"""
+    ingredient_ids = await db.scalars(
+        select(RevisionIngredientGroup.group_id).where(
+            RevisionIngredientGroup.recipe_revision_id.in_(revision_ids)
+        )
+    )
+    instruction_ids = await db.scalars(
+        select(RevisionInstructionGroup.group_id).where(
+            RevisionInstructionGroup.recipe_revision_id.in_(revision_ids)
+        )
+    )
+    return set(ingredient_ids), set(instruction_ids)
+
+
+async def delete_orphan_groups(
+    db: AsyncSession, ingredient_group_ids: set[int], instruction_group_ids: set[int]
+) -> tuple[int, int]:
+    """
+    Delete those of the given groups that no revision links to anymore, e.g.
+    after deleting revisions. Their ingredients go with them (ON DELETE CASCADE).
+
+    Returns the number of ingredient and instruction groups deleted.
+    """
+    deleted = [0, 0]
+    for i, (model, link, group_ids) in enumerate(
+        [
+            (IngredientGroup, RevisionIngredientGroup, ingredient_group_ids),
+            (InstructionGroup, RevisionInstructionGroup, instruction_group_ids),
+        ]
+    ):
+        if not group_ids:
+            continue
+        # wait for writers reusing these groups (see `_existing_groups`), the
+        # delete below then sees the links they committed
+        await db.execute(
+            select(model.id)
+            .where(model.id.in_(group_ids))
+            .order_by(model.id)
+            .with_for_update()
+        )
+        result = await db.execute(
+            delete(model).where(
+                model.id.in_(group_ids),
+                ~exists().where(link.group_id == model.id),
+            )
+        )
+        deleted[i] = result.rowcount
+    return deleted[0], deleted[1]
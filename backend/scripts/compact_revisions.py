@@ -0,0 +1,133 @@
+"""
+Delete old recipe revisions according to the retention policy.
+
+Walks all recipes in batches of `--batch-size`, each batch in its own short
+transaction, see app/recipes/retention.py for what is kept. Meant to run
+next to live traffic (e.g. nightly from cron):
+
+- every transaction sets a `lock_timeout`, a batch that would have to wait
+  for a lock held by a request is rolled back and retried later instead of
+  blocking it, and skipped after `--retries` attempts,
+- it sleeps `--pause` seconds between batches.
+
+Prints the rows reclaimed per table at the end.
+
+Usage:
+    python scripts/compact_revisions.py [--dry-run] [--keep-last 20]
+        [--keep-daily-days 30] [--keep-weekly-weeks 52]
+        [--batch-size 100] [--pause 0.2] [--lock-timeout-ms 1000]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.recipes.models import Recipe
+from app.recipes.retention import RECLAIMED_KEYS, compact_revisions
+
+DATABASE_URL = str(settings.SQLALCHEMY_DATABASE_URI)
+
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+    # fixed for the whole run, so the day/week buckets don't shift between batches
+    now = datetime.now(UTC)
+
+    total = dict.fromkeys(RECLAIMED_KEYS, 0)
+    batches = skipped = 0
+    last_id = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            async with async_session() as db:
+                recipe_ids = list(
+                    await db.scalars(
+                        select(Recipe.id)
+                        .where(Recipe.id > last_id)
+                        .order_by(Recipe.id)
+                        .limit(args.batch_size)
+                    )
+                )
+            if not recipe_ids:
+                break
+            last_id = recipe_ids[-1]
+
+            for attempt in range(args.retries + 1):
+                try:
+                    async with async_session() as db, db.begin():
+                        await db.execute(
+                            text(f"SET LOCAL lock_timeout = {int(args.lock_timeout_ms)}")
+                        )
+                        reclaimed = await compact_revisions(
+                            db,
+                            recipe_ids,
+                            keep_last=args.keep_last,
+                            keep_daily_days=args.keep_daily_days,
+                            keep_weekly_weeks=args.keep_weekly_weeks,
+                            now=now,
+                            dry_run=args.dry_run,
+                        )
+                    break
+                except OperationalError as e:
+                    if getattr(e.orig, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+                        raise
+                    # back off a bit more on every attempt
+                    await asyncio.sleep(args.pause * 2 ** (attempt + 1))
+            else:
+                skipped += 1
+                print(f"Skipped recipes {recipe_ids[0]}..{last_id}: still locked")
+                continue
+
+            batches += 1
+            for key, count in reclaimed.items():
+                total[key] += count
+            if reclaimed["recipe_revisions"]:
+                print(
+                    f"recipes {recipe_ids[0]}..{last_id}: "
+                    f"{reclaimed['recipe_revisions']} revisions"
+                )
+            await asyncio.sleep(args.pause)
+    finally:
+        await engine.dispose()
+
+    print(
+        f"\n{'would be deleted' if args.dry_run else 'deleted'} "
+        f"({batches} batches, {skipped} skipped, {time.perf_counter() - start:.1f}s):"
+    )
+    for key, count in total.items():
+        print(f"  {key:<36} {count:>10}")
+    print(f"  {'total rows':<36} {sum(total.values()):>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--keep-last", type=int, default=settings.REVISION_RETENTION_KEEP_LAST
+    )
+    parser.add_argument(
+        "--keep-daily-days", type=int, default=settings.REVISION_RETENTION_DAILY_DAYS
+    )
+    parser.add_argument(
+        "--keep-weekly-weeks",
+        type=int,
+        default=settings.REVISION_RETENTION_WEEKLY_WEEKS,
+    )
+    parser.add_argument("--batch-size", type=int, default=100, help="Recipes per batch")
+    parser.add_argument(
+        "--pause", type=float, default=0.2, help="Seconds to sleep between batches"
+    )
+    parser.add_argument("--lock-timeout-ms", type=int, default=1000)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only count what would be deleted"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -396,12 +396,10 @@ async def generate_dummy_recipes(
             )
 
             # Ingredient Groups
+            ingredient_groups = []
             for pos_i in range(random.randint(1, 4)):
-                ingredient_group = IngredientGroup(
-                    name=random_ingredient_group_name(),
-                    position=pos_i,
-                    recipe_revision=revision,
-                )
+                ingredient_group = IngredientGroup(name=random_ingredient_group_name())
+                ingredient_groups.append(ingredient_group)
                 for pos in range(random.randint(3, 8)):
                     amount_min, amount_max = random_amount()
                     Ingredient(
@@ -414,17 +412,19 @@ async def generate_dummy_recipes(
                     )
 
             # Instruction Groups
+            instruction_groups = []
             for pos_i in range(random.randint(2, 5)):
                 instructions = "\n\n".join(
                     random_instruction() for _ in range(random.randint(2, 5))
                 )
-                InstructionGroup(
-                    name=f"Step {pos_i + 1}",
-                    instructions=instructions,
-                    position=pos_i,
-                    recipe_revision=revision,
+                instruction_groups.append(
+                    InstructionGroup(
+                        name=f"Step {pos_i + 1}",
+                        instructions=instructions,
+                    )
                 )
 
+            revision.set_groups(ingredient_groups, instruction_groups)
             recipe.latest_revision = revision
             db.add(recipe)
             recipes.append(recipe)
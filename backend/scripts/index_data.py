@@ -20,7 +20,7 @@ from app.recipes.models import (
     IngredientGroup,
     Ingredient,
 )
-from app.recipes.search import get_meilisearch_service
+from app.recipes.search import close_meilisearch_service, get_meilisearch_service
 
 
 async def index_data():
@@ -57,6 +57,8 @@ async def index_data():
             await search_service.index_food_bulk(chunk)
         print("Done!")
 
+    await close_meilisearch_service()
+
 
 if __name__ == "__main__":
     asyncio.run(index_data())
@@ -0,0 +1,198 @@
+"""
+Measure how much shared revision groups save over copying them.
+
+Seeds recipes and edits them through the regular write path, once with
+REVISION_SHARE_GROUPS off (every revision copies its groups) and once with it
+on, and reports the rows and table size added and the time spent writing.
+Each run happens in a transaction that is rolled back, so the database is left
+as it was.
+
+Most edits only change the title (like autosaves do), every `--ingredient-edit-every`
+th edit changes one ingredient.
+
+Usage:
+    python scripts/measure_revision_storage.py [--recipes 200] [--edits 20]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.auth.models import User
+from app.core.config import settings
+from app.recipes.models import RecipeCategories, Unit
+from app.recipes.routes import _create_recipe, _update_recipe
+from app.recipes.schemas import RecipeCreateUpdate
+
+DATABASE_URL = str(settings.SQLALCHEMY_DATABASE_URI)
+
+TABLES = [
+    "recipe_revisions",
+    "ingredient_groups",
+    "ingredients",
+    "instruction_groups",
+    "recipe_revision_ingredient_groups",
+    "recipe_revision_instruction_groups",
+]
+
+
+def random_recipe(categories: list[int], units: list[int]) -> dict:
+    return {
+        "is_private": False,
+        "is_draft": False,
+        "language": "en",
+        "content": {
+            "title": f"Recipe {random.randint(0, 10**6)}",
+            "subtitle": None,
+            "owner_comment": None,
+            "difficulty": random.randint(1, 5),
+            "servings": random.randint(1, 8),
+            "prep_time": random.randint(5, 60),
+            "cook_time": random.randint(5, 120),
+            "source_name": None,
+            "source_page": None,
+            "source_url": None,
+            "categories": random.sample(categories, k=min(2, len(categories))),
+            "ingredient_groups": [
+                {
+                    "name": f"Group {g + 1}",
+                    "ingredients": [
+                        {
+                            "food": f"Food {random.randint(0, 500)}",
+                            "amount_min": float(random.randint(1, 500)),
+                            "amount_max": None,
+                            "unit_id": random.choice(units),
+                            "comment": None,
+                        }
+                        for _ in range(random.randint(3, 8))
+                    ],
+                }
+                for g in range(random.randint(1, 4))
+            ],
+            "instruction_groups": [
+                {
+                    "name": f"Step {s + 1}",
+                    "instructions": " ".join(
+                        f"Do thing {random.randint(0, 10**6)}." for _ in range(5)
+                    ),
+                }
+                for s in range(random.randint(2, 5))
+            ],
+        },
+    }
+
+
+async def table_stats(db: AsyncSession) -> dict[str, tuple[int, int]]:
+    """(rows, total bytes incl. indexes) per table"""
+    stats = {}
+    for table in TABLES:
+        rows = await db.scalar(text(f"SELECT count(*) FROM {table}"))
+        size = await db.scalar(select(func.pg_total_relation_size(table)))
+        stats[table] = (rows, size)
+    return stats
+
+
+async def run(
+    engine, share_groups: bool, seed: int, n_recipes: int, n_edits: int, every: int
+) -> dict:
+    settings.REVISION_SHARE_GROUPS = share_groups
+    random.seed(seed)
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            owner = (await db.execute(select(User).limit(1))).scalar_one()
+            categories = list(await db.scalars(select(RecipeCategories.id)))
+            units = list(await db.scalars(select(Unit.id)))
+            if not categories or not units:
+                raise RuntimeError("Units and categories must exist, install the fixtures")
+
+            before = await table_stats(db)
+            elapsed = 0.0
+            for _ in range(n_recipes):
+                data = random_recipe(categories, units)
+
+                start = time.perf_counter()
+                recipe = await _create_recipe(
+                    db=db,
+                    recipe_data=RecipeCreateUpdate.model_validate(data),
+                    owner_id=owner.id,
+                )
+                elapsed += time.perf_counter() - start
+
+                for edit in range(1, n_edits + 1):
+                    data["content"]["title"] = f"{data['content']['title']} ({edit})"
+                    if edit % every == 0:
+                        group = random.choice(data["content"]["ingredient_groups"])
+                        random.choice(group["ingredients"])["amount_min"] += 1
+
+                    start = time.perf_counter()
+                    await _update_recipe(
+                        recipe, RecipeCreateUpdate.model_validate(data), db
+                    )
+                    elapsed += time.perf_counter() - start
+                db.expunge_all()
+            after = await table_stats(db)
+        finally:
+            await db.close()
+            await transaction.rollback()
+
+    return {
+        "elapsed": elapsed,
+        "tables": {
+            table: (after[table][0] - before[table][0], after[table][1] - before[table][1])
+            for table in TABLES
+        },
+    }
+
+
+def report(copied: dict, shared: dict, writes: int) -> None:
+    print(f"{'table':<36} {'rows copy':>10} {'rows shared':>12} {'MiB copy':>9} {'MiB shared':>11}")
+    total = [0, 0, 0, 0]
+    for table in TABLES:
+        rows_c, size_c = copied["tables"][table]
+        rows_s, size_s = shared["tables"][table]
+        total = [total[0] + rows_c, total[1] + rows_s, total[2] + size_c, total[3] + size_s]
+        print(
+            f"{table:<36} {rows_c:>10} {rows_s:>12} "
+            f"{size_c / 2**20:>9.2f} {size_s / 2**20:>11.2f}"
+        )
+    print(
+        f"{'total':<36} {total[0]:>10} {total[1]:>12} "
+        f"{total[2] / 2**20:>9.2f} {total[3] / 2**20:>11.2f}"
+    )
+    if total[0]:
+        print(f"\nrows saved: {1 - total[1] / total[0]:.1%}")
+    for name, result in (("copy", copied), ("shared", shared)):
+        print(
+            f"write time ({name}): {result['elapsed']:.2f}s, "
+            f"{result['elapsed'] / writes * 1000:.2f} ms per revision"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    try:
+        results = [
+            await run(
+                engine, share, args.seed, args.recipes, args.edits, args.ingredient_edit_every
+            )
+            for share in (False, True)
+        ]
+    finally:
+        await engine.dispose()
+    report(*results, writes=args.recipes * (args.edits + 1))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipes", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=20, help="Revisions per recipe")
+    parser.add_argument("--ingredient-edit-every", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
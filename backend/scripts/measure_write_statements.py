@@ -0,0 +1,113 @@
+"""
+Count the SQL statements of the recipe write path.
+
+Creates recipes and updates them through `_create_recipe` / `_update_recipe`,
+builds the `RecipeRead` response like the endpoints do, and reports the
+statements sent per operation and the time spent. Runs in a transaction that
+is rolled back, so the database is left as it was.
+
+Usage:
+    python scripts/measure_write_statements.py [--recipes 50]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.auth.models import User
+from app.core.config import settings
+from app.recipes.models import RecipeCategories, Unit
+from app.recipes.routes import _create_recipe, _update_recipe
+from app.recipes.schemas import RecipeCreateUpdate, RecipeRead
+
+from measure_revision_storage import random_recipe
+
+DATABASE_URL = str(settings.SQLALCHEMY_DATABASE_URI)
+
+OPERATIONS = ["create", "update content", "update metadata", "update unchanged"]
+
+
+async def main(args: argparse.Namespace) -> None:
+    random.seed(args.seed)
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    statements: list[str] = []
+
+    def _before_execute(conn, cursor, statement, *_):
+        statements.append(statement)
+
+    counts = {op: [] for op in OPERATIONS}
+    timings = {op: [] for op in OPERATIONS}
+    kinds = {op: Counter() for op in OPERATIONS}
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            owner = (await db.execute(select(User).limit(1))).scalar_one()
+            categories = list(await db.scalars(select(RecipeCategories.id)))
+            units = list(await db.scalars(select(Unit.id)))
+            if not categories or not units:
+                raise RuntimeError("Units and categories must exist, install the fixtures")
+            event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+
+            async def measure(op: str, write):
+                statements.clear()
+                start = time.perf_counter()
+                recipe = await write()
+                RecipeRead.model_validate(recipe)
+                timings[op].append(time.perf_counter() - start)
+                counts[op].append(len(statements))
+                kinds[op].update(s.split(None, 1)[0].upper() for s in statements)
+                return recipe
+
+            for _ in range(args.recipes):
+                data = random_recipe(categories, units)
+                recipe = await measure(
+                    "create",
+                    lambda: _create_recipe(
+                        db=db,
+                        recipe_data=RecipeCreateUpdate.model_validate(data),
+                        owner_id=owner.id,
+                    ),
+                )
+
+                async def update():
+                    await _update_recipe(
+                        recipe, RecipeCreateUpdate.model_validate(data), db
+                    )
+                    return recipe
+
+                data["content"]["title"] += " (edited)"
+                await measure("update content", update)
+                data["is_draft"] = not data["is_draft"]
+                await measure("update metadata", update)
+                await measure("update unchanged", update)
+                db.expunge_all()
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _before_execute)
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+    print(f"{'operation':<18} {'statements':>10} {'ms':>7}  by kind")
+    for op in OPERATIONS:
+        by_kind = ", ".join(
+            f"{kind} {count / len(counts[op]):.0f}" for kind, count in kinds[op].items()
+        )
+        print(
+            f"{op:<18} {statistics.mean(counts[op]):>10.1f} "
+            f"{statistics.mean(timings[op]) * 1000:>7.2f}  {by_kind}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -9,6 +9,9 @@ import aiohttp
 
 LOGIN_URL = "https://zest.dbadrian.com/api/v1/auth/login"
 RECIPE_URL = "https://zest.dbadrian.com/api/v1/recipes/"
+BULK_URL = RECIPE_URL + "bulk"
+# at most MAX_BULK_SIZE of app/recipes/schemas.py
+CHUNK_SIZE = 200
 
 
 async def login(session: aiohttp.ClientSession, username: str, password: str) -> str:
@@ -36,34 +39,49 @@ async def login(session: aiohttp.ClientSession, username: str, password: str) ->
         return token
 
 
-async def send_recipe(session, token: str, recipe_str: str, filename: str):
+async def send_recipes(session, token: str, chunk: list[tuple[str, str]]):
+    """POST a chunk of (filename, recipe json) to the bulk endpoint"""
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
     }
+    # the files are valid JSON already, splice them in without re-encoding
+    body = '{"recipes": [' + ",".join(content for _, content in chunk) + "]}"
 
     try:
-        async with session.post(RECIPE_URL, data=recipe_str, headers=headers) as resp:
-            text = await resp.text()
-            if 200 <= resp.status < 300:
-                return filename, True, resp.status, text
-            else:
-                return filename, False, resp.status, text
+        async with session.post(BULK_URL, data=body, headers=headers) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                return [
+                    (filename, False, resp.status, text) for filename, _ in chunk
+                ]
+            data = await resp.json()
     except Exception as e:
-        return filename, False, None, str(e)
+        return [(filename, False, None, str(e)) for filename, _ in chunk]
 
+    return [
+        (
+            chunk[result["index"]][0],
+            result["id"] is not None,
+            resp.status,
+            result["id"] if result["id"] is not None else result["errors"],
+        )
+        for result in data["results"]
+    ]
 
-async def main_async(json_files, username, password):
+
+async def main_async(json_files, username, password, chunk_size: int):
     async with aiohttp.ClientSession() as session:
         token = await login(session, username, password)
         print("✅ Login successful")
 
-        tasks = [
-            send_recipe(session, token, content, filename)
-            for filename, content in json_files
-        ]
-
-        results = await asyncio.gather(*tasks)
+        # one request per chunk, one after the other: each is a single
+        # transaction and search indexing call on the server
+        results = []
+        for start in range(0, len(json_files), chunk_size):
+            chunk = json_files[start : start + chunk_size]
+            results.extend(await send_recipes(session, token, chunk))
+            print(f"Sent {min(start + chunk_size, len(json_files))}/{len(json_files)}")
 
         print("\n=== RESULTS ===")
         success = 0
@@ -71,7 +89,7 @@ async def main_async(json_files, username, password):
 
         for filename, ok, status, msg in results:
             if ok:
-                print(f"[SUCCESS] {filename} (status={status})")
+                print(f"[SUCCESS] {filename} (id={msg})")
                 success += 1
             else:
                 print(f"[FAIL]    {filename} (status={status}) -> {msg}")
@@ -86,6 +104,9 @@ if __name__ == "__main__":
     parser = ArgumentParser()
     parser.add_argument("--input", type=Path, required=True)
     parser.add_argument("--username", required=True)
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="Recipes per request"
+    )
 
     args = parser.parse_args()
 
@@ -112,4 +133,4 @@ if __name__ == "__main__":
         print("No valid JSON files found.")
         exit(1)
 
-    asyncio.run(main_async(json_files, args.username, password))
\ No newline at end of file
+    asyncio.run(main_async(json_files, args.username, password, args.chunk_size))
\ No newline at end of file
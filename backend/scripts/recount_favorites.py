@@ -0,0 +1,61 @@
+"""
+Recount the favorites of all recipes.
+
+`Recipe.favorite_count` drifts when favorites are deleted by the database
+instead of the favorites endpoints, e.g. along with a deleted user (see
+app/recipes/favorites.py). Walks all recipes in batches of `--batch-size`,
+each batch in its own short transaction, and prints the recipes corrected.
+
+Usage:
+    python scripts/recount_favorites.py [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.recipes.favorites import recount_favorites
+from app.recipes.models import Recipe
+
+DATABASE_URL = str(settings.SQLALCHEMY_DATABASE_URI)
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    corrected = 0
+    last_id = 0
+    try:
+        while True:
+            async with async_session() as db, db.begin():
+                recipe_ids = list(
+                    await db.scalars(
+                        select(Recipe.id)
+                        .where(Recipe.id > last_id)
+                        .order_by(Recipe.id)
+                        .limit(args.batch_size)
+                    )
+                )
+                if not recipe_ids:
+                    break
+                last_id = recipe_ids[-1]
+                fixed = await recount_favorites(db, recipe_ids)
+            corrected += len(fixed)
+            if fixed:
+                print(f"recipes {recipe_ids[0]}..{last_id}: {len(fixed)} corrected")
+    finally:
+        await engine.dispose()
+
+    print(f"\n{corrected} recipes corrected")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Recipes per batch"
+    )
+    asyncio.run(main(parser.parse_args()))
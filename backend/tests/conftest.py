@@ -1,12 +1,11 @@
-import asyncio
 from collections.abc import AsyncGenerator
 import pytest
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.main import app
-from app.db import engine, get_db, AsyncSessionLocal
-from app.core import config
+from app.db import engine, get_db
 
 # @pytest.fixture(scope="session")
 # def event_loop():
@@ -19,6 +18,38 @@ from app.core import config
 #
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        help="also run the tests marked `benchmark`",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: slow throughput measurement, run with --run-benchmarks"
+    )
+    config.addinivalue_line(
+        "markers", "no_db: the test needs no database, skip the session setup"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --run-benchmarks")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # session scoped, so session scoped async fixtures can run
+    return "asyncio"
+
+
 @pytest.fixture(scope="session", autouse=True)
 async def prepare_database():
     """
@@ -48,7 +79,12 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 @pytest.fixture(autouse=True)
-def override_get_db(db_session: AsyncSession):
+def override_get_db(request: pytest.FixtureRequest):
+    if request.node.get_closest_marker("no_db") is not None:
+        yield
+        return
+    db_session = request.getfixturevalue("db_session")
+
     async def _get_db_override():
         try:
             yield db_session
@@ -61,6 +97,22 @@ def override_get_db(db_session: AsyncSession):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def sql_statements():
+    """
+    Records every SQL statement sent to the database during the test.
+    Use to pin down the number of round trips of an endpoint.
+    """
+    statements: list[str] = []
+
+    def _before_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", _before_execute)
+
+
 @pytest.fixture
 async def client():
     transport = ASGITransport(app=app)
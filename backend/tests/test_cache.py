@@ -0,0 +1,66 @@
+"""
+Tests for the in-process caches.
+"""
+
+import pytest
+
+from app.core.cache import TTLCache
+
+pytestmark = pytest.mark.no_db
+
+
+class TestTTLCache:
+    @pytest.mark.anyio
+    async def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now the least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.anyio
+    async def test_expiry(self):
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+
+        assert "a" not in cache
+        assert cache.get("a", default=-1) == -1
+        assert len(cache) == 0
+
+    @pytest.mark.anyio
+    async def test_invalid_entries_are_misses(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", (1, "payload"))
+
+        assert cache.get("a", valid=lambda entry: entry[0] == 2) is None
+        assert "a" not in cache
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (0, 1, 1)
+
+    @pytest.mark.anyio
+    async def test_stats(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.pop("a")
+
+        assert cache.stats() == {
+            "size": 0,
+            "maxsize": 4,
+            "hits": 2,
+            "misses": 1,
+            "evictions": 1,
+            "hit_rate": 2 / 3,
+        }
+
+    @pytest.mark.anyio
+    async def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=0, ttl=60)
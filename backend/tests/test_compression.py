@@ -0,0 +1,172 @@
+"""
+Tests for the response compression middleware.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import (
+    ENCODINGS,
+    CompressionMiddleware,
+    encode_body,
+    encoded_response,
+    negotiate,
+    no_compression,
+)
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified
+
+pytestmark = pytest.mark.no_db
+
+LARGE = {"items": [{"id": i, "name": f"item {i}"} for i in range(200)]}
+
+
+@pytest.fixture
+def compressed_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/large")
+    async def large():
+        return LARGE
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/uncompressed", dependencies=[Depends(no_compression)])
+    async def uncompressed():
+        return LARGE
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for item in LARGE["items"]:
+                yield json.dumps(item) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/precompressed")
+    async def precompressed():
+        body = json.dumps(LARGE).encode()
+        return encoded_response(*encode_body(body, "gzip", best=True))
+
+    @app.get("/tagged")
+    async def tagged(request: Request):
+        if etag_matches(request, '"v1"'):
+            return not_modified('"v1"')
+        return JSONResponse(LARGE, headers={"ETag": '"v1"'})
+
+    @app.get("/binary")
+    async def binary():
+        return JSONResponse(LARGE, media_type="application/octet-stream")
+
+    return app
+
+
+@pytest.fixture
+async def raw_client(compressed_app: FastAPI):
+    transport = ASGITransport(app=compressed_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def get_raw(client: AsyncClient, url: str, accept_encoding: str):
+    """The response and its body as sent, not decoded by httpx"""
+    async with client.stream(
+        "GET", url, headers={"Accept-Encoding": accept_encoding}
+    ) as response:
+        return response, b"".join([chunk async for chunk in response.aiter_raw()])
+
+
+class TestNegotiate:
+    @pytest.mark.anyio
+    async def test_preference_and_q_values(self):
+        assert negotiate(None) is None
+        assert negotiate("identity") is None
+        assert negotiate("gzip") == "gzip"
+        assert negotiate("deflate, GZip;q=0.5") == "gzip"
+        assert negotiate("gzip;q=0") is None
+        assert negotiate("*") == next(iter(ENCODINGS))
+        assert negotiate("*, gzip;q=0") == (
+            next((e for e in ENCODINGS if e != "gzip"), None)
+        )
+
+    @pytest.mark.anyio
+    async def test_client_preference_wins(self):
+        assert negotiate(", ".join(f"{e};q=0.5" for e in ENCODINGS) + ", gzip") == (
+            "gzip"
+        )
+
+
+class TestCompressionMiddleware:
+    @pytest.mark.anyio
+    async def test_compresses_large_json(self, raw_client: AsyncClient):
+        response, body = await get_raw(raw_client, "/large", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(body)
+        assert json.loads(gzip.decompress(body)) == LARGE
+
+    @pytest.mark.anyio
+    async def test_leaves_responses_uncompressed(self, raw_client: AsyncClient):
+        headers = {"Accept-Encoding": "gzip"}
+        for url in ["/small", "/uncompressed", "/binary"]:
+            response = await raw_client.get(url, headers=headers)
+            assert "content-encoding" not in response.headers, url
+
+        response = await raw_client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == LARGE
+
+    @pytest.mark.anyio
+    async def test_compresses_streams(self, raw_client: AsyncClient):
+        response, body = await get_raw(raw_client, "/stream", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = gzip.decompress(body).decode().splitlines()
+        assert [json.loads(line) for line in lines] == LARGE["items"]
+
+    @pytest.mark.anyio
+    async def test_passes_precompressed_through(self, raw_client: AsyncClient):
+        response, body = await get_raw(raw_client, "/precompressed", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        # compressed once, by the endpoint
+        assert json.loads(gzip.decompress(body)) == LARGE
+
+    @pytest.mark.anyio
+    async def test_encode_body_minimum_size(self):
+        small = b"x" * (settings.COMPRESSION_MINIMUM_SIZE - 1)
+        assert encode_body(small, "gzip") == (small, None)
+        body, encoding = encode_body(small + b"xx", "gzip")
+        assert encoding == "gzip"
+        assert gzip.decompress(body) == small + b"xx"
+
+    @pytest.mark.anyio
+    async def test_weakens_etag_of_compressed_responses(self, raw_client: AsyncClient):
+        response, _ = await get_raw(raw_client, "/tagged", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == 'W/"v1"'
+
+        response, _ = await get_raw(raw_client, "/tagged", "identity")
+        assert response.headers["etag"] == '"v1"'
+
+        response = await raw_client.get(
+            "/tagged", headers={"Accept-Encoding": "gzip", "If-None-Match": 'W/"v1"'}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == 'W/"v1"'
+
+        body = json.dumps(LARGE).encode()
+        response = encoded_response(*encode_body(body, "gzip"), headers={"ETag": '"v1"'})
+        assert response.headers["etag"] == 'W/"v1"'
+        response = encoded_response(*encode_body(body, None), headers={"ETag": '"v1"'})
+        assert response.headers["etag"] == '"v1"'
@@ -9,11 +9,11 @@ from typing import AsyncGenerator
 from unittest.mock import Mock, AsyncMock, patch
 from urllib.parse import parse_qs, urlparse
 
-from fastapi import FastAPI, Depends, Request
+from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from pydantic import ValidationError
-from sqlalchemy import Column, Integer, String, ForeignKey, create_engine, select
+from sqlalchemy import Column, Integer, String, ForeignKey, create_engine, event, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, relationship
 
@@ -22,6 +22,7 @@ from app.core.pagination import (
     paginate,
     get_pagination_params,
     _build_page_url,
+    _count_cache,
 )
 from app.core.config import settings
 from app.db import engine, init_db
@@ -178,3 +179,279 @@ class TestPaginateFunction:
         assert len(result.results) == 10
         assert result.results[0].id == 1
         assert result.results[-1].id == 10
+
+
+class TestCursorPagination:
+    """Test keyset (cursor) mode of the paginate function."""
+
+    @pytest.mark.anyio
+    async def test_walk_all_pages(self, populated_test_db: AsyncSession):
+        """Following next_cursor should visit every row exactly once."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit)
+        params = PaginationParams(page_size=20, mode="cursor")
+
+        seen = []
+        pages = 0
+        while True:
+            result = await paginate(
+                populated_test_db, query, params, request, keyset=(Unit.id,)
+            )
+            pages += 1
+            seen.extend(u.id for u in result.results)
+            assert result.pagination.current_page is None
+            assert result.pagination.total == 50
+
+            if result.pagination.next_cursor is None:
+                assert result.pagination.next is None
+                break
+
+            next_params = parse_qs(urlparse(result.pagination.next).query)
+            assert next_params["cursor"] == [result.pagination.next_cursor]
+            assert next_params["mode"] == ["cursor"]
+            params = PaginationParams(
+                page_size=20, cursor=result.pagination.next_cursor
+            )
+
+        assert pages == 3
+        assert seen == list(range(1, 51))
+
+    @pytest.mark.anyio
+    async def test_descending_keyset(self, populated_test_db: AsyncSession):
+        """Descending keysets should seek downwards from the cursor."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit)
+        params = PaginationParams(page_size=10, mode="cursor")
+        first = await paginate(
+            populated_test_db,
+            query,
+            params,
+            request,
+            keyset=(Unit.id,),
+            keyset_descending=True,
+        )
+        assert [u.id for u in first.results] == list(range(50, 40, -1))
+
+        params = PaginationParams(page_size=10, cursor=first.pagination.next_cursor)
+        second = await paginate(
+            populated_test_db,
+            query,
+            params,
+            request,
+            keyset=(Unit.id,),
+            keyset_descending=True,
+        )
+        assert [u.id for u in second.results] == list(range(40, 30, -1))
+
+    @pytest.mark.anyio
+    async def test_invalid_cursor(self, populated_test_db: AsyncSession):
+        """Garbage or foreign cursors should be rejected with a 400."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit)
+        with pytest.raises(HTTPException) as exc_info:
+            await paginate(
+                populated_test_db,
+                query,
+                PaginationParams(cursor="not-a-cursor"),
+                request,
+                keyset=(Unit.id,),
+            )
+        assert exc_info.value.status_code == 400
+
+        # A cursor issued for ascending order must not be replayed descending
+        first = await paginate(
+            populated_test_db,
+            query,
+            PaginationParams(page_size=10, mode="cursor"),
+            request,
+            keyset=(Unit.id,),
+        )
+        with pytest.raises(HTTPException) as exc_info:
+            await paginate(
+                populated_test_db,
+                query,
+                PaginationParams(page_size=10, cursor=first.pagination.next_cursor),
+                request,
+                keyset=(Unit.id,),
+                keyset_descending=True,
+            )
+        assert exc_info.value.status_code == 400
+
+
+class TestCountStrategies:
+    """Test include_total and the count strategies of paginate."""
+
+    @pytest.mark.anyio
+    async def test_without_total(self, populated_test_db: AsyncSession):
+        """include_total=False should skip counting but still link pages."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit).order_by(Unit.id)
+        params = PaginationParams(page=4, page_size=12, include_total=False)
+        result = await paginate(populated_test_db, query, params, request)
+
+        assert result.pagination.total is None
+        assert result.pagination.total_pages is None
+        assert [u.id for u in result.results] == list(range(37, 49))
+        assert result.pagination.next is not None
+
+        params = PaginationParams(page=5, page_size=12, include_total=False)
+        result = await paginate(populated_test_db, query, params, request)
+        assert [u.id for u in result.results] == [49, 50]
+        assert result.pagination.next is None
+
+    @pytest.mark.anyio
+    async def test_estimated_total(self, populated_test_db: AsyncSession):
+        """Estimated totals come from the planner and are flagged as such."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit).where(Unit.id > 10).order_by(Unit.id)
+        params = PaginationParams(page=1, page_size=10, count="estimated")
+        result = await paginate(populated_test_db, query, params, request)
+
+        assert result.pagination.total_estimated
+        assert result.pagination.total >= 0
+        assert len(result.results) == 10
+        assert result.pagination.next is not None
+
+    @pytest.mark.anyio
+    async def test_estimated_total_in_filter(self, populated_test_db: AsyncSession):
+        """Estimates work for filters with expanding IN parameters."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit).where(Unit.id.in_([1, 2, 3])).order_by(Unit.id)
+        params = PaginationParams(page=1, page_size=10, count="estimated")
+        result = await paginate(populated_test_db, query, params, request)
+
+        assert result.pagination.total_estimated
+        assert result.pagination.total >= 0
+        assert [u.id for u in result.results] == [1, 2, 3]
+
+    @pytest.mark.anyio
+    async def test_cached_total(self, populated_test_db: AsyncSession):
+        """Cached totals are computed once per filter signature."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        _count_cache.clear()
+        query = select(Unit).where(Unit.name.like("name%")).order_by(Unit.id)
+        params = PaginationParams(page=1, page_size=10, count="cached")
+
+        first = await paginate(populated_test_db, query, params, request)
+        assert first.pagination.total == 50
+        assert not first.pagination.total_estimated
+
+        populated_test_db.add(
+            Unit(id=51, name="name51", unit_system=UnitSystem.METRIC)
+        )
+        await populated_test_db.flush()
+
+        second = await paginate(populated_test_db, query, params, request)
+        assert second.pagination.total == 50
+        assert second.pagination.total_estimated
+
+        exact = await paginate(
+            populated_test_db,
+            query,
+            PaginationParams(page=1, page_size=10),
+            request,
+        )
+        assert exact.pagination.total == 51
+        assert not exact.pagination.total_estimated
+
+
+class TestWindowCount:
+    """Test the single round trip window count strategy."""
+
+    @staticmethod
+    def _count_statements():
+        statements = []
+
+        def _before_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+        return statements, lambda: event.remove(
+            engine.sync_engine, "before_cursor_execute", _before_execute
+        )
+
+    @pytest.mark.anyio
+    async def test_single_statement(self, populated_test_db: AsyncSession):
+        """Page and total should come from one statement."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit).order_by(Unit.id)
+        params = PaginationParams(page=2, page_size=10, count="window")
+
+        statements, stop = self._count_statements()
+        try:
+            result = await paginate(populated_test_db, query, params, request)
+        finally:
+            stop()
+
+        assert len(statements) == 1
+        assert "over" in statements[0].lower()
+        assert result.pagination.total == 50
+        assert result.pagination.total_pages == 5
+        assert not result.pagination.total_estimated
+        assert [u.id for u in result.results] == list(range(11, 21))
+
+    @pytest.mark.anyio
+    async def test_ids_then_enrich(self, populated_test_db: AsyncSession):
+        """With enrichment, the page query selects IDs only: two statements."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit).order_by(Unit.id.desc())
+        params = PaginationParams(page=1, page_size=5)
+
+        def _enrich(ids):
+            return select(Unit).where(Unit.id.in_(ids))
+
+        statements, stop = self._count_statements()
+        try:
+            result = await paginate(
+                populated_test_db, query, params, request, enrich_query=_enrich
+            )
+        finally:
+            stop()
+
+        assert len(statements) == 2
+        assert result.pagination.total == 50
+        assert [u.id for u in result.results] == [50, 49, 48, 47, 46]
+
+    @pytest.mark.anyio
+    async def test_page_beyond_end(self, populated_test_db: AsyncSession):
+        """An empty page past the end still reports the right total."""
+        request = Mock(spec=Request)
+        request.url.path = "/api/v1/units"
+        request.query_params = {}
+
+        query = select(Unit).order_by(Unit.id)
+        params = PaginationParams(page=9, page_size=10)
+        result = await paginate(populated_test_db, query, params, request)
+
+        assert result.results == []
+        assert result.pagination.total == 50
+        assert result.pagination.total_pages == 5
+        assert result.pagination.next is None
+        assert result.pagination.previous is not None
@@ -1,9 +1,12 @@
 import asyncio
+import json
+from contextlib import nullcontext
 from time import strptime
+from uuid import uuid4
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, literal_column, select, update
 from datetime import datetime, UTC, timedelta
 
 from app.core.config import settings
@@ -16,13 +19,32 @@ from app.recipes.models import (
     IngredientGroup,
     Ingredient,
     InstructionGroup,
+    RecipeChange,
+    RecipeChangeOp,
+    RevisionIngredientGroup,
+    RevisionInstructionGroup,
 )
 from app.auth.models import User
+from app.recipes.associations import user_favorite_recipes
+from app.recipes import routes as recipe_routes
+from app.recipes.cache import get_cached_snapshot, recipe_cache
 from app.recipes.constants import UnitSystem, BaseUnit
+from app.recipes.favorites import recount_favorites
+from app.recipes.multilingual import MULTILINGUAL_PATH
+from app.recipes.reference import reference_data
+from app.recipes.retention import compact_revisions
+from app.recipes.bulk import _insert_groups
+from app.recipes.schemas import InstructionGroupIO, MAX_BULK_SIZE, RecipeCreateUpdate
+from app.recipes.storage import (
+    _existing_groups,
+    delete_orphan_groups,
+    instruction_group_hash,
+)
 from app.auth.auth import get_current_user
 from app.main import app
+from app.recipes.search import get_meilisearch_service
 
-from app.db import init_db
+from app.db import engine, init_db
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -286,11 +308,7 @@ async def test_recipe(
         created_at=datetime.now(UTC),
     )
 
-    ingredient_group = IngredientGroup(
-        name="Main Ingredients",
-        position=0,
-        recipe_revision=revision,
-    )
+    ingredient_group = IngredientGroup(name="Main Ingredients")
 
     ingredient = Ingredient(
         food="Test Food",
@@ -305,10 +323,9 @@ async def test_recipe(
     instruction_group = InstructionGroup(
         name="Instructions",
         instructions="Test instructions",
-        position=0,
-        recipe_revision=revision,
     )
 
+    revision.set_groups([ingredient_group], [instruction_group])
     recipe.latest_revision = revision
 
     db_session.add(recipe)
@@ -346,11 +363,7 @@ async def private_recipe(
         created_at=datetime.now(UTC),
     )
 
-    ingredient_group = IngredientGroup(
-        name="Ingredients",
-        position=0,
-        recipe_revision=revision,
-    )
+    ingredient_group = IngredientGroup(name="Ingredients")
 
     ingredient = Ingredient(
         food="Secret Ingredient",
@@ -365,10 +378,9 @@ async def private_recipe(
     instruction_group = InstructionGroup(
         name="Steps",
         instructions="Secret instructions",
-        position=0,
-        recipe_revision=revision,
     )
 
+    revision.set_groups([ingredient_group], [instruction_group])
     recipe.latest_revision = revision
 
     db_session.add(recipe)
@@ -406,11 +418,7 @@ async def draft_recipe(
         created_at=datetime.now(UTC),
     )
 
-    ingredient_group = IngredientGroup(
-        name="Ingredients",
-        position=0,
-        recipe_revision=revision,
-    )
+    ingredient_group = IngredientGroup(name="Ingredients")
 
     ingredient = Ingredient(
         food="Secret Ingredient",
@@ -425,10 +433,9 @@ async def draft_recipe(
     instruction_group = InstructionGroup(
         name="Steps",
         instructions="Secret instructions",
-        position=0,
-        recipe_revision=revision,
     )
 
+    revision.set_groups([ingredient_group], [instruction_group])
     recipe.latest_revision = revision
 
     db_session.add(recipe)
@@ -600,20 +607,15 @@ class TestGetRecipes:
             created_at=datetime.now(UTC),
         )
 
-        ingredient_group = IngredientGroup(
-            name="Ingredients",
-            position=0,
-            recipe_revision=revision,
-        )
+        ingredient_group = IngredientGroup(name="Ingredients")
         _add_minimal_ingredient(ingredient_group, units[0].id)
 
         instruction_group = InstructionGroup(
             name="Steps",
             instructions="Private steps",
-            position=0,
-            recipe_revision=revision,
         )
 
+        revision.set_groups([ingredient_group], [instruction_group])
         private_recipe.latest_revision = revision
         db_session.add(private_recipe)
         await db_session.flush()
@@ -668,20 +670,15 @@ class TestGetRecipes:
             created_at=datetime.now(UTC),
         )
 
-        ingredient_group = IngredientGroup(
-            name="Ingredients",
-            position=0,
-            recipe_revision=revision,
-        )
+        ingredient_group = IngredientGroup(name="Ingredients")
         _add_minimal_ingredient(ingredient_group, units[0].id)
 
         instruction_group = InstructionGroup(
             name="Steps",
             instructions="Public steps",
-            position=0,
-            recipe_revision=revision,
         )
 
+        revision.set_groups([ingredient_group], [instruction_group])
         public_recipe.latest_revision = revision
         db_session.add(public_recipe)
         await db_session.flush()
@@ -749,7 +746,8 @@ class TestCreateRecipe:
         # Verify ingredient groups were created
         result = await db_session.execute(
             select(IngredientGroup)
-            .join(IngredientGroup.recipe_revision)
+            .select_from(RecipeRevision)
+            .join(RecipeRevision.ingredient_groups)
             .join(RecipeRevision.recipe)
             .where(Recipe.id == recipe_id)
         )
@@ -759,8 +757,9 @@ class TestCreateRecipe:
         # Verify ingredients were created
         result = await db_session.execute(
             select(Ingredient)
-            .join(Ingredient.ingredient_group)
-            .join(IngredientGroup.recipe_revision)
+            .select_from(RecipeRevision)
+            .join(RecipeRevision.ingredient_groups)
+            .join(IngredientGroup.ingredients)
             .join(RecipeRevision.recipe)
             .where(Recipe.id == recipe_id)
         )
@@ -781,7 +780,7 @@ class TestCreateRecipe:
             f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
         )
 
-        assert response.status_code == 400
+        assert response.status_code == 422
         assert "category" in response.json()["detail"].lower()
 
     @pytest.mark.anyio
@@ -800,7 +799,7 @@ class TestCreateRecipe:
             f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
         )
 
-        assert response.status_code == 400
+        assert response.status_code == 422
         assert "unit" in response.json()["detail"].lower()
 
 
@@ -828,6 +827,7 @@ class TestUpdateRecipe:
         old_updated_at = data["updated_at"]
         # do another update to properly test the update_at
         await asyncio.sleep(1)
+        sample_recipe_data["content"]["subtitle"] = "Updated subtitle"
 
         response = await client.put(
             f"{settings.API_V1_STR}/recipes/{test_recipe.id}", json=sample_recipe_data
@@ -879,6 +879,94 @@ class TestUpdateRecipe:
         revisions = result.unique().scalars().all()
         assert len(revisions) == 2
 
+    @pytest.mark.anyio
+    async def test_write_responses_built_in_memory(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        sql_statements: list[str],
+    ):
+        """Should answer writes without reading back what was just written"""
+
+        def _reads_after_writing() -> list[str]:
+            first_write = next(
+                i for i, s in enumerate(sql_statements) if s.startswith("INSERT")
+            )
+            return [s for s in sql_statements[first_write:] if s.startswith("SELECT")]
+
+        sql_statements.clear()
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        assert _reads_after_writing() == []
+        created = response.json()
+        recipe_url = f"{settings.API_V1_STR}/recipes/{created['id']}"
+        response = await client.get(recipe_url)
+        assert response.json() == created
+
+        await client.post(f"{recipe_url}/favorites")
+        sample_recipe_data["content"]["title"] = "Updated"
+        sample_recipe_data["is_draft"] = True
+        sql_statements.clear()
+        response = await client.put(recipe_url, json=sample_recipe_data)
+        assert _reads_after_writing() == []
+        updated = response.json()
+        assert updated["is_favorited"] is True
+        assert updated["favorite_count"] == 1
+        response = await client.get(recipe_url)
+        assert response.json() == updated
+
+    @pytest.mark.anyio
+    async def test_update_without_changes_is_skipped(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Should not write or reindex anything when saving unchanged content"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        created = response.json()
+        recipe_url = f"{settings.API_V1_STR}/recipes/{created['id']}"
+
+        indexed = []
+
+        async def _index_recipe(recipe, db):
+            indexed.append(recipe.id)
+
+        monkeypatch.setattr(get_meilisearch_service(), "index_recipe", _index_recipe)
+
+        # same content, different order of categories and spacing
+        sample_recipe_data["content"]["categories"].reverse()
+        sample_recipe_data["content"]["title"] += "  "
+        response = await client.put(recipe_url, json=sample_recipe_data)
+
+        assert response.status_code == 201
+        assert response.json() == created
+        assert indexed == []
+        changes = await db_session.scalar(
+            select(func.count())
+            .select_from(RecipeChange)
+            .where(RecipeChange.recipe_id == created["id"])
+        )
+        assert changes == 1
+
+        # a metadata-only change keeps the revision
+        sample_recipe_data["is_draft"] = True
+        response = await client.put(recipe_url, json=sample_recipe_data)
+
+        data = response.json()
+        assert data["is_draft"] is True
+        assert data["updated_at"] != created["updated_at"]
+        assert data["latest_revision"] == created["latest_revision"]
+        assert indexed == [created["id"]]
+        response = await client.get(f"{recipe_url}/versions")
+        assert len(response.json()["results"]) == 1
+
     @pytest.mark.anyio
     async def test_update_recipe_not_owner(
         self,
@@ -958,20 +1046,15 @@ class TestGetRecipe:
             created_at=datetime.now(UTC),
         )
 
-        ingredient_group = IngredientGroup(
-            name="Ingredients",
-            position=0,
-            recipe_revision=revision,
-        )
+        ingredient_group = IngredientGroup(name="Ingredients")
         _add_minimal_ingredient(ingredient_group, units[0].id)
 
         instruction_group = InstructionGroup(
             name="Steps",
             instructions="Steps",
-            position=0,
-            recipe_revision=revision,
         )
 
+        revision.set_groups([ingredient_group], [instruction_group])
         public_recipe.latest_revision = revision
         db_session.add(public_recipe)
         await db_session.flush()
@@ -1007,6 +1090,106 @@ class TestGetRecipe:
 
         assert response.status_code == 404
 
+    @pytest.mark.anyio
+    async def test_get_recipe_from_snapshot(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        sql_statements: list[str],
+    ):
+        """Should serve the stored revision snapshot in a single statement"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        assert response.status_code == 201
+        created = response.json()
+
+        sql_statements.clear()
+        response = await client.get(f"{settings.API_V1_STR}/recipes/{created['id']}")
+
+        assert response.status_code == 200
+        assert len(sql_statements) == 1
+        assert response.json() == created
+
+    @pytest.mark.anyio
+    async def test_get_recipe_include(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+    ):
+        """Should only return the requested relationships"""
+        url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+        full = await client.get(url)
+        response = await client.get(url, params={"include": "ingredients"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == set(full.json()) - {"original_recipe", "translations"}
+        assert set(data["latest_revision"]) == set(full.json()["latest_revision"]) - {
+            "categories",
+            "instruction_groups",
+        }
+        assert response.headers["etag"] != full.headers["etag"]
+
+    @pytest.mark.anyio
+    async def test_get_recipe_backfills_snapshot(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        units: list[Unit],
+        db_session: AsyncSession,
+    ):
+        """Should build and store the snapshot of revisions without one"""
+        revision_id = test_recipe.latest_revision_id
+        response = await client.get(f"{settings.API_V1_STR}/recipes/{test_recipe.id}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["latest_revision"]["title"] == "Test Recipe"
+        ingredient = data["latest_revision"]["ingredient_groups"][0]["ingredients"][0]
+        assert ingredient["unit"]["id"] == units[0].id
+
+        result = await db_session.execute(
+            select(RecipeRevision.serialized).where(RecipeRevision.id == revision_id)
+        )
+        snapshot = json.loads(result.scalar_one())
+        assert snapshot == data["latest_revision"]
+
+    @pytest.mark.anyio
+    async def test_get_recipe_translations(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        db_session: AsyncSession,
+        sample_recipe_data: dict,
+    ):
+        """Should include the original recipe and translations"""
+        sample_recipe_data["language"] = "de"
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        translated_id = response.json()["id"]
+        result = await db_session.execute(select(Recipe).where(Recipe.id == translated_id))
+        result.scalar_one().original_recipe_id = test_recipe.id
+        await db_session.flush()
+
+        response = await client.get(f"{settings.API_V1_STR}/recipes/{test_recipe.id}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["original_recipe"] is None
+        assert [t["id"] for t in data["translations"]] == [translated_id]
+
+        response = await client.get(f"{settings.API_V1_STR}/recipes/{translated_id}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["original_recipe"]["id"] == test_recipe.id
+        assert data["original_recipe"]["language"] == "en"
+        assert data["translations"] == []
+
 
 class TestGetRecipeVersions:
     """Integration tests for GET /recipes/{recipe_id}/versions"""
@@ -1018,15 +1201,17 @@ class TestGetRecipeVersions:
         override_current_user: User,
         test_recipe: Recipe,
     ):
-        """Should return recipe with all versions from database"""
+        """Should list the revision headers of the recipe"""
         response = await client.get(
             f"{settings.API_V1_STR}/recipes/{test_recipe.id}/versions"
         )
 
         assert response.status_code == 200
         data = response.json()
-        assert "revisions" in data
-        assert len(data["revisions"]) >= 1
+        assert len(data["results"]) == 1
+        assert data["results"][0]["id"] == test_recipe.latest_revision_id
+        assert data["results"][0]["title"] == "Test Recipe"
+        assert "ingredient_groups" not in data["results"][0]
 
     @pytest.mark.anyio
     async def test_get_recipe_versions_multiple(
@@ -1040,12 +1225,14 @@ class TestGetRecipeVersions:
         """Should return all revisions after multiple updates"""
         # Create first update
         sample_recipe_data["content"]["title"] = "Version 2"
+        sample_recipe_data["change_summary"] = "Renamed"
         await client.put(
             f"{settings.API_V1_STR}/recipes/{test_recipe.id}", json=sample_recipe_data
         )
 
         # Create second update
         sample_recipe_data["content"]["title"] = "Version 3"
+        sample_recipe_data["change_summary"] = None
         await client.put(
             f"{settings.API_V1_STR}/recipes/{test_recipe.id}", json=sample_recipe_data
         )
@@ -1056,7 +1243,16 @@ class TestGetRecipeVersions:
 
         assert response.status_code == 200
         data = response.json()
-        assert len(data["revisions"]) == 3
+        assert [r["title"] for r in data["results"]] == [
+            "Version 3",
+            "Version 2",
+            "Test Recipe",
+        ]
+        assert [r["change_summary"] for r in data["results"]] == [
+            None,
+            "Renamed",
+            None,
+        ]
 
         # Verify in database
         result = await db_session.execute(
@@ -1079,6 +1275,370 @@ class TestGetRecipeVersions:
 
         assert response.status_code == 404
 
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes/{private_recipe.id}/versions/"
+            f"{private_recipe.latest_revision_id}"
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.anyio
+    async def test_get_recipe_versions_paginated(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sample_recipe_data: dict,
+    ):
+        """Should page through the history with cursors"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+        for i in range(4):
+            sample_recipe_data["content"]["title"] = f"Version {i + 2}"
+            await client.put(recipe_url, json=sample_recipe_data)
+
+        titles = []
+        params = {"page_size": 2}
+        while True:
+            response = await client.get(f"{recipe_url}/versions", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            titles += [r["title"] for r in data["results"]]
+            if data["pagination"]["next_cursor"] is None:
+                break
+            params["cursor"] = data["pagination"]["next_cursor"]
+
+        assert titles == [f"Version {i}" for i in range(5, 1, -1)] + ["Test Recipe"]
+
+    @pytest.mark.anyio
+    async def test_get_recipe_version(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        private_recipe: Recipe,
+        sample_recipe_data: dict,
+    ):
+        """Should return the full body of one revision"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+        first_revision_id = test_recipe.latest_revision_id
+        sample_recipe_data["content"]["title"] = "Version 2"
+        await client.put(recipe_url, json=sample_recipe_data)
+
+        # served twice: backfilling the snapshot, then from it
+        for _ in range(2):
+            response = await client.get(f"{recipe_url}/versions/{first_revision_id}")
+            assert response.status_code == 200
+            data = response.json()
+            assert data["title"] == "Test Recipe"
+            assert len(data["ingredient_groups"]) == 1
+            assert len(data["instruction_groups"]) == 1
+
+        # revision of another recipe
+        response = await client.get(
+            f"{recipe_url}/versions/{private_recipe.latest_revision_id}"
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.anyio
+    async def test_get_recipe_version_compressed_cached(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sql_statements: list[str],
+    ):
+        """Should keep the encoded snapshot and only check access on later reads"""
+        url = (
+            f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+            f"/versions/{test_recipe.latest_revision_id}"
+        )
+        headers = {"Accept-Encoding": "gzip"}
+        first = await client.get(url, headers=headers)
+        sql_statements.clear()
+        second = await client.get(url, headers=headers)
+
+        assert second.json() == first.json()
+        assert second.headers.get("content-encoding") == first.headers.get(
+            "content-encoding"
+        )
+        assert len(sql_statements) == 1
+        assert "serialized" not in sql_statements[0]
+        assert get_cached_snapshot(test_recipe.latest_revision_id, "gzip") is not None
+
+        response = await client.get(
+            url.replace(f"/{test_recipe.id}/", "/0/"), headers=headers
+        )
+        assert response.status_code == 404
+
+
+class TestRevisionGroupSharing:
+    """Integration tests for content-addressed ingredient/instruction groups"""
+
+    async def _group_ids(self, db_session: AsyncSession, revision_id: int):
+        ingredient = await db_session.scalars(
+            select(RevisionIngredientGroup.group_id)
+            .where(RevisionIngredientGroup.recipe_revision_id == revision_id)
+            .order_by(RevisionIngredientGroup.position)
+        )
+        instruction = await db_session.scalars(
+            select(RevisionInstructionGroup.group_id)
+            .where(RevisionInstructionGroup.recipe_revision_id == revision_id)
+            .order_by(RevisionInstructionGroup.position)
+        )
+        return list(ingredient), list(instruction)
+
+    async def _count(self, db_session: AsyncSession, model) -> int:
+        return await db_session.scalar(select(func.count()).select_from(model))
+
+    @pytest.mark.anyio
+    async def test_unchanged_groups_are_shared(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+    ):
+        """Should only store the groups that changed"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        recipe_url = f"{settings.API_V1_STR}/recipes/{response.json()['id']}"
+        ingredients = await self._count(db_session, Ingredient)
+
+        sample_recipe_data["content"]["title"] = "Renamed"
+        await client.put(recipe_url, json=sample_recipe_data)
+        assert await self._count(db_session, Ingredient) == ingredients
+
+        groups = sample_recipe_data["content"]["ingredient_groups"]
+        groups[1]["ingredients"][0]["amount_min"] = 250.0
+        groups.reverse()
+        await client.put(recipe_url, json=sample_recipe_data)
+        assert await self._count(db_session, Ingredient) == ingredients + 1
+
+        response = await client.get(f"{recipe_url}/versions")
+        third, second, first = [r["id"] for r in response.json()["results"]]
+        first_groups = await self._group_ids(db_session, first)
+        assert await self._group_ids(db_session, second) == first_groups
+        ingredient_ids, instruction_ids = await self._group_ids(db_session, third)
+        assert ingredient_ids[1] == first_groups[0][0]
+        assert ingredient_ids[0] not in first_groups[0]
+        assert instruction_ids == first_groups[1]
+
+        # every revision still reads back as it was written
+        await db_session.execute(
+            update(RecipeRevision)
+            .where(RecipeRevision.id.in_([first, third]))
+            .values(serialized=None)
+        )
+        response = await client.get(f"{recipe_url}/versions/{first}")
+        data = response.json()
+        assert data["ingredient_groups"][0]["name"] == "Dry Ingredients"
+        assert data["ingredient_groups"][1]["ingredients"][0]["amount_min"] == 200.0
+        response = await client.get(f"{recipe_url}/versions/{third}")
+        data = response.json()
+        assert data["ingredient_groups"][0]["name"] == "Wet Ingredients"
+        assert data["ingredient_groups"][0]["ingredients"][0]["amount_min"] == 250.0
+
+    @pytest.mark.anyio
+    async def test_sharing_disabled(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Should copy all groups into each revision"""
+        monkeypatch.setattr(settings, "REVISION_SHARE_GROUPS", False)
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        ingredients = await self._count(db_session, Ingredient)
+
+        sample_recipe_data["content"]["title"] = "Updated Recipe Title"
+        await client.put(
+            f"{settings.API_V1_STR}/recipes/{response.json()['id']}",
+            json=sample_recipe_data,
+        )
+
+        assert await self._count(db_session, Ingredient) == ingredients + 3
+
+    @pytest.mark.anyio
+    async def test_delete_keeps_groups_of_other_recipes(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+    ):
+        """Should delete the groups only the deleted recipe used"""
+        url = f"{settings.API_V1_STR}/recipes"
+        first = (await client.post(url, json=sample_recipe_data)).json()["id"]
+        sample_recipe_data["content"]["instruction_groups"][0]["instructions"] = "Mix."
+        second = (await client.post(url, json=sample_recipe_data)).json()["id"]
+        instruction_groups = await self._count(db_session, InstructionGroup)
+
+        response = await client.delete(f"{url}/{second}")
+        assert response.status_code == 204
+
+        assert await self._count(db_session, InstructionGroup) == instruction_groups - 1
+        response = await client.get(f"{url}/{first}")
+        assert len(response.json()["latest_revision"]["ingredient_groups"]) == 2
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("writer_kind", ["revision", "bulk"])
+    async def test_reused_groups_are_not_deleted_as_orphans(self, writer_kind: str):
+        """Should make orphan deletion wait for a writer reusing the group"""
+        content = InstructionGroupIO(name=None, instructions="Stir the reused group.")
+        content_hash = instruction_group_hash(content)
+        try:
+            async with AsyncSession(engine) as setup:
+                group = InstructionGroup(
+                    name=None, instructions=content.instructions, content_hash=content_hash
+                )
+                setup.add(group)
+                await setup.flush()
+                group_id = group.id
+                await setup.commit()
+
+            async with AsyncSession(engine) as writer, AsyncSession(engine) as deleter:
+                if writer_kind == "revision":
+                    stored = await _existing_groups(
+                        writer, InstructionGroup, {content_hash}
+                    )
+                    assert stored[content_hash].id == group_id
+                else:
+                    ids, new = await _insert_groups(
+                        writer,
+                        InstructionGroup,
+                        [[content]],
+                        instruction_group_hash,
+                        lambda group, content_hash: {},
+                    )
+                    assert (ids, new) == ([[group_id]], [])
+
+                deleting = asyncio.create_task(
+                    delete_orphan_groups(deleter, set(), {group_id})
+                )
+                done, _ = await asyncio.wait([deleting], timeout=0.5)
+                assert not done  # blocked by the writer's lock
+
+                await writer.rollback()
+                assert await deleting == (0, 1)
+                await deleter.commit()
+        finally:
+            async with AsyncSession(engine) as cleanup:
+                await cleanup.execute(
+                    delete(InstructionGroup).where(
+                        InstructionGroup.content_hash == content_hash
+                    )
+                )
+                await cleanup.commit()
+
+
+class TestRevisionRetention:
+    """The revision retention policy applied by scripts/compact_revisions.py"""
+
+    NOW = datetime(2026, 10, 18, 12, tzinfo=UTC)
+
+    async def _revisions(self, client: AsyncClient, recipe_url: str) -> list[int]:
+        response = await client.get(f"{recipe_url}/versions")
+        return [r["id"] for r in response.json()["results"]]
+
+    @pytest.mark.anyio
+    async def test_compact_revisions(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+    ):
+        """Should keep the newest revisions and one per day, drop the rest"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        recipe_id = response.json()["id"]
+        recipe_url = f"{settings.API_V1_STR}/recipes/{recipe_id}"
+        # only the first revision has this version of the dry ingredients
+        sample_recipe_data["content"]["ingredient_groups"][0]["ingredients"][0][
+            "amount_min"
+        ] = 3.0
+        for i in range(5):
+            sample_recipe_data["content"]["title"] = f"Edit {i}"
+            await client.put(recipe_url, json=sample_recipe_data)
+        r5, r4, r3, r2, r1, r0 = await self._revisions(client, recipe_url)
+
+        for revision_id, age in [
+            (r5, timedelta()),
+            (r4, timedelta(hours=1)),
+            (r3, timedelta(days=3)),
+            (r2, timedelta(days=3, hours=1)),
+            (r1, timedelta(days=100)),
+            (r0, timedelta(days=101)),
+        ]:
+            await db_session.execute(
+                update(RecipeRevision)
+                .where(RecipeRevision.id == revision_id)
+                .values(created_at=self.NOW - age)
+            )
+        policy = dict(keep_last=2, keep_daily_days=7, keep_weekly_weeks=0, now=self.NOW)
+
+        reclaimed = await compact_revisions(
+            db_session, [recipe_id], dry_run=True, **policy
+        )
+        assert reclaimed["recipe_revisions"] == 3
+        assert await self._revisions(client, recipe_url) == [r5, r4, r3, r2, r1, r0]
+
+        reclaimed = await compact_revisions(db_session, [recipe_id], **policy)
+
+        assert await self._revisions(client, recipe_url) == [r5, r4, r3]
+        assert reclaimed["recipe_revisions"] == 3
+        assert reclaimed["recipe_revision_ingredient_groups"] == 6
+        assert reclaimed["recipe_categories_association"] == 6
+        # the dry ingredients of r0
+        assert reclaimed["ingredient_groups"] == 1
+        assert reclaimed["ingredients"] == 2
+        assert reclaimed["instruction_groups"] == 0
+        response = await client.get(f"{recipe_url}/versions/{r3}")
+        assert response.json()["title"] == "Edit 2"
+
+    @pytest.mark.anyio
+    async def test_latest_revision_is_kept(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+    ):
+        """Should never delete a recipe's latest revision"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        recipe_id = response.json()["id"]
+        recipe_url = f"{settings.API_V1_STR}/recipes/{recipe_id}"
+        sample_recipe_data["content"]["title"] = "Renamed"
+        await client.put(recipe_url, json=sample_recipe_data)
+        latest, _ = await self._revisions(client, recipe_url)
+        await db_session.execute(
+            update(RecipeRevision)
+            .where(RecipeRevision.recipe_id == recipe_id)
+            .values(created_at=self.NOW - timedelta(days=1000))
+        )
+
+        reclaimed = await compact_revisions(
+            db_session,
+            [recipe_id],
+            keep_last=0,
+            keep_daily_days=0,
+            keep_weekly_weeks=0,
+            now=self.NOW,
+        )
+
+        assert reclaimed["recipe_revisions"] == 1
+        assert await self._revisions(client, recipe_url) == [latest]
+        response = await client.get(recipe_url)
+        assert response.json()["latest_revision"]["title"] == "Renamed"
+
 
 class TestMultiUserScenarios:
     """Integration tests for multi-user interactions"""
@@ -1133,33 +1693,1242 @@ class TestMultiUserScenarios:
         assert recipe2.owner_id == other_user.id
 
 
-class TestGetRecipesQueryParams:
-    """Test various query params for sorting/filtering"""
+class TestFavorites:
+    """Integration tests for the favorites endpoints"""
 
     @pytest.mark.anyio
-    async def test_query(
+    async def test_add_and_remove_favorite(
         self,
         client: AsyncClient,
         override_current_user: User,
+        test_recipe: Recipe,
         sample_recipe_data: dict,
+    ):
+        """Should be idempotent and reflected on reads and updates"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+
+        for _ in range(2):
+            response = await client.post(f"{recipe_url}/favorites")
+            assert response.status_code == 200
+            assert response.json()["is_favorited"] is True
+
+        response = await client.get(recipe_url)
+        assert response.json()["is_favorited"] is True
+        response = await client.put(recipe_url, json=sample_recipe_data)
+        assert response.json()["is_favorited"] is True
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes", params={"format": "ndjson"}
+        )
+        assert json.loads(response.text.splitlines()[0])["is_favorited"] is True
+
+        for _ in range(2):
+            response = await client.delete(f"{recipe_url}/favorites")
+            assert response.status_code == 200
+            assert response.json()["is_favorited"] is False
+
+        response = await client.get(recipe_url)
+        assert response.json()["is_favorited"] is False
+
+    @pytest.mark.anyio
+    async def test_list_favorites(
+        self,
+        client: AsyncClient,
         db_session: AsyncSession,
+        override_current_user: User,
+        test_user: User,
+        private_recipe: Recipe,
+        sample_recipe_data: dict,
     ):
-        """Should create a new recipe in the database"""
-        sample_recipe_data["content"]["title"] = "111"
-        response = await client.post(
-            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        """Should page through visible favorites, most recently updated first"""
+        ids = []
+        for title in ["aaa", "bbb", "ccc", "ddd"]:
+            sample_recipe_data["content"]["title"] = title
+            response = await client.post(
+                f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+            )
+            ids.append(response.json()["id"])
+        for recipe_id in ids[:3]:
+            await client.post(f"{settings.API_V1_STR}/recipes/{recipe_id}/favorites")
+        # favorited earlier, then made private by its owner
+        await db_session.execute(
+            insert(user_favorite_recipes).values(
+                user_id=test_user.id, recipe_id=private_recipe.id
+            )
         )
 
-        assert response.status_code == 201
+        url = f"{settings.API_V1_STR}/recipes/favorites"
+        response = await client.get(url, params={"page_size": 2})
+        assert response.status_code == 200
         data = response.json()
-        ts1_upat = data["updated_at"]
-        ts1_crat = data["created_at"]
+        assert [r["id"] for r in data["results"]] == [ids[2], ids[1]]
+        assert all(r["is_favorited"] for r in data["results"])
+        assert data["pagination"]["current_page"] is None
 
-        await asyncio.sleep(1)
-        # create a second recipe
-        sample_recipe_data["content"]["title"] = "222"
-        response = await client.post(
-            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        response = await client.get(
+            url, params={"page_size": 2, "cursor": data["pagination"]["next_cursor"]}
+        )
+        data = response.json()
+        assert [r["id"] for r in data["results"]] == [ids[0]]
+        assert data["pagination"]["next_cursor"] is None
+
+        response = await client.get(url, params={"include": "ingredients"})
+        (first, *_) = response.json()["results"]
+        assert "ingredient_groups" in first["latest_revision"]
+        assert "instruction_groups" not in first["latest_revision"]
+
+
+    @pytest.mark.anyio
+    async def test_favorite_count(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        other_user: User,
+        test_recipe: Recipe,
+        sample_recipe_data: dict,
+    ):
+        """Should count each user once and sort by popularity"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+
+        async def _get_test_user():
+            return test_user
+
+        app.dependency_overrides[get_current_user] = _get_test_user
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        unpopular_id = response.json()["id"]
+
+        for user in [test_user, test_user, other_user]:
+
+            async def _get_user(user=user):
+                return user
+
+            app.dependency_overrides[get_current_user] = _get_user
+            response = await client.post(f"{recipe_url}/favorites")
+        assert response.json()["favorite_count"] == 2
+        updated_at = response.json()["updated_at"]
+
+        response = await client.delete(f"{recipe_url}/favorites")
+        response = await client.delete(f"{recipe_url}/favorites")
+        assert response.json()["favorite_count"] == 1
+        # not an edit of the recipe
+        assert response.json()["updated_at"] == updated_at
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes",
+            params={"sort_by": "favorite_count", "order": "desc", "mode": "cursor"},
+        )
+        assert [r["id"] for r in response.json()["results"]][:2] == [
+            test_recipe.id,
+            unpopular_id,
+        ]
+        assert response.json()["results"][0]["favorite_count"] == 1
+
+    @pytest.mark.anyio
+    async def test_recount_after_user_deletion(
+        self,
+        client: AsyncClient,
+        override_current_user_other: User,
+        test_recipe: Recipe,
+        db_session: AsyncSession,
+    ):
+        """Should repair the counter after favorites cascade with their user"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+        response = await client.post(f"{recipe_url}/favorites")
+        assert response.json()["favorite_count"] == 1
+
+        await db_session.execute(
+            delete(User).where(User.id == override_current_user_other.id)
+        )
+        assert await recount_favorites(db_session, [test_recipe.id]) == [
+            test_recipe.id
+        ]
+        assert await recount_favorites(db_session, [test_recipe.id]) == []
+        count = await db_session.scalar(
+            select(Recipe.favorite_count).where(Recipe.id == test_recipe.id)
+        )
+        assert count == 0
+
+    @pytest.mark.anyio
+    async def test_search_favorite_count(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        monkeypatch,
+    ):
+        """Should report the favorites of search hits from the database"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+        await client.post(f"{recipe_url}/favorites")
+        recipe = (await client.get(recipe_url)).json()
+        revision = recipe["latest_revision"]
+        # the document as indexed, it has no favorite_count
+        recipe_keys = "id owner_id language created_at updated_at is_private is_draft"
+        revision_keys = "title subtitle owner_comment prep_time cook_time servings difficulty"
+        hit = {
+            **{key: recipe[key] for key in recipe_keys.split()},
+            **{key: revision[key] for key in revision_keys.split()},
+            "categories": [],
+            "translations": [],
+        }
+
+        async def _search_recipes(**kwargs):
+            return {"hits": [hit], "estimatedTotalHits": 1}
+
+        monkeypatch.setattr(
+            get_meilisearch_service(), "search_recipes", _search_recipes
+        )
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes/search", params={"q": "test", "page": 1}
+        )
+
+        assert response.status_code == 200
+        (result,) = response.json()["results"]
+        assert result["favorite_count"] == 1
+        assert result["is_favorited"] is True
+
+    @pytest.mark.anyio
+    async def test_get_recipe_queries_independent_of_favorites(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sql_statements: list[str],
+    ):
+        """Should not load the users who favorited a recipe"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+        urls = [recipe_url, f"{recipe_url}/versions"]
+        # stores the revision snapshot
+        await client.get(recipe_url)
+
+        async def _count_statements() -> list[int]:
+            counts = []
+            for url in urls:
+                recipe_cache.clear()
+                sql_statements.clear()
+                response = await client.get(url)
+                assert response.status_code == 200
+                counts.append(len(sql_statements))
+            return counts
+
+        baseline = await _count_statements()
+
+        for i in range(20):
+            user = User(
+                email=f"fan{i}@example.com",
+                username=f"fan{i}@example.com",
+                hashed_password="$2b$12$fakehashfortest",
+            )
+            db_session.add(user)
+            await db_session.flush()
+            await db_session.execute(
+                insert(user_favorite_recipes).values(
+                    user_id=user.id, recipe_id=test_recipe.id
+                )
+            )
+
+        assert await _count_statements() == baseline
+        # with the rows fetched per statement not growing either
+        assert not any("users.hashed_password" in s for s in sql_statements)
+
+
+class TestGetRecipesBatch:
+    """Integration tests for POST /recipes/batch"""
+
+    @pytest.mark.anyio
+    async def test_batch_in_requested_order(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        private_recipe: Recipe,
+        sample_recipe_data: dict,
+        sql_statements: list[str],
+    ):
+        """Should return visible recipes in the requested order"""
+        recipe_cache.clear()
+        ids = []
+        for title in ["aaa", "bbb", "ccc"]:
+            sample_recipe_data["content"]["title"] = title
+            response = await client.post(
+                f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+            )
+            ids.append(response.json()["id"])
+        await client.post(f"{settings.API_V1_STR}/recipes/{ids[1]}/favorites")
+
+        requested = [ids[2], private_recipe.id, test_recipe.id, ids[0], 99999, ids[1]]
+        sql_statements.clear()
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/batch", json={"ids": requested}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["id"] for r in data] == [ids[2], test_recipe.id, ids[0], ids[1]]
+        assert [r["is_favorited"] for r in data] == [False, False, False, True]
+        assert data[1]["latest_revision"]["title"] == "Test Recipe"
+        # the round trips don't depend on the number of recipes
+        statements = len(sql_statements)
+
+        sql_statements.clear()
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/batch", json={"ids": [ids[0]]}
+        )
+        assert len(sql_statements) <= statements
+
+    @pytest.mark.anyio
+    async def test_batch_include(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+    ):
+        """Should support sparse reads"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/batch",
+            params={"include": "instructions"},
+            json={"ids": [test_recipe.id]},
+        )
+
+        assert response.status_code == 200
+        (recipe,) = response.json()
+        assert "instruction_groups" in recipe["latest_revision"]
+        assert "ingredient_groups" not in recipe["latest_revision"]
+
+    @pytest.mark.anyio
+    async def test_batch_limits(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+    ):
+        """Should reject empty and oversized batches"""
+        url = f"{settings.API_V1_STR}/recipes/batch"
+        response = await client.post(url, json={"ids": []})
+        assert response.status_code == 422
+        response = await client.post(url, json={"ids": list(range(1, 102))})
+        assert response.status_code == 422
+
+
+class TestBulkCreateRecipes:
+    """Integration tests for POST /recipes/bulk"""
+
+    @pytest.mark.anyio
+    async def test_bulk_create(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Should create the valid recipes and report the invalid ones"""
+        indexed = []
+
+        async def _index_recipes_bulk(recipes):
+            indexed.append([recipe.id for recipe in recipes])
+
+        monkeypatch.setattr(
+            get_meilisearch_service(), "index_recipes_bulk", _index_recipes_bulk
+        )
+        invalid = json.loads(json.dumps(sample_recipe_data))
+        invalid["content"]["ingredient_groups"] = []
+        unknown_category = json.loads(json.dumps(sample_recipe_data))
+        unknown_category["content"]["categories"] = [99999]
+        second = json.loads(json.dumps(sample_recipe_data))
+        second["content"]["title"] = "Second"
+
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/bulk",
+            json={"recipes": [sample_recipe_data, invalid, unknown_category, second]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["created"], data["failed"]) == (2, 2)
+        results = data["results"]
+        assert [r["index"] for r in results] == [0, 1, 2, 3]
+        assert results[1]["id"] is None
+        assert results[1]["errors"][0]["loc"] == ["content", "ingredient_groups"]
+        assert results[2]["id"] is None
+        assert results[2]["errors"][0]["msg"] == "One or more category IDs do not exist"
+        ids = [results[0]["id"], results[3]["id"]]
+        assert indexed == [ids]
+
+        # reads back like a recipe created on its own
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        single = response.json()
+        response = await client.get(f"{settings.API_V1_STR}/recipes/{ids[0]}")
+        bulk = response.json()
+        ignored = {"id", "created_at", "updated_at", "latest_revision"}
+        assert {k: v for k, v in bulk.items() if k not in ignored} == {
+            k: v for k, v in single.items() if k not in ignored
+        }
+        for recipe in (bulk, single):
+            recipe["latest_revision"].pop("created_at")
+            recipe["latest_revision"]["categories"].sort(key=lambda c: c["id"])
+        assert bulk["latest_revision"] == single["latest_revision"]
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes/{ids[1]}/versions"
+        )
+        (revision,) = response.json()["results"]
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes/{ids[1]}/versions/{revision['id']}"
+        )
+        assert response.json()["title"] == "Second"
+        assert response.json()["ingredient_groups"][1]["ingredients"][0]["food"] == (
+            "Butter"
+        )
+
+    @pytest.mark.anyio
+    async def test_bulk_create_shares_groups(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+        sql_statements: list[str],
+    ):
+        """Should store identical groups once, with a fixed number of statements"""
+
+        async def _bulk(n: int) -> list[int]:
+            sql_statements.clear()
+            response = await client.post(
+                f"{settings.API_V1_STR}/recipes/bulk",
+                json={"recipes": [sample_recipe_data] * n},
+            )
+            assert response.json()["created"] == n
+            return [r["id"] for r in response.json()["results"]]
+
+        ids = await _bulk(1)
+        ingredients = await db_session.scalar(
+            select(func.count()).select_from(Ingredient)
+        )
+
+        ids += await _bulk(1)
+        statements = len(sql_statements)
+        ids += await _bulk(10)
+
+        assert len(sql_statements) == statements
+        assert (
+            await db_session.scalar(select(func.count()).select_from(Ingredient))
+            == ingredients
+        )
+        group_ids = await db_session.scalars(
+            select(RevisionIngredientGroup.group_id)
+            .join(
+                RecipeRevision,
+                RecipeRevision.id == RevisionIngredientGroup.recipe_revision_id,
+            )
+            .where(RecipeRevision.recipe_id.in_(ids))
+        )
+        assert len(set(group_ids)) == 2
+        latest = await db_session.scalars(
+            select(Recipe.latest_revision_id).where(Recipe.id.in_(ids))
+        )
+        assert None not in list(latest)
+
+    @pytest.mark.anyio
+    async def test_bulk_create_limits(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should reject empty and oversized requests"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/bulk", json={"recipes": []}
+        )
+        assert response.status_code == 422
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/bulk",
+            json={"recipes": [sample_recipe_data] * (MAX_BULK_SIZE + 1)},
+        )
+        assert response.status_code == 422
+
+
+class TestReferenceData:
+    """Units and categories served from the in-memory registry"""
+
+    @staticmethod
+    def _reference_queries(statements: list[str]) -> list[str]:
+        return [
+            s
+            for s in statements
+            if "FROM units" in s or "FROM recipe_categories\n" in s + "\n"
+        ]
+
+    @pytest.mark.anyio
+    async def test_no_queries_for_units_and_categories(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        sql_statements: list[str],
+    ):
+        """Should validate writes and attach units to reads from memory"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        recipe_id = response.json()["id"]
+
+        sql_statements.clear()
+        sample_recipe_data["content"]["ingredient_groups"][0]["ingredients"][0][
+            "amount_min"
+        ] = 3.0
+        response = await client.put(
+            f"{settings.API_V1_STR}/recipes/{recipe_id}", json=sample_recipe_data
+        )
+        assert response.status_code == 201
+        recipe_cache.clear()
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/batch", json={"ids": [recipe_id]}
+        )
+        data = response.json()[0]["latest_revision"]
+
+        assert self._reference_queries(sql_statements) == []
+        assert data["ingredient_groups"][0]["ingredients"][0]["unit"]["name"] == "cup"
+        assert [c["name"] for c in data["categories"]] == ["Dessert", "Main Course"]
+
+    @pytest.mark.anyio
+    async def test_new_units_are_picked_up(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+        sql_statements: list[str],
+    ):
+        """Should reload when a write refers to a unit it doesn't know yet"""
+        await client.post(f"{settings.API_V1_STR}/recipes", json=sample_recipe_data)
+        version = reference_data.version
+        unit = Unit(
+            name="pinch",
+            base_unit=None,
+            conversion_factor=None,
+            unit_system=UnitSystem.DIMENSIONLESS,
+        )
+        db_session.add(unit)
+        await db_session.flush()
+
+        sample_recipe_data["content"]["ingredient_groups"][0]["ingredients"][0][
+            "unit_id"
+        ] = unit.id
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+
+        assert response.status_code == 201
+        ingredient = response.json()["latest_revision"]["ingredient_groups"][0][
+            "ingredients"
+        ][0]
+        assert ingredient["unit"]["name"] == "pinch"
+        assert reference_data.version != version
+
+        # ids that don't exist are looked up, but don't reload the registry
+        version = reference_data.version
+        sample_recipe_data["content"]["ingredient_groups"][0]["ingredients"][0][
+            "unit_id"
+        ] = 999999
+        sql_statements.clear()
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        assert response.status_code == 422
+        assert len(self._reference_queries(sql_statements)) == 1
+        assert reference_data.version == version
+
+    @pytest.mark.anyio
+    async def test_refreshed_in_background(
+        self, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Should pick up new units without any request asking for them"""
+        await reference_data.load(db_session)
+        version = reference_data.version
+        db_session.add(
+            Unit(
+                name="pinch",
+                base_unit=None,
+                conversion_factor=None,
+                unit_system=UnitSystem.DIMENSIONLESS,
+            )
+        )
+        await db_session.flush()
+
+        monkeypatch.setattr(reference_data, "ttl", 0)
+        refresh = asyncio.create_task(
+            reference_data.refresh_periodically(lambda: nullcontext(db_session))
+        )
+        try:
+            async with asyncio.timeout(5):
+                while reference_data.version == version:
+                    await asyncio.sleep(0)
+        finally:
+            refresh.cancel()
+
+        assert "pinch" in [unit.name for unit in reference_data.units.values()]
+
+
+class TestMultilingual:
+    """GET /recipes/multilingual, served from memory"""
+
+    url = f"{settings.API_V1_STR}/recipes/multilingual"
+
+    @pytest.mark.anyio
+    async def test_get_multilingual(
+        self, client: AsyncClient, sql_statements: list[str]
+    ):
+        """Should return all languages, or one, without touching the database"""
+        with open(MULTILINGUAL_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+
+        response = await client.get(self.url)
+        assert response.status_code == 200
+        assert response.json() == data
+        assert response.headers["cache-control"] == "public, max-age=86400"
+
+        response = await client.get(self.url, params={"lang": "de"})
+        assert response.status_code == 200
+        assert response.json() == data["de"]
+
+        response = await client.get(self.url, params={"lang": "xx"})
+        assert response.status_code == 404
+        assert sql_statements == []
+
+    @pytest.mark.anyio
+    async def test_gzip_and_etag(self, client: AsyncClient):
+        """Should send the gzipped body if accepted and answer 304 on a match"""
+        response = await client.get(
+            self.url, params={"lang": "en"}, headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        etag = response.headers["etag"]
+
+        plain = await client.get(
+            self.url, params={"lang": "en"}, headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in plain.headers
+        # the same entity, but different bytes: only weakly equal
+        assert etag == f"W/{plain.headers['etag']}"
+        assert plain.json() == response.json()
+
+        response = await client.get(
+            self.url, params={"lang": "en"}, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        response = await client.get(
+            self.url, params={"lang": "de"}, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+
+class TestReferenceDataBundle:
+    """GET /reference-data"""
+
+    url = f"{settings.API_V1_STR}/reference-data"
+
+    @pytest.mark.anyio
+    async def test_get_bundle(
+        self,
+        client: AsyncClient,
+        categories: list[RecipeCategories],
+        units: list[Unit],
+        db_session: AsyncSession,
+        sql_statements: list[str],
+    ):
+        """Should return units, categories, strings and languages from memory"""
+        await reference_data.load(db_session)
+        sql_statements.clear()
+
+        response = await client.get(self.url)
+
+        assert response.status_code == 200
+        assert sql_statements == []
+        data = response.json()
+        cup = next(unit for unit in data["units"] if unit["id"] == units[0].id)
+        assert cup == {
+            "id": units[0].id,
+            "name": units[0].name,
+            "base_unit": units[0].base_unit,
+            "unit_system": units[0].unit_system,
+            "conversion_factor": units[0].conversion_factor,
+        }
+        assert {category.id for category in categories} <= {
+            category["id"] for category in data["categories"]
+        }
+        assert data["languages"]["de"] == "German"
+        assert data["multilingual"].keys() == {"en", "de", "cs"}
+        assert response.headers["etag"].removeprefix("W/") == f'"{data["version"]}"'
+
+    @pytest.mark.anyio
+    async def test_cached_version(self, client: AsyncClient, db_session: AsyncSession):
+        """Should answer 304 for the current version, the bundle after a change"""
+        await reference_data.load(db_session)
+        version = (await client.get(self.url)).json()["version"]
+
+        response = await client.get(self.url, params={"version": version})
+        assert response.status_code == 304
+        response = await client.get(self.url, headers={"If-None-Match": f'"{version}"'})
+        assert response.status_code == 304
+
+        db_session.add(
+            Unit(
+                name="pinch",
+                base_unit=None,
+                conversion_factor=None,
+                unit_system=UnitSystem.DIMENSIONLESS,
+            )
+        )
+        await db_session.flush()
+        await reference_data.load(db_session)
+
+        response = await client.get(self.url, params={"version": version})
+        assert response.status_code == 200
+        assert response.json()["version"] != version
+        assert "pinch" in [unit["name"] for unit in response.json()["units"]]
+
+
+class TestConditionalRequests:
+    """ETag / If-None-Match handling of recipe reads"""
+
+    @pytest.mark.anyio
+    async def test_get_recipe_not_modified(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        sql_statements: list[str],
+    ):
+        """Should answer 304 from the header query until the recipe changes"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        recipe_url = f"{settings.API_V1_STR}/recipes/{response.json()['id']}"
+
+        response = await client.get(recipe_url)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        sql_statements.clear()
+        response = await client.get(recipe_url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+        assert len(sql_statements) == 1
+
+        # favorite state is part of the tag
+        response = await client.post(f"{recipe_url}/favorites")
+        assert response.status_code == 200
+        response = await client.get(recipe_url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["is_favorited"] is True
+        etag = response.headers["etag"]
+
+        # and so is the revision
+        sample_recipe_data["content"]["title"] = "Updated"
+        response = await client.put(recipe_url, json=sample_recipe_data)
+        assert response.status_code == 201
+        response = await client.get(
+            recipe_url, headers={"If-None-Match": f'"other", W/{etag}'}
+        )
+        assert response.status_code == 200
+        assert response.json()["latest_revision"]["title"] == "Updated"
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.anyio
+    async def test_get_recipes_not_modified(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sample_recipe_data: dict,
+    ):
+        """Should answer 304 for unchanged list pages"""
+        url = f"{settings.API_V1_STR}/recipes"
+        response = await client.get(url)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        # a different page has a different tag
+        response = await client.get(
+            url, params={"page_size": 1}, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+        response = await client.post(url, json=sample_recipe_data)
+        assert response.status_code == 201
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["pagination"]["total"] == 2
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.anyio
+    async def test_get_recipes_cursor_not_modified(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sample_recipe_data: dict,
+        sql_statements: list[str],
+    ):
+        """Should tag cursor pages the same with and without If-None-Match"""
+        url = f"{settings.API_V1_STR}/recipes"
+        params = {"mode": "cursor", "include_total": False, "sort_by": "updated_at"}
+        response = await client.get(url, params=params)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        sql_statements.clear()
+        response = await client.get(
+            url, params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert len(sql_statements) == 1
+
+        response = await client.post(url, json=sample_recipe_data)
+        response = await client.get(
+            url, params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == 2
+        assert response.headers["etag"] != etag
+
+
+class TestRecipeCache:
+    """The per-process recipe cache behind GET /recipes and /recipes/{id}"""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        recipe_cache.clear()
+        recipe_cache.hits = recipe_cache.misses = recipe_cache.evictions = 0
+        yield
+        recipe_cache.clear()
+
+    @pytest.mark.anyio
+    async def test_get_recipe_cached(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        sql_statements: list[str],
+    ):
+        """Should serve repeated reads from the cache until a new revision"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        recipe_url = f"{settings.API_V1_STR}/recipes/{response.json()['id']}"
+
+        first = await client.get(recipe_url)
+        sql_statements.clear()
+        second = await client.get(recipe_url)
+
+        assert second.json() == first.json()
+        assert len(sql_statements) == 1
+        assert "recipe_revisions.serialized" not in sql_statements[0]
+        assert (recipe_cache.hits, recipe_cache.misses) == (1, 1)
+
+        sample_recipe_data["content"]["title"] = "Updated"
+        response = await client.put(recipe_url, json=sample_recipe_data)
+        response = await client.get(recipe_url)
+        assert response.json()["latest_revision"]["title"] == "Updated"
+        assert recipe_cache.misses == 2
+
+    @pytest.mark.anyio
+    async def test_encoded_body_cached(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should serialize and compress a cached recipe once per encoding"""
+        sample_recipe_data["content"]["description"] = "Stir well. " * 100
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        recipe_id = response.json()["id"]
+        recipe_url = f"{settings.API_V1_STR}/recipes/{recipe_id}"
+
+        first = await client.get(recipe_url, headers={"Accept-Encoding": "gzip"})
+        second = await client.get(recipe_url, headers={"Accept-Encoding": "gzip"})
+        plain = await client.get(recipe_url, headers={"Accept-Encoding": "identity"})
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert second.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert first.json() == second.json() == plain.json()
+        entry = recipe_cache.get(recipe_id)
+        assert set(entry.bodies) == {(False, "gzip"), (False, None)}
+
+    @pytest.mark.anyio
+    async def test_public_recipe_shared_between_users(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        other_user: User,
+        test_recipe: Recipe,
+    ):
+        """Should share one entry and overlay each user's favorite flag"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+
+        async def _get_test_user():
+            return test_user
+
+        async def _get_other_user():
+            return other_user
+
+        app.dependency_overrides[get_current_user] = _get_test_user
+        response = await client.post(f"{recipe_url}/favorites")
+        assert response.status_code == 200
+        response = await client.get(recipe_url)
+        assert response.json()["is_favorited"] is True
+
+        app.dependency_overrides[get_current_user] = _get_other_user
+        response = await client.get(recipe_url)
+        assert response.json()["is_favorited"] is False
+        assert len(recipe_cache) == 1
+        assert recipe_cache.hits == 1
+
+    @pytest.mark.anyio
+    async def test_get_recipes_cached(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sql_statements: list[str],
+    ):
+        """Should enrich list pages from the cache"""
+        url = f"{settings.API_V1_STR}/recipes"
+        first = await client.get(url)
+        sql_statements.clear()
+        second = await client.get(url)
+
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+        assert recipe_cache.hits == 1
+        # the page query selects the state of the page's recipes, nothing else
+        assert len(sql_statements) == 1
+
+    @pytest.mark.anyio
+    async def test_evicted_on_delete(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+    ):
+        """Should drop the entry of a deleted recipe"""
+        recipe_url = f"{settings.API_V1_STR}/recipes/{test_recipe.id}"
+        await client.get(recipe_url)
+        assert test_recipe.id in recipe_cache
+
+        response = await client.delete(recipe_url)
+        assert response.status_code == 204
+        assert test_recipe.id not in recipe_cache
+
+    @pytest.mark.anyio
+    async def test_stats_superuser_only(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+    ):
+        """Should hide the cache counters from regular users"""
+        response = await client.get(f"{settings.API_V1_STR}/recipes/cache/stats")
+        assert response.status_code == 403
+
+
+class TestRecipeChanges:
+    """Integration tests for GET /recipes/changes"""
+
+    @pytest.fixture(autouse=True)
+    def horizon_after_own_transaction(self, monkeypatch):
+        """
+        The tests write and read in one transaction that is rolled back, so the
+        feed's horizon never passes their writes. Move it past that transaction.
+        """
+        monkeypatch.setattr(
+            recipe_routes,
+            "_change_horizon",
+            lambda: literal_column("(pg_current_xact_id()::text)::bigint + 1"),
+        )
+
+    async def _changes(self, client: AsyncClient, **params) -> dict:
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes/changes", params=params
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    @pytest.mark.anyio
+    async def test_upserts_and_tombstones(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should report creates, updates and deletes after the watermark"""
+        initial = await self._changes(client)
+
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        assert response.status_code == 201
+        recipe_id = response.json()["id"]
+
+        data = await self._changes(client, since=initial["next_since"])
+        assert data["has_more"] is False
+        assert [(c["recipe_id"], c["op"]) for c in data["changes"]] == [
+            (recipe_id, "upsert")
+        ]
+        assert data["changes"][0]["recipe"]["latest_revision"]["title"] == (
+            "Chocolate Chip Cookies"
+        )
+
+        # nothing new since the last watermark
+        unchanged = await self._changes(client, since=data["next_since"])
+        assert unchanged["changes"] == []
+        assert unchanged["next_since"] == data["next_since"]
+
+        # an update followed by a delete collapses into a single tombstone
+        sample_recipe_data["content"]["title"] = "Updated"
+        response = await client.put(
+            f"{settings.API_V1_STR}/recipes/{recipe_id}", json=sample_recipe_data
+        )
+        assert response.status_code == 201
+        response = await client.delete(f"{settings.API_V1_STR}/recipes/{recipe_id}")
+        assert response.status_code == 204
+
+        data = await self._changes(client, since=data["next_since"])
+        assert data["changes"] == [
+            {
+                "recipe_id": recipe_id,
+                "op": "delete",
+                "changed_at": data["changes"][0]["changed_at"],
+                "recipe": None,
+            }
+        ]
+
+    @pytest.mark.anyio
+    async def test_visibility(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        other_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should hide private recipes of others and tombstone those turning private"""
+
+        async def _get_test_user():
+            return test_user
+
+        async def _get_other_user():
+            return other_user
+
+        app.dependency_overrides[get_current_user] = _get_other_user
+        initial = await self._changes(client)
+
+        app.dependency_overrides[get_current_user] = _get_test_user
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        public_id = response.json()["id"]
+        sample_recipe_data["is_private"] = True
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        private_id = response.json()["id"]
+
+        app.dependency_overrides[get_current_user] = _get_other_user
+        data = await self._changes(client, since=initial["next_since"])
+        assert [(c["recipe_id"], c["op"]) for c in data["changes"]] == [
+            (public_id, "upsert")
+        ]
+
+        app.dependency_overrides[get_current_user] = _get_test_user
+        response = await client.put(
+            f"{settings.API_V1_STR}/recipes/{public_id}", json=sample_recipe_data
+        )
+        assert response.status_code == 201
+
+        app.dependency_overrides[get_current_user] = _get_other_user
+        data = await self._changes(
+            client, since=data["next_since"], include_recipes=False
+        )
+        assert [(c["recipe_id"], c["op"]) for c in data["changes"]] == [
+            (public_id, "delete")
+        ]
+
+        # the owner still sees both as upserts
+        app.dependency_overrides[get_current_user] = _get_test_user
+        data = await self._changes(client, since=initial["next_since"])
+        assert [(c["recipe_id"], c["op"]) for c in data["changes"]] == [
+            (private_id, "upsert"),
+            (public_id, "upsert"),
+        ]
+
+    @pytest.mark.anyio
+    async def test_limit_and_invalid_watermark(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should page through changes and reject malformed watermarks"""
+        initial = await self._changes(client)
+        for title in ["aaa", "bbb"]:
+            sample_recipe_data["content"]["title"] = title
+            await client.post(f"{settings.API_V1_STR}/recipes", json=sample_recipe_data)
+
+        data = await self._changes(client, since=initial["next_since"], limit=1)
+        assert data["has_more"] is True
+        assert len(data["changes"]) == 1
+        data = await self._changes(client, since=data["next_since"], limit=1)
+        assert data["has_more"] is False
+        assert data["changes"][0]["recipe"]["latest_revision"]["title"] == "bbb"
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes/changes", params={"since": "garbage"}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_translation_changes_parent(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        monkeypatch,
+    ):
+        """Should report the parent as changed when a translation is added"""
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        parent_id = response.json()["id"]
+        initial = await self._changes(client)
+
+        async def _translate(recipe, target_language):
+            return RecipeCreateUpdate.model_validate(
+                {**sample_recipe_data, "language": target_language}
+            )
+
+        monkeypatch.setattr(recipe_routes, "translate_recipe", _translate)
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes/translate/{parent_id}",
+            params={"target_language": "de"},
+        )
+        assert response.status_code == 200
+        translation_id = response.json()["id"]
+
+        data = await self._changes(client, since=initial["next_since"])
+        changes = {c["recipe_id"]: c for c in data["changes"]}
+        assert set(changes) == {parent_id, translation_id}
+        assert [t["id"] for t in changes[parent_id]["recipe"]["translations"]] == [
+            translation_id
+        ]
+
+
+class TestRecipeChangesHorizon:
+    """The change feed against the real horizon of running transactions"""
+
+    RECIPE_IDS = (-2, -1)
+
+    async def _change(self, db: AsyncSession, recipe_id: int, owner_id) -> int:
+        result = await db.execute(
+            insert(RecipeChange)
+            .values(
+                recipe_id=recipe_id,
+                owner_id=owner_id,
+                op=RecipeChangeOp.UPSERT,
+                is_private=False,
+                was_private=False,
+            )
+            .returning(RecipeChange.txid)
+        )
+        return result.scalar_one()
+
+    @pytest.mark.anyio
+    async def test_holds_back_changes_behind_open_transaction(
+        self, client: AsyncClient
+    ):
+        """Should not hand out a later commit while an earlier writer is open"""
+        slow_id, fast_id = self.RECIPE_IDS
+        # not stored, the test's own transaction must not hold back the horizon
+        reader = User(id=uuid4(), username="reader@example.com")
+
+        async def _get_reader():
+            return reader
+
+        app.dependency_overrides[get_current_user] = _get_reader
+
+        async def _changes(since: str) -> list[int]:
+            response = await client.get(
+                f"{settings.API_V1_STR}/recipes/changes",
+                params={"since": since, "include_recipes": False},
+            )
+            assert response.status_code == 200
+            return [
+                c["recipe_id"]
+                for c in response.json()["changes"]
+                if c["recipe_id"] in self.RECIPE_IDS
+            ]
+
+        try:
+            async with AsyncSession(engine) as slow:
+                slow_txid = await self._change(slow, slow_id, reader.id)
+                since = f"{slow_txid - 1}.0"
+
+                async with AsyncSession(engine) as fast:
+                    await self._change(fast, fast_id, reader.id)
+                    await fast.commit()
+
+                # the committed change sorts after the open one, handing it
+                # out now would move the watermark past the slow writer
+                assert await _changes(since) == []
+
+                await slow.commit()
+
+            assert await _changes(since) == [slow_id, fast_id]
+        finally:
+            async with AsyncSession(engine) as cleanup:
+                await cleanup.execute(
+                    delete(RecipeChange).where(
+                        RecipeChange.recipe_id.in_(self.RECIPE_IDS)
+                    )
+                )
+                await cleanup.commit()
+
+
+class TestGetRecipesQueryParams:
+    """Test various query params for sorting/filtering"""
+
+    @pytest.mark.anyio
+    async def test_query(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+    ):
+        """Should create a new recipe in the database"""
+        sample_recipe_data["content"]["title"] = "111"
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        ts1_upat = data["updated_at"]
+        ts1_crat = data["created_at"]
+
+        await asyncio.sleep(1)
+        # create a second recipe
+        sample_recipe_data["content"]["title"] = "222"
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
         )
         assert response.status_code == 201
         data = response.json()
@@ -1245,3 +3014,285 @@ class TestGetRecipesQueryParams:
         assert response.status_code == 200
         data = response.json()["results"]
         assert len(data) == 0
+
+    @pytest.mark.anyio
+    async def test_cursor_pagination(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should walk recipes by (updated_at, id) using next_cursor"""
+        created_ids = []
+        for title in ["aaa", "bbb", "ccc"]:
+            sample_recipe_data["content"]["title"] = title
+            response = await client.post(
+                f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+            )
+            assert response.status_code == 201
+            created_ids.append(response.json()["id"])
+
+        params = {
+            "mode": "cursor",
+            "page_size": 2,
+            "sort_by": "updated_at",
+            "order": "desc",
+        }
+        response = await client.get(f"{settings.API_V1_STR}/recipes", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pagination"]["current_page"] is None
+        assert [r["latest_revision"]["title"] for r in data["results"]] == [
+            "ccc",
+            "bbb",
+        ]
+        assert data["pagination"]["next_cursor"] is not None
+
+        response = await client.get(data["pagination"]["next"])
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["latest_revision"]["title"] for r in data["results"]] == ["aaa"]
+        assert data["pagination"]["next_cursor"] is None
+
+        # cursors are bound to the ordering they were issued for
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes",
+            params={**params, "order": "asc", "cursor": "garbage"},
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_list_view(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        categories: list[RecipeCategories],
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+        sql_statements: list[str],
+    ):
+        """Should return RecipeListView items without loading recipe content"""
+        sample_recipe_data["language"] = "de"
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        result = await db_session.execute(
+            select(Recipe).where(Recipe.id == response.json()["id"])
+        )
+        result.scalar_one().original_recipe_id = test_recipe.id
+        await db_session.flush()
+
+        sql_statements.clear()
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes",
+            params={"view": "list", "sort_by": "id", "order": "asc"},
+        )
+
+        assert response.status_code == 200
+        assert not any("ingredient" in statement for statement in sql_statements)
+        first, second = response.json()["results"]
+        assert first["id"] == test_recipe.id
+        assert first["title"] == "Test Recipe"
+        assert first["prep_time"] == 10
+        assert first["categories"] == [categories[0].name]
+        assert first["translations"] == ["de"]
+        assert first["is_favorited"] is False
+        assert "latest_revision" not in first
+        assert second["translations"] == []
+        assert sorted(second["categories"]) == sorted(
+            c.name for c in categories if c.id in sample_recipe_data["content"]["categories"]
+        )
+
+    @pytest.mark.anyio
+    async def test_sparse_include(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sql_statements: list[str],
+    ):
+        """Should only load and return the requested relationships"""
+        recipe_cache.clear()
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes", params={"include": "categories"}
+        )
+
+        assert response.status_code == 200
+        assert not any("ingredient" in statement for statement in sql_statements)
+        assert not any("instruction" in statement for statement in sql_statements)
+        recipe = response.json()["results"][0]
+        assert "translations" not in recipe
+        assert "original_recipe" not in recipe
+        assert set(recipe["latest_revision"]) >= {"title", "categories", "created_at"}
+        assert "ingredient_groups" not in recipe["latest_revision"]
+        assert "instruction_groups" not in recipe["latest_revision"]
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes", params={"include": "bogus"}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_sparse_include_from_cache(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+    ):
+        """Should slice cached recipes the same way"""
+        full = await client.get(f"{settings.API_V1_STR}/recipes")
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes",
+            params={"include": "ingredients, instructions"},
+        )
+
+        recipe = response.json()["results"][0]
+        full_revision = full.json()["results"][0]["latest_revision"]
+        assert "categories" not in recipe["latest_revision"]
+        assert (
+            recipe["latest_revision"]["ingredient_groups"]
+            == full_revision["ingredient_groups"]
+        )
+        assert (
+            recipe["latest_revision"]["instruction_groups"]
+            == full_revision["instruction_groups"]
+        )
+
+    @pytest.mark.anyio
+    async def test_ndjson_format(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should stream the page as one recipe per line"""
+        for title in ["aaa", "bbb", "ccc"]:
+            sample_recipe_data["content"]["title"] = title
+            response = await client.post(
+                f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+            )
+            assert response.status_code == 201
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes",
+            params={
+                "format": "ndjson",
+                "page_size": 2,
+                "sort_by": "id",
+                "order": "asc",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["latest_revision"]["title"] for r in lines] == ["aaa", "bbb"]
+        assert all(r["is_favorited"] is False for r in lines)
+
+    @pytest.mark.anyio
+    async def test_ndjson_cursor_pages(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        sample_recipe_data: dict,
+    ):
+        """Should end each cursor page with the cursor of the next one"""
+        for title in ["aaa", "bbb", "ccc"]:
+            sample_recipe_data["content"]["title"] = title
+            response = await client.post(
+                f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+            )
+            assert response.status_code == 201
+
+        params = {"format": "ndjson", "page_size": 2, "sort_by": "id", "mode": "cursor"}
+        pages = []
+        while True:
+            response = await client.get(
+                f"{settings.API_V1_STR}/recipes", params={**params, "order": "asc"}
+            )
+            assert response.status_code == 200
+            *lines, last = [json.loads(line) for line in response.text.splitlines()]
+            pages.append([r["latest_revision"]["title"] for r in lines])
+            if last["next_cursor"] is None:
+                break
+            params["cursor"] = last["next_cursor"]
+
+        assert pages == [["aaa", "bbb"], ["ccc"]]
+
+    @pytest.mark.anyio
+    async def test_ndjson_with_translations(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        sample_recipe_data: dict,
+        db_session: AsyncSession,
+    ):
+        """Should stream a recipe and its translation in the same chunk"""
+        sample_recipe_data["language"] = "de"
+        response = await client.post(
+            f"{settings.API_V1_STR}/recipes", json=sample_recipe_data
+        )
+        translation_id = response.json()["id"]
+        result = await db_session.execute(
+            select(Recipe).where(Recipe.id == translation_id)
+        )
+        result.scalar_one().original_recipe_id = test_recipe.id
+        await db_session.flush()
+        db_session.expunge_all()
+
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes",
+            params={"format": "ndjson", "sort_by": "id", "order": "asc"},
+        )
+
+        assert response.status_code == 200
+        original, translation = [json.loads(line) for line in response.text.splitlines()]
+        assert [t["id"] for t in original["translations"]] == [translation_id]
+        assert translation["original_recipe"]["id"] == test_recipe.id
+        assert translation["latest_revision"]["title"] == "Chocolate Chip Cookies"
+
+
+class TestExportRecipes:
+    """Integration tests for GET /recipes/export"""
+
+    @pytest.mark.anyio
+    async def test_export_visible_recipes(
+        self,
+        client: AsyncClient,
+        override_current_user: User,
+        test_recipe: Recipe,
+        private_recipe: Recipe,
+    ):
+        """Should export own and public recipes, but not private ones of others"""
+        response = await client.get(f"{settings.API_V1_STR}/recipes/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        ids = [r["id"] for r in lines]
+        assert test_recipe.id in ids
+        assert private_recipe.id not in ids
+        assert ids == sorted(ids)
+        own = next(r for r in lines if r["id"] == test_recipe.id)
+        assert own["latest_revision"]["title"] == "Test Recipe"
+        assert own["latest_revision"]["ingredient_groups"][0]["ingredients"]
+
+    @pytest.mark.anyio
+    async def test_export_user_only(
+        self,
+        client: AsyncClient,
+        override_current_user_other: User,
+        test_recipe: Recipe,
+        private_recipe: Recipe,
+    ):
+        """Should only export the current user's recipes with user_only"""
+        response = await client.get(
+            f"{settings.API_V1_STR}/recipes/export", params={"user_only": True}
+        )
+
+        assert response.status_code == 200
+        ids = [json.loads(line)["id"] for line in response.text.splitlines()]
+        assert ids == [private_recipe.id]
@@ -0,0 +1,190 @@
+"""
+Tests for the Meilisearch client, against the in-memory fake.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.recipes import search
+from app.recipes.fake_search import FakeMeilisearch
+from app.recipes.models import FoodCandidate
+from app.recipes.search import MeilisearchError, MeilisearchService
+
+pytestmark = pytest.mark.no_db
+
+OWNER_ID = "0b4f5f4e-5d3a-4b8e-9c1a-2f6d7e8a9b0c"
+
+
+@pytest.fixture
+def fake() -> FakeMeilisearch:
+    return FakeMeilisearch()
+
+
+@pytest.fixture
+async def service(fake: FakeMeilisearch, monkeypatch):
+    monkeypatch.setattr(search, "RETRY_BACKOFF_SECONDS", 0)
+    service = MeilisearchService(url="http://meilisearch", transport=fake.transport())
+    yield service
+    await service.aclose()
+
+
+def recipe_document(recipe_id: int, **fields) -> dict:
+    return {
+        "id": recipe_id,
+        "title": f"Recipe {recipe_id}",
+        "ingredients": [],
+        "categories": [],
+        "language": "en",
+        "is_private": False,
+        "owner_id": OWNER_ID,
+        "difficulty": 1,
+        **fields,
+    }
+
+
+class TestMeilisearchService:
+    @pytest.mark.anyio
+    async def test_index_and_search_foods(self, service: MeilisearchService):
+        await service.index_food_bulk(
+            [
+                FoodCandidate(id=1, name="Red onion", language="en"),
+                FoodCandidate(id=2, name="Zwiebel", description="rot", language="de"),
+                FoodCandidate(id=3, name="Onion powder", language="en"),
+            ]
+        )
+
+        results = await service.search_foods("onion", languages=["en"], limit=1)
+
+        assert results["estimatedTotalHits"] == 2
+        assert [hit["id"] for hit in results["hits"]] == [1]
+        results = await service.search_foods("onion", languages=["de", "fr"])
+        assert results["hits"] == []
+
+    @pytest.mark.anyio
+    async def test_search_recipes_filters(self, service: MeilisearchService):
+        await service._add_documents(
+            service.recipe_index_name,
+            [
+                recipe_document(1, title="Apple pie", categories=["Dessert"]),
+                recipe_document(2, title="Apple crumble", difficulty=3),
+                recipe_document(3, title="Apple tart", is_private=True),
+                recipe_document(4, title="Apfelkuchen", language="de"),
+            ],
+        )
+
+        async def ids(query: str, **filters) -> list[int]:
+            results = await service.search_recipes(query, **filters)
+            return [hit["id"] for hit in results["hits"]]
+
+        assert await ids("apple") == [1, 2]
+        assert await ids("apple", categories=["Dessert", "Cake"]) == [1]
+        assert await ids("apple", difficulty=3) == [2]
+        assert await ids("apple", owner_id=OWNER_ID) == [1, 2, 3]
+        assert await ids("", languages=["de"]) == [4]
+
+        await service.delete_recipe(1)
+        assert await ids("apple") == [2]
+
+    @pytest.mark.anyio
+    async def test_indexes_set_up_once(
+        self, service: MeilisearchService, fake: FakeMeilisearch
+    ):
+        await asyncio.gather(
+            service.search_recipes("pie"), service.search_foods("onion")
+        )
+        setup = len(fake.requests) - 2
+
+        assert fake.indexes["recipes"]["settings"] == search.RECIPE_INDEX_SETTINGS
+        assert fake.indexes["foods"]["settings"] == search.FOOD_INDEX_SETTINGS
+        assert setup == 4  # create and configure both indexes
+
+        fake.requests.clear()
+        await service.search_recipes("pie")
+        # a single round trip, the index is not fetched first
+        assert fake.requests == [("POST", "/indexes/recipes/search")]
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("error", [503, httpx.ConnectError])
+    async def test_retries_transient_errors(
+        self, service: MeilisearchService, fake: FakeMeilisearch, error
+    ):
+        await service.search_foods("warm up")
+        fake.requests.clear()
+        fake.fail_next(service.retries, error)
+
+        results = await service.search_foods("onion")
+
+        assert results["hits"] == []
+        assert len(fake.requests) == service.retries + 1
+
+    @pytest.mark.anyio
+    async def test_raises_when_retries_exhausted(
+        self, service: MeilisearchService, fake: FakeMeilisearch
+    ):
+        await service.search_foods("warm up")
+        fake.fail_next(service.retries + 1, 503)
+        with pytest.raises(MeilisearchError) as error:
+            await service.search_foods("onion")
+        assert error.value.status_code == 503
+
+        fake.fail_next(service.retries + 1, httpx.ConnectError)
+        with pytest.raises(httpx.ConnectError):
+            await service.search_foods("onion")
+
+    @pytest.mark.anyio
+    async def test_timeouts_not_retried(
+        self, service: MeilisearchService, fake: FakeMeilisearch
+    ):
+        await service.search_foods("warm up")
+        fake.requests.clear()
+        fake.fail_next(1, httpx.ReadTimeout)
+
+        with pytest.raises(httpx.ReadTimeout):
+            await service.search_foods("onion")
+        assert len(fake.requests) == 1
+
+    @pytest.mark.anyio
+    async def test_retries_bounded_by_timeout(self, fake: FakeMeilisearch):
+        service = MeilisearchService(
+            url="http://meilisearch",
+            transport=fake.transport(),
+            retries=100,
+            timeout=0.5,
+        )
+        await service.search_foods("warm up")
+        fake.requests.clear()
+        fake.fail_next(100, 503)
+
+        with pytest.raises(MeilisearchError):
+            await service.search_foods("onion")
+        await service.aclose()
+
+        # backoff 0.1s, 0.2s, 0.4s, ...: only two retries fit into 0.5s
+        assert len(fake.requests) <= 3
+
+    @pytest.mark.anyio
+    async def test_client_errors_not_retried(
+        self, service: MeilisearchService, fake: FakeMeilisearch
+    ):
+        await service.search_foods("warm up")
+        fake.requests.clear()
+
+        with pytest.raises(MeilisearchError) as error:
+            await service._search("missing", "onion", {})
+
+        assert error.value.code == "index_not_found"
+        assert len(fake.requests) == 1
+
+    @pytest.mark.anyio
+    async def test_concurrent_searches(
+        self, service: MeilisearchService, fake: FakeMeilisearch
+    ):
+        """Searches wait for Meilisearch side by side, not one after another"""
+        await service.search_foods("warm up")
+        fake.latency = 0.01
+
+        await asyncio.gather(*(service.search_foods(f"q{i}") for i in range(20)))
+
+        assert fake.max_in_flight > 1
@@ -0,0 +1,153 @@
+"""
+Tests and a throughput micro-benchmark for the JSON response path.
+"""
+
+import json
+import time
+from datetime import datetime, UTC
+from uuid import uuid4
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.pagination import PaginatedResponse, PaginationMeta
+from app.core.serialization import json_response
+from app.recipes.constants import BaseUnit, UnitSystem
+from app.recipes.schemas import RecipeRead
+
+pytestmark = pytest.mark.no_db
+
+PAGE_SIZES = [100, 1000, 5000]
+
+
+def make_recipe(recipe_id: int) -> RecipeRead:
+    now = datetime.now(UTC)
+    header = {
+        "id": recipe_id,
+        "owner_id": uuid4(),
+        "created_at": now,
+        "updated_at": now,
+        "is_private": False,
+        "is_draft": False,
+        "language": "en",
+    }
+    return RecipeRead.model_validate(
+        {
+            **header,
+            "favorite_count": 3,
+            "original_recipe": None,
+            "translations": [{**header, "id": recipe_id + 1, "language": "de"}],
+            "latest_revision": {
+                "title": f"Recipe {recipe_id}",
+                "subtitle": "A weeknight classic",
+                "owner_comment": None,
+                "difficulty": 2,
+                "servings": 4,
+                "prep_time": 15,
+                "cook_time": 30,
+                "source_name": None,
+                "source_page": None,
+                "source_url": "https://example.com/recipe",
+                "created_at": now,
+                "categories": [{"id": 1, "name": "Dessert"}, {"id": 2, "name": "Quick"}],
+                "ingredient_groups": [
+                    {
+                        "name": f"Group {g}",
+                        "ingredients": [
+                            {
+                                "food": f"ingredient {i}",
+                                "amount_min": 1.5,
+                                "amount_max": None,
+                                "comment": "finely chopped",
+                                "unit": {
+                                    "id": 1,
+                                    "name": "gram",
+                                    "base_unit": BaseUnit.KILOGRAM,
+                                    "unit_system": UnitSystem.METRIC,
+                                    "conversion_factor": 0.001,
+                                },
+                            }
+                            for i in range(6)
+                        ],
+                    }
+                    for g in range(2)
+                ],
+                "instruction_groups": [
+                    {"name": None, "instructions": "Mix everything and bake. " * 20}
+                ],
+            },
+        }
+    )
+
+
+def make_page(size: int) -> PaginatedResponse:
+    return PaginatedResponse(
+        pagination=PaginationMeta(
+            total=size, current_page=1, page_size=size, total_pages=1
+        ),
+        results=[make_recipe(i) for i in range(size)],
+    )
+
+
+async def fastapi_default(page: PaginatedResponse) -> bytes:
+    """What FastAPI does for a returned model with a `response_model`"""
+    field = create_model_field(
+        name="Response", type_=PaginatedResponse[RecipeRead], mode="serialization"
+    )
+    return JSONResponse(
+        await serialize_response(field=field, response_content=page)
+    ).body
+
+
+class TestJsonResponse:
+    @pytest.mark.anyio
+    async def test_same_json_as_fastapi(self):
+        page = make_page(3)
+
+        assert json.loads(json_response(page).body) == json.loads(
+            await fastapi_default(page)
+        )
+
+    @pytest.mark.anyio
+    async def test_status_and_headers(self):
+        response = json_response(make_recipe(1), status_code=201, headers={"ETag": '"x"'})
+
+        assert response.status_code == 201
+        assert response.headers["etag"] == '"x"'
+        assert response.media_type == "application/json"
+
+
+@pytest.mark.benchmark
+class TestSerializationThroughput:
+    """
+    Micro-benchmark: recipes serialized per second into a response body. Run
+    with `--run-benchmarks`, the numbers are recorded as properties (e.g. in
+    `--junitxml` reports) to track them over time.
+    """
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("size", PAGE_SIZES)
+    async def test_throughput(self, size: int, record_property):
+        page = make_page(size)
+        await fastapi_default(make_page(1))  # warm up the validators
+
+        async def rate(serialize) -> tuple[float, bytes]:
+            """Recipes per second, best of 3 runs"""
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                body = await serialize(page)
+                best = min(best, time.perf_counter() - start)
+            return size / best, body
+
+        async def fast(page):
+            return json_response(page).body
+
+        default_rate, default_body = await rate(fastapi_default)
+        fast_rate, body = await rate(fast)
+
+        record_property("recipes_per_second_fastapi_default", round(default_rate))
+        record_property("recipes_per_second_json_response", round(fast_rate))
+        assert json.loads(body) == json.loads(default_body)